@@ -6,7 +6,10 @@ SQLAdmin 权限管理完整实现
 
 from typing import Any, Dict, Optional
 from sqladmin import ModelView
-from sqlalchemy import func, and_, or_
+from sqladmin._queries import Query
+from sqladmin.helpers import get_object_identifier
+from sqlalchemy import Select, func, select, false
+from sqlalchemy.orm import defaultload, defer, object_session
 from starlette.requests import Request
 from starlette.responses import Response
 from wtforms import (
@@ -16,12 +19,28 @@ from wtforms import (
 from wtforms.validators import DataRequired, Email, Length, Optional as WTFOptional
 import logging
 
-from models.auth_model import User, AuthCredentials, InfoStatusTypeEnum
+from models.auth_model import (
+    User,
+    AuthCredentials,
+    DeletedRecord,
+    InfoStatusTypeEnum,
+    coerce_info_status,
+)
+from admin.filters import JSONFilter
+from auth.permissions import (
+    apply_credentials_ownership,
+    credentials_count_statement,
+    credentials_visibility_clause,
+    users_count_statement,
+)
+from db.admin_executor import admin_db_executor
+from services.credential_events import credential_events
+from services.password_hashing import password_hasher
 from forms.auth_forms import (
     CustomJSONField,
     CustomPasswordField,
     InfoStatusSelectField,
-    format_json_column,
+    format_json_preview,
 )
 
 logger = logging.getLogger(__name__)
@@ -38,12 +57,6 @@ class PermissionError(Exception):
 class BasePermissionAdmin(ModelView):
     """基础权限管理类"""
 
-    def _get_session(self):
-        """获取数据库会话 - SQLAdmin的标准方式"""
-        from base import SessionLocal
-
-        return SessionLocal()
-
     def get_current_user(self, request: Request) -> Optional[User]:
         """获取当前登录用户"""
         return getattr(request.state, "user", None)
@@ -57,6 +70,66 @@ class BasePermissionAdmin(ModelView):
         """检查权限 - 子类需要重写"""
         return True
 
+    # 同步会话模式下的数据库操作统一在管理界面线程池中执行（见 db/admin_executor.py），
+    # 异步会话模式沿用 SQLAdmin 的默认实现
+    async def _run_query(self, stmt) -> Any:
+        if self.is_async:
+            return await super()._run_query(stmt)
+        return await admin_db_executor.run(self._run_query_sync, stmt)
+
+    async def _run_arbitrary_query(self, stmt) -> Any:
+        if self.is_async:
+            return await super()._run_arbitrary_query(stmt)
+        return await admin_db_executor.run(self._run_arbitrary_query_sync, stmt)
+
+    async def _lazyload_prop(self, obj: Any, prop: str) -> Any:
+        if self.is_async:
+            return await super()._lazyload_prop(obj, prop)
+
+        def load():
+            with self.session_maker() as session:
+                session.add(obj)
+                return getattr(obj, prop)
+
+        return await admin_db_executor.run(load)
+
+    async def count(self, request: Request, stmt: Optional[Select] = None) -> int:
+        """列表页没有搜索和过滤条件时，总数就是权限范围内的记录数，改用 count_query
+        （计数表可用时汇总计数行），不再对列表查询整体执行 count(*)"""
+        if stmt is not None and not self.has_list_conditions(request):
+            stmt = None
+        return await super().count(request, stmt)
+
+    def has_list_conditions(self, request: Request) -> bool:
+        params = request.query_params
+        return bool(params.get("search")) or any(
+            params.get(list_filter.parameter_name) for list_filter in self.get_filters()
+        )
+
+    async def insert_model(self, request: Request, data: dict) -> Any:
+        if self.is_async:
+            return await super().insert_model(request, data)
+        obj = await admin_db_executor.run(Query(self)._insert_sync, data, request)
+        await self._emit_audit(request, "create", get_object_identifier(obj), data)
+        return obj
+
+    async def update_model(self, request: Request, pk: str, data: dict) -> Any:
+        if self.is_async:
+            return await super().update_model(request, pk, data)
+        obj = await admin_db_executor.run(Query(self)._update_sync, pk, data, request)
+        await self._emit_audit(request, "update", pk, data)
+        return obj
+
+    async def delete_model(self, request: Request, pk: Any) -> None:
+        if self.is_async:
+            return await super().delete_model(request, pk)
+        await admin_db_executor.run(Query(self)._delete_sync, pk, request)
+        await self._emit_audit(request, "delete", pk, None)
+
+    def add_tombstone(self, model: Any, tombstone: DeletedRecord) -> None:
+        """写入删除记录（墓碑）：加入删除所在的会话（SQLAdmin 的删除会话），与删除一起提交"""
+        object_session(model).add(tombstone)
+
 
 class UserPermissionAdmin(BasePermissionAdmin, model=User):
     """用户权限管理界面"""
@@ -75,6 +148,7 @@ class UserPermissionAdmin(BasePermissionAdmin, model=User):
         "pp_token",
         "is_active",
         "is_superuser",
+        "description_preview",
         "created_at",
         "updated_at",
     ]
@@ -90,6 +164,7 @@ class UserPermissionAdmin(BasePermissionAdmin, model=User):
         "is_superuser": "超级管理员",
         "remark": "备注",
         "description": "补充信息",
+        "description_preview": "补充信息",
         "created_at": "创建时间",
         "updated_at": "更新时间",
     }
@@ -97,6 +172,9 @@ class UserPermissionAdmin(BasePermissionAdmin, model=User):
     # 可搜索字段
     column_searchable_list = ["username", "email"]
 
+    # JSON 字段过滤（GIN 索引支持包含查询）
+    column_filters = [JSONFilter(User.description, title="补充信息")]
+
     # 可排序字段
     column_sortable_list = ["id", "username", "email", "created_at", "updated_at"]
 
@@ -153,7 +231,8 @@ class UserPermissionAdmin(BasePermissionAdmin, model=User):
 
     # 列格式化
     column_formatters = {
-        "description": lambda m, a: format_json_column(m.description, max_length=80),
+        # 列表只读取预览列（完整的 JSON 在 list_query 中延迟加载）
+        "description_preview": lambda m, a: format_json_preview(m, "description", max_length=80),
         "pp_token": lambda m, a: (
             f"{m.pp_token[:12]}..."
             if m.pp_token and len(m.pp_token) > 12
@@ -196,14 +275,14 @@ class UserPermissionAdmin(BasePermissionAdmin, model=User):
             f"UserAdmin list_query 被调用 - 当前用户: {current_user.username if current_user else 'None'}"
         )
 
-        # 使用 SQLAdmin 的标准会话获取方式
-        session = self._get_session()
-        query = session.query(self.model)
+        # 返回 Select 语句，由 SQLAdmin 按会话模式（线程池/异步）执行；
+        # 列表显示预览列，不加载完整的 JSON
+        query = select(self.model).options(defer(User.description))
 
         if not current_user:
             # 未登录用户返回空查询
             logger.warning("用户未登录，返回空查询")
-            return query.filter(False)
+            return query.where(false())
 
         if current_user.is_superuser:
             # 超级用户可以看到所有用户
@@ -212,7 +291,7 @@ class UserPermissionAdmin(BasePermissionAdmin, model=User):
         else:
             # 普通用户只能看到自己
             logger.info(f"普通用户 {current_user.username} 只能查看自己的信息")
-            return query.filter(User.id == current_user.id)
+            return query.where(User.id == current_user.id)
 
     async def list(self, request: Request) -> Response:
         """重写列表方法，确保权限过滤"""
@@ -233,78 +312,41 @@ class UserPermissionAdmin(BasePermissionAdmin, model=User):
             f"UserAdmin count_query - 当前用户: {current_user.username if current_user else 'None'}"
         )
 
-        session = self._get_session()
-        query = session.query(func.count(self.model.id))
+        query = select(func.count(self.model.id))
 
         if not current_user:
             logger.warning("用户未登录，返回 0")
-            return query.filter(False)
+            return query.where(false())
 
         if current_user.is_superuser:
             logger.info("超级用户 - 返回所有用户的计数查询")
-            return query
+            return users_count_statement()
         else:
             # 普通用户只能看到自己
             logger.info(f"普通用户 - 返回自己的计数查询，用户ID: {current_user.id}")
-            return query.filter(User.id == current_user.id)
+            return query.where(User.id == current_user.id)
 
     def details_query(self, request: Request):
-        """详情查询，应用权限过滤"""
-        return self.list_query(request)
-
-    def get_one(self, id: Any, request: Request):
-        """获取单个用户 - 权限检查"""
+        """详情查询：按主键查询，并应用与列表相同的权限过滤"""
         current_user = self.get_current_user(request)
+        query = super().details_query(request)
 
         if not current_user:
-            return None
-
-        session = self._get_session()
-        query = session.query(self.model)
-
+            return query.where(false())
         if current_user.is_superuser:
-            # 超级用户可以查看任何用户
-            return query.filter(self.model.id == id).first()
-        else:
-            # 普通用户只能查看自己
-            if int(id) == current_user.id:
-                return query.filter(self.model.id == id).first()
-            else:
-                return None
-
-    # 重写操作方法
-    async def create(self, request: Request) -> Response:
-        """创建用户 - 权限检查"""
-        current_user = self.get_current_user(request)
-
-        if not current_user or not current_user.is_superuser:
-            raise PermissionError("只有超级管理员可以创建用户")
-
-        return await super().create(request)
-
-    async def edit(self, request: Request) -> Response:
-        """编辑用户 - 权限检查"""
-        current_user = self.get_current_user(request)
-        user_id = request.path_params.get("pk")
-
-        if not current_user:
-            raise PermissionError("用户未登录")
-
-        if not current_user.is_superuser:
-            # 普通用户只能编辑自己
-            if not (user_id and int(user_id) == current_user.id):
-                raise PermissionError("只能编辑自己的信息")
+            return query
+        return query.where(User.id == current_user.id)
 
-        return await super().edit(request)
+    def form_edit_query(self, request: Request):
+        """编辑页查询：普通用户只能打开自己的编辑页（保存时 on_model_change 再次检查）"""
+        return self.details_query(request)
 
-    async def delete(self, request: Request) -> Response:
-        """删除用户 - 权限检查"""
+    async def on_model_delete(self, model: User, request: Request) -> None:
+        """删除用户前检查权限，并写入墓碑供增量同步接口返回"""
         current_user = self.get_current_user(request)
-
         if not current_user or not current_user.is_superuser:
             raise PermissionError("只有超级管理员可以删除用户")
-
-        return await super().delete(request)
+        self.add_tombstone(model, DeletedRecord.for_user(model))
 
     # 动态表单字段控制 - 通过scaffold_form实现
     async def scaffold_form(self, form_class=None):
@@ -347,16 +389,13 @@ class UserPermissionAdmin(BasePermissionAdmin, model=User):
 
         # 处理密码
         if "password" in data and data["password"]:
-            model.hashed_password = User.hash_password(data["password"])
+            # bcrypt 计算耗时数百毫秒，在工作线程中执行，不阻塞事件循环
+            model.hashed_password = await password_hasher.hash_async(data["password"])
 
         # 处理JSON字段
         if "description" in data:
             model.description = data["description"] if data["description"] else None
 
-        # 创建时生成pp_token
-        if is_created and not model.pp_token:
-            model.pp_token = User.generate_pp_token()
-
 
 class CredentialsPermissionAdmin(BasePermissionAdmin, model=AuthCredentials):
     """认证凭据权限管理界面"""
@@ -374,6 +413,8 @@ class CredentialsPermissionAdmin(BasePermissionAdmin, model=AuthCredentials):
         "info_status",
         "user",
         "expires_at",
+        "config_info_preview",
+        "description_preview",
         "created_at",
         "updated_at",
     ]
@@ -385,6 +426,8 @@ class CredentialsPermissionAdmin(BasePermissionAdmin, model=AuthCredentials):
         "info_status": "信息状态",
         "config_info": "配置信息",
         "description": "补充信息",
+        "config_info_preview": "配置信息",
+        "description_preview": "补充信息",
         "expires_at": "过期时间",
         "user_id": "用户ID",
         "user": "关联用户",
@@ -395,6 +438,12 @@ class CredentialsPermissionAdmin(BasePermissionAdmin, model=AuthCredentials):
     # 可搜索字段
     column_searchable_list = ["info"]
 
+    # JSON 字段过滤（GIN 索引支持包含查询）
+    column_filters = [
+        JSONFilter(AuthCredentials.config_info, title="配置信息"),
+        JSONFilter(AuthCredentials.description, title="补充信息"),
+    ]
+
     # 可排序字段
     column_sortable_list = [
         "id",
@@ -471,8 +520,8 @@ class CredentialsPermissionAdmin(BasePermissionAdmin, model=AuthCredentials):
         "expires_at": lambda m, a: (
             m.expires_at.strftime("%Y-%m-%d %H:%M:%S") if m.expires_at else "永不过期"
         ),
-        "config_info": lambda m, a: format_json_column(m.config_info, max_length=50),
-        "description": lambda m, a: format_json_column(m.description, max_length=50),
+        "config_info_preview": lambda m, a: format_json_preview(m, "config_info", max_length=50),
+        "description_preview": lambda m, a: format_json_preview(m, "description", max_length=50),
         "created_at": lambda m, a: (
             m.created_at.strftime("%Y-%m-%d %H:%M:%S") if m.created_at else "无"
         ),
@@ -511,34 +560,27 @@ class CredentialsPermissionAdmin(BasePermissionAdmin, model=AuthCredentials):
             f"CredentialsAdmin list_query 被调用 - 当前用户: {current_user.username if current_user else 'None'}"
         )
 
-        session = self._get_session()
-        query = session.query(self.model)
+        # 列表显示预览列，不加载凭据和关联用户的完整 JSON
+        query = select(self.model).options(
+            defer(AuthCredentials.config_info),
+            defer(AuthCredentials.description),
+            defaultload(AuthCredentials.user).defer(User.description),
+        )
 
         if not current_user:
             # 未登录用户返回空查询
             logger.warning("用户未登录，返回空查询")
-            return query.filter(False)
+            return query.where(false())
 
         if current_user.is_superuser:
             # 超级用户可以看到所有凭据
             logger.info(f"超级用户 {current_user.username} 查看所有认证凭据")
-            return query
         else:
             # 普通用户只能看到：
             # 1. 公开的凭据（info_status=0）
             # 2. 自己关联的私有凭据（info_status=1 且 user_id=当前用户）
             logger.info(f"普通用户 {current_user.username} 查看受限的认证凭据")
-            return query.filter(
-                or_(
-                    # 公开凭据 - 可查看但不能编辑
-                    AuthCredentials.info_status == InfoStatusTypeEnum.PUBLIC.value,
-                    # 自己的私有凭据 - 可查看和编辑
-                    and_(
-                        AuthCredentials.info_status == InfoStatusTypeEnum.PRIVATE.value,
-                        AuthCredentials.user_id == current_user.id,
-                    ),
-                )
-            )
+        return query.where(credentials_visibility_clause(current_user))
 
     async def list(self, request: Request) -> Response:
         """重写列表方法，确保权限过滤"""
@@ -559,138 +601,38 @@ class CredentialsPermissionAdmin(BasePermissionAdmin, model=AuthCredentials):
             f"CredentialsAdmin count_query - 当前用户: {current_user.username if current_user else 'None'}"
         )
 
-        session = self._get_session()
-        query = session.query(func.count(self.model.id))
-
         if not current_user:
             logger.warning("用户未登录，返回 0")
-            return query.filter(False)
+            return select(func.count(self.model.id)).where(false())
 
         if current_user.is_superuser:
             # 超级用户可以看到所有凭据
             logger.info("超级用户 - 返回所有凭据的计数查询")
-            return query
-        else:
-            # 普通用户只能看到自己的私有凭据和所有公开凭据
-            return query.filter(
-                or_(
-                    # 公开凭据
-                    AuthCredentials.info_status == InfoStatusTypeEnum.PUBLIC.value,
-                    # 自己的私有凭据
-                    and_(
-                        AuthCredentials.info_status == InfoStatusTypeEnum.PRIVATE.value,
-                        AuthCredentials.user_id == current_user.id,
-                    ),
-                )
-            )
+        # 普通用户只能看到自己的私有凭据和所有公开凭据
+        return credentials_count_statement(current_user)
 
     def details_query(self, request: Request):
-        """详情查询，应用权限过滤"""
-        return self.list_query(request)
-
-    def get_one(self, id: Any, request: Request):
-        """获取单个认证凭据 - 权限检查"""
+        """详情查询：按主键查询，并应用与列表相同的权限过滤"""
         current_user = self.get_current_user(request)
+        query = super().details_query(request)
 
         if not current_user:
-            return None
+            return query.where(false())
+        return query.where(credentials_visibility_clause(current_user))
 
-        session = self._get_session()
-        query = session.query(self.model)
-        credential = query.filter(self.model.id == id).first()
-
-        if not credential:
-            return None
-
-        if current_user.is_superuser:
-            # 超级用户可以查看任何凭据
-            return credential
-        else:
-            # 普通用户只能查看公开凭据或自己的私有凭据
-            if credential.info_status == InfoStatusTypeEnum.PUBLIC.value or (
-                credential.info_status == InfoStatusTypeEnum.PRIVATE.value
-                and credential.user_id == current_user.id
-            ):
-                return credential
-            else:
-                return None
-
-    # 重写操作方法
-    async def create(self, request: Request) -> Response:
-        """创建认证凭据 - 权限检查"""
-        current_user = self.get_current_user(request)
-
-        if not current_user:
-            raise PermissionError("用户未登录")
-
-        # 所有用户都可以创建凭据，但普通用户只能创建私有凭据
-        return await super().create(request)
-
-    async def edit(self, request: Request) -> Response:
-        """编辑认证凭据 - 权限检查"""
+    def form_edit_query(self, request: Request):
+        """编辑页查询：普通用户只能打开自己私有凭据的编辑页（保存时 on_model_change 再次检查）"""
         current_user = self.get_current_user(request)
-        credential_id = request.path_params.get("pk")
+        query = super().form_edit_query(request)
 
         if not current_user:
-            raise PermissionError("用户未登录")
-
-        session = self._get_session()
-
-        if current_user.is_superuser:
-            # 超级用户可以编辑任何凭据
-            return await super().edit(request)
-        else:
-            # 普通用户只能编辑自己的私有凭据
-            if credential_id:
-                # 这里需要用 session 查询，而不是 get_one，避免循环调用
-                credential = (
-                    session.query(self.model)
-                    .filter(self.model.id == credential_id)
-                    .first()
-                )
-                if (
-                    credential
-                    and credential.info_status == InfoStatusTypeEnum.PRIVATE.value
-                    and credential.user_id == current_user.id
-                ):
-                    return await super().edit(request)
-                else:
-                    raise PermissionError("只能编辑自己的私有认证凭据")
-            else:
-                raise PermissionError("凭据不存在")
-
-    async def delete(self, request: Request) -> Response:
-        """删除认证凭据 - 权限检查"""
-        current_user = self.get_current_user(request)
-        credential_id = request.path_params.get("pk")
-
-        if not current_user:
-            raise PermissionError("用户未登录")
-
-        session = self._get_session()
-
+            return query.where(false())
         if current_user.is_superuser:
-            # 超级用户可以删除任何凭据
-            return await super().delete(request)
-        else:
-            # 普通用户只能删除自己的私有凭据
-            if credential_id:
-                # 这里需要用 session 查询，而不是 get_one，避免循环调用
-                credential = (
-                    session.query(self.model)
-                    .filter(self.model.id == credential_id)
-                    .first()
-                )
-                if (
-                    credential
-                    and credential.info_status == InfoStatusTypeEnum.PRIVATE.value
-                    and credential.user_id == current_user.id
-                ):
-                    return await super().delete(request)
-                else:
-                    raise PermissionError("只能删除自己的私有认证凭据")
-            else:
-                raise PermissionError("凭据不存在")
+            return query
+        return query.where(
+            AuthCredentials.info_status == InfoStatusTypeEnum.PRIVATE.value,
+            AuthCredentials.user_id == current_user.id,
+        )
 
     # 在权限检查和数据处理中实现字段控制
 
@@ -718,6 +660,9 @@ class CredentialsPermissionAdmin(BasePermissionAdmin, model=AuthCredentials):
                 ):
                     raise PermissionError("只能修改自己的私有认证凭据")
 
+            # 记录修改前的可见性，变更推送据此通知失去可见性的订阅者
+            request.state.credential_previous = (model.info_status, model.user_id)
+
         # 处理info_status字段
         if "info_status" in data:
             info_status = data["info_status"]
@@ -732,19 +677,57 @@ class CredentialsPermissionAdmin(BasePermissionAdmin, model=AuthCredentials):
             if field in data:
                 setattr(model, field, data[field] if data[field] else None)
 
-        # 创建时的特殊处理
+        # 创建时的特殊处理：根据用户角色和info_status设置用户关联
         if is_created:
-            if not current_user.is_superuser:
-                # 普通用户创建的凭据自动设为私有并关联到自己
-                model.info_status = InfoStatusTypeEnum.PRIVATE.value
-                model.user_id = current_user.id
-            else:
-                # 超级用户创建时，根据info_status设置用户关联
-                if model.info_status == InfoStatusTypeEnum.PUBLIC.value:
-                    model.user_id = None
-                elif "user_id" not in data or not data["user_id"]:
-                    # 如果是私有状态但没有指定用户，关联到当前用户
-                    model.user_id = current_user.id
+            # 新建时模型尚未赋值，按表单数据判断
+            values = apply_credentials_ownership(
+                {
+                    "info_status": coerce_info_status(data.get("info_status", model.info_status)),
+                    "user_id": data.get("user_id") or None,
+                },
+                current_user,
+            )
+            model.info_status = values["info_status"]
+            model.user_id = values["user_id"]
+            # SQLAdmin 在 on_model_change 之后才用表单数据给模型赋值，同步修改 data 以免被覆盖
+            data.update(values)
+        elif (
+            coerce_info_status(data.get("info_status", model.info_status))
+            == InfoStatusTypeEnum.PUBLIC.value
+        ):
+            # 编辑为公开凭据时同样清除用户关联（按 user 方式分区时公开分区要求 user_id 为空）
+            model.user_id = None
+            data["user_id"] = None
+
+    async def after_model_change(
+        self,
+        data: Dict[str, Any],
+        model: AuthCredentials,
+        is_created: bool,
+        request: Request,
+    ) -> None:
+        """提交后发布变更事件"""
+        await credential_events.publish(
+            "insert" if is_created else "update",
+            model,
+            previous=getattr(request.state, "credential_previous", None),
+        )
+
+    async def on_model_delete(self, model: AuthCredentials, request: Request) -> None:
+        """删除凭据前检查权限（普通用户只能删除自己的私有凭据），并写入墓碑供增量同步接口返回"""
+        current_user = self.get_current_user(request)
+        if not current_user:
+            raise PermissionError("用户未登录")
+        if not current_user.is_superuser and not (
+            model.info_status == InfoStatusTypeEnum.PRIVATE.value
+            and model.user_id == current_user.id
+        ):
+            raise PermissionError("只能删除自己的私有认证凭据")
+        self.add_tombstone(model, DeletedRecord.for_credential(model))
+
+    async def after_model_delete(self, model: AuthCredentials, request: Request) -> None:
+        """删除后发布变更事件"""
+        await credential_events.publish("delete", model)
 
 
 # 导出类
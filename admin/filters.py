@@ -0,0 +1,48 @@
+"""
+管理界面列表过滤器
+"""
+
+from typing import Any, Callable, List, Optional, Tuple
+
+from sqladmin.filters import get_parameter_name, get_title
+from sqlalchemy import Select
+from starlette.exceptions import HTTPException
+from starlette.requests import Request
+
+from db.json_filters import JSON_FILTER_OPERATIONS, JSONFilterError, json_filter_clause
+
+
+class JSONFilter:
+    """JSON 字段过滤（包含 @>、存在键 ?、路径等于 ->>），条件语法见 db.json_filters
+
+    使用 SQLAdmin 的操作过滤器模板：选择操作后在输入框填写
+    包含的 JSON（{"provider": "aws"}）、键路径（auth.token）或 “路径=值”（provider=aws）
+    """
+
+    has_operator = True
+    template = "sqladmin/filters/operation_filter.html"
+
+    def __init__(
+        self, column: Any, title: Optional[str] = None, parameter_name: Optional[str] = None
+    ):
+        self.column = column
+        self.title = title or get_title(column)
+        self.parameter_name = parameter_name or get_parameter_name(column)
+
+    def get_operation_options_for_model(self, model: Any) -> List[Tuple[str, str]]:
+        return JSON_FILTER_OPERATIONS
+
+    async def lookups(
+        self, request: Request, model: Any, run_query: Callable[[Select], Any]
+    ) -> List[Tuple[str, str]]:
+        return []
+
+    async def get_filtered_query(
+        self, query: Select, operation: str, value: Any, model: Any
+    ) -> Select:
+        if not value or not operation:
+            return query
+        try:
+            return query.where(json_filter_clause(self.column, operation, str(value)))
+        except JSONFilterError as e:
+            raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1,201 @@
+"""
+认证凭据批量 API 与变更推送
+- 批量查询/创建：供集成服务一次请求处理多条凭据，避免逐条请求重复认证、权限检查和网络往返
+- 变更推送：以 Server-Sent Events 推送可见凭据的增删改，客户端无需轮询全量列表
+"""
+
+import asyncio
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import ARRAY, Integer, any_, bindparam, insert, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+
+from base import ASYNC_DATABASE_URL, get_async_db
+from models.auth_model import (
+    User,
+    AuthCredentials,
+    InfoStatusTypeEnum,
+    json_preview_values,
+    json_previews_generated,
+)
+from auth.permissions import (
+    apply_credentials_ownership,
+    credentials_visibility_clause,
+    get_current_api_user,
+)
+from config import settings
+from db.json_filters import JSONFilterError, parse_json_filters
+from services.credential_events import OVERFLOW_FRAME, credential_events
+from schemas.api_schemas import (
+    FastJSONResponse,
+    CredentialItem,
+    CredentialBatchResult,
+    CredentialBatchGetRequest,
+    CredentialBatchCreateRequest,
+    CREDENTIAL_ITEM_COLUMNS,
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/credentials", tags=["credentials"])
+
+# 除列表项字段外还需要 info_status 和 user_id 计算编辑/删除权限
+BATCH_COLUMNS = [getattr(AuthCredentials, name) for name in CREDENTIAL_ITEM_COLUMNS] + [
+    AuthCredentials.info_status,
+    AuthCredentials.user_id,
+]
+
+if make_url(ASYNC_DATABASE_URL).get_backend_name() == "postgresql":
+    # 整个ID列表作为一个数组参数绑定，语句形态不随ID个数变化
+    BATCH_GET_SELECT = select(*BATCH_COLUMNS).where(
+        AuthCredentials.id == any_(bindparam("ids", type_=ARRAY(Integer)))
+    )
+else:
+    # 其他数据库（SQLite）不支持数组参数，执行时展开为 IN (...)
+    BATCH_GET_SELECT = select(*BATCH_COLUMNS).where(
+        AuthCredentials.id.in_(bindparam("ids", expanding=True))
+    )
+
+# 非 PostgreSQL 数据库的 JSON 预览列需要随批量插入写入
+JSON_PREVIEWS_GENERATED = json_previews_generated(make_url(ASYNC_DATABASE_URL).get_backend_name())
+
+
+# 支持 JSON 过滤的字段（查询参数 jsonb，语法见 db.json_filters）
+JSON_FILTER_FIELDS = {
+    "config_info": AuthCredentials.config_info,
+    "description": AuthCredentials.description,
+}
+
+
+def credential_json_filters(
+    jsonb: List[str] = Query(
+        [],
+        description='JSON 过滤，可重复：config_info@>{"provider":"aws"}、'
+        "config_info?provider、config_info.provider=aws",
+    ),
+) -> list:
+    """凭据列表的 JSON 过滤条件（依赖项）"""
+    try:
+        return parse_json_filters(jsonb, JSON_FILTER_FIELDS)
+    except JSONFilterError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def can_modify(user: User, info_status: int, user_id) -> bool:
+    """超级用户可以修改所有凭据，普通用户只能修改自己的私有凭据"""
+    return user.is_superuser or (
+        info_status == InfoStatusTypeEnum.PRIVATE.value and user_id == user.id
+    )
+
+
+def to_item(row, user: User) -> CredentialItem:
+    *fields, info_status, user_id = row
+    editable = can_modify(user, info_status, user_id)
+    return CredentialItem(*fields, editable, editable)
+
+
+@router.post("/batch-get", response_model=CredentialBatchResult)
+async def batch_get_credentials(
+    payload: CredentialBatchGetRequest,
+    user: User = Depends(get_current_api_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """按ID批量查询认证凭据（一条 WHERE id = ANY(...) 查询，应用可见性过滤）"""
+    ids = list(dict.fromkeys(payload.ids))
+    result = await db.execute(
+        BATCH_GET_SELECT.where(credentials_visibility_clause(user)), {"ids": ids}
+    )
+    found = {row[0]: to_item(row, user) for row in result.tuples()}
+
+    # 按请求顺序返回
+    return FastJSONResponse(
+        CredentialBatchResult(
+            items=[found[id] for id in ids if id in found],
+            missing=[id for id in ids if id not in found],
+        )
+    )
+
+
+@router.post("/batch-create", response_model=List[CredentialItem])
+async def batch_create_credentials(
+    payload: CredentialBatchCreateRequest,
+    user: User = Depends(get_current_api_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """批量创建认证凭据（一条多行 INSERT ... RETURNING）
+
+    每行先按 AuthCredentials.normalize_values 规范化，再应用与管理界面一致的归属规则
+    """
+    values = [
+        apply_credentials_ownership(
+            AuthCredentials.normalize_values(item.model_dump()), user
+        )
+        for item in payload.items
+    ]
+    if not JSON_PREVIEWS_GENERATED:
+        values = [{**row, **json_preview_values(AuthCredentials, row)} for row in values]
+
+    try:
+        result = await db.execute(
+            insert(AuthCredentials).values(values).returning(*BATCH_COLUMNS)
+        )
+        rows = result.all()
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        logger.warning(f"批量创建认证凭据失败: {e.orig}")
+        raise HTTPException(status_code=400, detail="关联用户不存在或数据不合法")
+
+    await credential_events.publish_many("insert", rows)
+
+    logger.info(f"用户 {user.username} 批量创建 {len(rows)} 条认证凭据")
+    return FastJSONResponse([to_item(row, user) for row in rows])
+
+
+@router.get("/events")
+async def credential_events_stream(
+    request: Request,
+    last_event_id: Optional[int] = Query(None, description="断线重连时补发该ID之后的事件"),
+    user: User = Depends(get_current_api_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """认证凭据变更推送（Server-Sent Events），只推送当前用户可见的凭据
+
+    事件类型：insert / update / delete；reset 表示无法补发，客户端应重新拉取全量数据；
+    overflow 表示消费过慢被断开，客户端应携带 Last-Event-ID 重连
+    """
+    # 长连接期间不占用数据库连接（用户已加载完毕）
+    await db.close()
+
+    header = request.headers.get("last-event-id")
+    if header and header.isdigit():
+        last_event_id = int(header)
+    subscription = credential_events.subscribe(user, last_event_id)
+
+    async def stream():
+        try:
+            yield b"retry: 3000\n\n"
+            while True:
+                try:
+                    frame = await asyncio.wait_for(
+                        subscription.queue.get(), timeout=settings.events_heartbeat_seconds
+                    )
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+                    continue
+                yield frame
+                if frame is OVERFLOW_FRAME:
+                    break
+        finally:
+            credential_events.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,216 @@
+"""
+增量同步 API
+按 (updated_at, id) 水位线返回变更记录，并通过删除记录（墓碑）返回已删除的ID，
+下游缓存只需拉取变更部分，开销与变更量成正比而不是全量数据量
+
+凭据被修改为当前用户不可见（例如公开改为他人私有）时同样通过 deleted 返回，
+之后重新可见时作为变更返回；客户端按 deleted 删除本地缓存即可
+
+游标为不透明字符串，首次同步不传 cursor，之后每次使用上一页返回的 next_cursor，
+has_more 为 true 时应立即继续拉取下一页
+"""
+
+import base64
+from datetime import datetime, timedelta
+from typing import Optional, Sequence
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import and_, false, func, or_, select, true, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from base import get_async_db
+from config import settings
+from models.auth_model import (
+    User,
+    AuthCredentials,
+    DeletedRecord,
+    InfoStatusTypeEnum,
+    local_now,
+)
+from auth.permissions import credentials_visibility_clause, get_current_api_user
+from schemas.api_schemas import FastJSONResponse, SyncPage
+
+router = APIRouter(prefix="/api/sync", tags=["sync"])
+
+# 同步返回的字段（不包含密码哈希和令牌）
+USER_SYNC_COLUMNS = (
+    "id",
+    "username",
+    "email",
+    "is_active",
+    "is_superuser",
+    "remark",
+    "description",
+    "created_at",
+    "updated_at",
+)
+CREDENTIAL_SYNC_COLUMNS = (
+    "id",
+    "info",
+    "info_status",
+    "user_id",
+    "expires_at",
+    "config_info",
+    "description",
+    "created_at",
+    "updated_at",
+)
+
+
+def encode_cursor(
+    updated_at: Optional[datetime], record_id: int, tombstone_id: int, issued_at: datetime
+) -> str:
+    payload = {
+        "u": [updated_at.isoformat(), record_id] if updated_at else None,
+        "d": tombstone_id,
+        "s": issued_at.isoformat(),
+    }
+    return base64.urlsafe_b64encode(orjson.dumps(payload)).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        payload = orjson.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if payload["u"] is not None:
+            payload["u"] = (datetime.fromisoformat(payload["u"][0]), int(payload["u"][1]))
+        payload["d"] = int(payload["d"])
+        payload["s"] = datetime.fromisoformat(payload["s"])
+        return payload
+    except (ValueError, KeyError, TypeError, IndexError):
+        raise HTTPException(status_code=400, detail="无效的同步游标")
+
+
+async def sync_page(
+    db: AsyncSession,
+    model,
+    column_names: Sequence[str],
+    visibility,
+    tombstone_visibility,
+    cursor: Optional[str],
+    limit: int,
+) -> SyncPage:
+    """返回一页增量变更"""
+    # 时间戳由数据库生成（local_now），水位线截止时间也使用数据库时钟
+    now = await db.scalar(select(local_now()))
+    # 只返回 settle 窗口之前的变更，避免跳过时间戳较早但尚未提交的事务
+    cutoff = now - timedelta(seconds=settings.sync_settle_seconds)
+    table_name = model.__tablename__
+
+    if cursor:
+        state = decode_cursor(cursor)
+        retention = timedelta(days=settings.sync_tombstone_retention_days)
+        if state["s"] < now - retention:
+            # 游标早于墓碑保留期，可能漏掉已清理的删除记录
+            raise HTTPException(status_code=410, detail="同步游标已过期，请重新全量同步")
+        watermark, tombstone_id = state["u"], state["d"]
+    else:
+        # 首次同步返回全部现存记录，之前的删除记录无需返回
+        watermark = None
+        tombstone_id = (
+            await db.scalar(
+                select(func.coalesce(func.max(DeletedRecord.id), 0)).where(
+                    DeletedRecord.table_name == table_name
+                )
+            )
+        )
+
+    columns = [getattr(model, name) for name in column_names]
+    query = select(*columns).where(visibility, model.updated_at <= cutoff)
+    if watermark is not None:
+        query = query.where(tuple_(model.updated_at, model.id) > tuple_(*watermark))
+    result = await db.execute(
+        query.order_by(model.updated_at, model.id).limit(limit + 1)
+    )
+    rows = result.all()
+
+    tombstones = (
+        await db.execute(
+            select(DeletedRecord.id, DeletedRecord.record_id)
+            .where(
+                DeletedRecord.table_name == table_name,
+                DeletedRecord.id > tombstone_id,
+                DeletedRecord.deleted_at <= cutoff,
+                tombstone_visibility,
+                # 可见性变化也会写入删除记录，记录仍然存在且对当前用户可见时通过变更返回
+                ~select(model.id)
+                .where(model.id == DeletedRecord.record_id, visibility)
+                .exists(),
+            )
+            .order_by(DeletedRecord.id)
+            .limit(limit + 1)
+        )
+    ).all()
+
+    has_more = len(rows) > limit or len(tombstones) > limit
+    rows, tombstones = rows[:limit], tombstones[:limit]
+
+    if rows:
+        last = rows[-1]
+        watermark = (last.updated_at, last.id)
+    if tombstones:
+        tombstone_id = tombstones[-1].id
+
+    return SyncPage(
+        changes=[dict(zip(column_names, row)) for row in rows],
+        deleted=[tombstone.record_id for tombstone in tombstones],
+        next_cursor=encode_cursor(
+            watermark[0] if watermark else None,
+            watermark[1] if watermark else 0,
+            tombstone_id,
+            cutoff,
+        ),
+        has_more=has_more,
+    )
+
+
+@router.get("/credentials", response_model=SyncPage)
+async def sync_credentials(
+    cursor: Optional[str] = Query(None, description="上一页返回的 next_cursor，首次同步不传"),
+    limit: int = Query(settings.sync_page_size, ge=1, le=settings.sync_max_page_size),
+    user: User = Depends(get_current_api_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """认证凭据增量同步（按当前用户可见性过滤）"""
+    if user.is_superuser:
+        tombstone_visibility = true()
+    else:
+        tombstone_visibility = or_(
+            DeletedRecord.info_status == InfoStatusTypeEnum.PUBLIC.value,
+            and_(
+                DeletedRecord.info_status == InfoStatusTypeEnum.PRIVATE.value,
+                DeletedRecord.user_id == user.id,
+            ),
+        )
+
+    page = await sync_page(
+        db,
+        AuthCredentials,
+        CREDENTIAL_SYNC_COLUMNS,
+        credentials_visibility_clause(user),
+        tombstone_visibility,
+        cursor,
+        limit,
+    )
+    return FastJSONResponse(page)
+
+
+@router.get("/users", response_model=SyncPage)
+async def sync_users(
+    cursor: Optional[str] = Query(None, description="上一页返回的 next_cursor，首次同步不传"),
+    limit: int = Query(settings.sync_page_size, ge=1, le=settings.sync_max_page_size),
+    user: User = Depends(get_current_api_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """用户增量同步（超级用户同步全部用户，普通用户只同步自己）"""
+    if user.is_superuser:
+        visibility, tombstone_visibility = true(), true()
+    else:
+        visibility = User.id == user.id
+        # 普通用户自己被删除后无法再登录，不需要返回用户墓碑
+        tombstone_visibility = false()
+
+    page = await sync_page(
+        db, User, USER_SYNC_COLUMNS, visibility, tombstone_visibility, cursor, limit
+    )
+    return FastJSONResponse(page)
@@ -7,12 +7,41 @@ from typing import Optional
 from starlette.requests import Request
 from starlette.responses import Response, RedirectResponse
 from sqladmin.authentication import AuthenticationBackend
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from sqlalchemy import create_engine
-from base import DATABASE_URL, get_db
+from base import get_async_session_local, get_db
+from db.admin_executor import admin_db_executor, get_admin_db_mode
 from models.auth_model import User
 
 
+def _find_login_user(username: str, password: str) -> Optional[User]:
+    """查询用户并校验密码（同步，在管理界面线程池中执行，bcrypt 校验不阻塞事件循环）"""
+    with next(get_db()) as db:
+        user = db.query(User).filter(User.username == username).first()
+        if user and user.verify_password(password) and user.is_active:
+            return user
+    return None
+
+
+def _load_active_user(user_id: int) -> Optional[User]:
+    with next(get_db()) as db:
+        return (
+            db.query(User)
+            .filter(User.id == user_id, User.is_active == True)
+            .first()
+        )
+
+
+async def load_active_user(user_id: int) -> Optional[User]:
+    """按会话中的 user_id 加载有效用户（与管理界面使用相同的数据库模式）"""
+    if get_admin_db_mode() == "async":
+        async with get_async_session_local()() as db:
+            return await db.scalar(
+                select(User).where(User.id == user_id, User.is_active == True)
+            )
+    return await admin_db_executor.run(_load_active_user, user_id)
+
+
 class DatabaseAuthenticationBackend(AuthenticationBackend):
     """基于数据库的认证后端"""
 
@@ -26,19 +55,18 @@ class DatabaseAuthenticationBackend(AuthenticationBackend):
             return False
 
         # 验证用户凭据
-        with next(get_db()) as db:
-            user = db.query(User).filter(User.username == username).first()
-
-            if user and user.verify_password(password) and user.is_active:
-                # 登录成功，设置会话
-                request.session.update(
-                    {
-                        "user_id": user.id,
-                        "username": user.username,
-                        "is_superuser": user.is_superuser,
-                    }
-                )
-                return True
+        user = await admin_db_executor.run(_find_login_user, username, password)
+
+        if user:
+            # 登录成功，设置会话
+            request.session.update(
+                {
+                    "user_id": user.id,
+                    "username": user.username,
+                    "is_superuser": user.is_superuser,
+                }
+            )
+            return True
 
         return False
 
@@ -55,17 +83,12 @@ class DatabaseAuthenticationBackend(AuthenticationBackend):
             return False
 
         # 验证用户是否仍然有效
-        with next(get_db()) as db:
-            user = (
-                db.query(User)
-                .filter(User.id == user_id, User.is_active == True)
-                .first()
-            )
+        user = await load_active_user(user_id)
 
-            if user:
-                # 更新请求中的用户信息
-                request.state.user = user
-                return True
+        if user:
+            # 更新请求中的用户信息
+            request.state.user = user
+            return True
 
         # 用户无效，清除会话
         request.session.clear()
@@ -0,0 +1,129 @@
+"""
+权限错误处理
+以异常处理器的形式注册在应用上，正常请求没有任何额外开销；
+捕获 PermissionError 时使用预渲染的 403 页面，仅对错误信息做 HTML 转义后拼接
+"""
+
+import html
+import logging
+
+import orjson
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+
+from admin.auth_admin import PermissionError
+
+logger = logging.getLogger(__name__)
+
+
+# 403 页面模板在导入时渲染一次，错误信息插入到前后两段之间
+_FORBIDDEN_HTML_HEAD, _FORBIDDEN_HTML_TAIL = (
+    part.encode("utf-8")
+    for part in """<!DOCTYPE html>
+<html>
+<head>
+    <title>访问被拒绝</title>
+    <meta charset="utf-8">
+    <style>
+        body {
+            font-family: Arial, sans-serif;
+            margin: 40px;
+            background-color: #f8f9fa;
+        }
+        .error-container {
+            max-width: 600px;
+            margin: 0 auto;
+            text-align: center;
+            background: white;
+            padding: 40px;
+            border-radius: 8px;
+            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+        }
+        .error-code {
+            font-size: 72px;
+            color: #dc3545;
+            margin: 20px 0;
+            font-weight: bold;
+        }
+        .error-message {
+            font-size: 24px;
+            color: #495057;
+            margin: 20px 0;
+        }
+        .error-description {
+            font-size: 16px;
+            color: #6c757d;
+            margin: 20px 0;
+            line-height: 1.5;
+        }
+        .back-link {
+            margin-top: 30px;
+        }
+        .back-link a {
+            color: #007bff;
+            text-decoration: none;
+            font-weight: bold;
+            padding: 10px 20px;
+            border: 2px solid #007bff;
+            border-radius: 5px;
+            transition: all 0.3s;
+        }
+        .back-link a:hover {
+            background-color: #007bff;
+            color: white;
+        }
+    </style>
+</head>
+<body>
+    <div class="error-container">
+        <div class="error-code">403</div>
+        <div class="error-message">访问被拒绝</div>
+        <div class="error-description">{message}</div>
+        <div class="back-link">
+            <a href="/admin">返回管理界面</a>
+        </div>
+    </div>
+</body>
+</html>
+""".split("{message}")
+)
+
+
+def render_forbidden_html(message: str) -> bytes:
+    """渲染 403 错误页面"""
+    return _FORBIDDEN_HTML_HEAD + html.escape(message).encode("utf-8") + _FORBIDDEN_HTML_TAIL
+
+
+def render_forbidden_json(message: str) -> bytes:
+    """渲染 403 JSON 错误"""
+    return orjson.dumps({"error": message})
+
+
+async def permission_error_handler(request: Request, exc: PermissionError) -> Response:
+    """权限错误处理器 - API请求返回JSON错误，管理界面请求返回友好的错误页面"""
+    logger.warning(
+        f"权限错误: {exc.message} - 用户: {getattr(request.state, 'user', 'Unknown')}"
+    )
+
+    if request.url.path.startswith("/api/"):
+        return Response(
+            content=render_forbidden_json(exc.message),
+            status_code=403,
+            media_type="application/json",
+        )
+    return Response(
+        content=render_forbidden_html(exc.message),
+        status_code=403,
+        media_type="text/html",
+    )
+
+
+def register_permission_error_handlers(*apps: Starlette) -> None:
+    """在应用上注册权限错误处理器
+
+    SQLAdmin 挂载的子应用有自己的异常处理链，需要同时注册，
+    否则权限错误会先被子应用转换为 500 响应。
+    """
+    for app in apps:
+        app.add_exception_handler(PermissionError, permission_error_handler)
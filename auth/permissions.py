@@ -0,0 +1,92 @@
+"""
+API 权限工具
+为 FastAPI 路由提供当前用户依赖项和数据可见性过滤条件
+"""
+
+from typing import Optional
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy import and_, func, or_, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from base import get_async_db
+from db.counters import credentials_counter_statement, record_counters, users_counter_statement
+from db.partitioning import CREDENTIALS_PARTITIONING
+from models.auth_model import User, AuthCredentials, InfoStatusTypeEnum
+
+
+async def get_current_api_user(
+    request: Request, db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """获取当前登录用户（API依赖项），未登录时返回401"""
+    user: Optional[User] = getattr(request.state, "user", None)
+
+    if user is None:
+        # API 路由不经过 SQLAdmin 认证后端，根据会话中的 user_id 加载用户
+        user_id = request.session.get("user_id") if "session" in request.scope else None
+        if user_id:
+            result = await db.execute(
+                select(User).where(User.id == user_id, User.is_active == True)
+            )
+            user = result.scalar_one_or_none()
+
+    if not user:
+        raise HTTPException(status_code=401, detail="未登录")
+
+    return user
+
+
+def credentials_visibility_clause(user: User):
+    """认证凭据可见性条件：超级用户看到全部，普通用户看到公开凭据和自己的私有凭据"""
+    if user.is_superuser:
+        return true()
+
+    public = AuthCredentials.info_status == InfoStatusTypeEnum.PUBLIC.value
+    if CREDENTIALS_PARTITIONING == "user":
+        # 公开分区约束 user_id 为空，附加该条件结果不变，但使私有分区下的哈希分区也能按 user_id 裁剪
+        public = and_(public, AuthCredentials.user_id.is_(None))
+    return or_(
+        public,
+        and_(
+            AuthCredentials.info_status == InfoStatusTypeEnum.PRIVATE.value,
+            AuthCredentials.user_id == user.id,
+        ),
+    )
+
+
+def credentials_count_statement(user: User):
+    """可见凭据数的查询：计数表可用时汇总计数行，否则按可见性条件 count(*)"""
+    if record_counters.enabled:
+        return credentials_counter_statement(user)
+    return select(func.count(AuthCredentials.id)).where(credentials_visibility_clause(user))
+
+
+def users_count_statement():
+    """用户总数的查询（超级用户可见范围）"""
+    if record_counters.enabled:
+        return users_counter_statement()
+    return select(func.count(User.id))
+
+
+def can_view_credential(user: User, info_status: int, owner_id: Optional[int]) -> bool:
+    """与 credentials_visibility_clause 等价的内存判断（用于推送事件过滤）"""
+    return (
+        user.is_superuser
+        or info_status == InfoStatusTypeEnum.PUBLIC.value
+        or (info_status == InfoStatusTypeEnum.PRIVATE.value and owner_id == user.id)
+    )
+
+
+def apply_credentials_ownership(values: dict, user: User) -> dict:
+    """创建凭据时的归属规则（管理界面和批量创建API共用）
+
+    - 普通用户创建的凭据自动设为私有并关联到自己
+    - 超级用户创建公开凭据时清除用户关联，创建私有凭据未指定用户时关联到自己
+    """
+    if not user.is_superuser:
+        values["info_status"] = InfoStatusTypeEnum.PRIVATE.value
+        values["user_id"] = user.id
+    elif values.get("info_status") == InfoStatusTypeEnum.PUBLIC.value:
+        values["user_id"] = None
+    elif not values.get("user_id"):
+        values["user_id"] = user.id
+    return values
@@ -0,0 +1,149 @@
+"""
+API 并发基准测试
+对比 "同步会话阻塞事件循环"（旧实现）与 "AsyncSession 依赖注入"（现实现）
+在大量并发客户端下的延迟分布（p50/p95/p99）
+
+运行方式（项目根目录）:
+    python -m benchmarks.bench_api_concurrency --clients 50 --requests 2000 --slow-ms 200
+
+没有 PostgreSQL 时可先用 benchmarks.sqlite_db 创建 SQLite 数据库，再设置 DATABASE_URL 运行
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+import httpx
+from fastapi import Depends, FastAPI, Request
+from sqlalchemy import func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from base import engine, async_engine, get_db, get_async_db
+from models.auth_model import User, AuthCredentials
+from auth.permissions import get_current_api_user, credentials_visibility_clause
+from benchmarks.bench_utils import print_summary
+from benchmarks.sqlite_db import install_sqlite_sleep
+
+
+def build_legacy_app(bench_user: User, slow_seconds: float) -> FastAPI:
+    """构建旧实现：async 路由内直接执行同步查询"""
+    legacy = FastAPI()
+
+    @legacy.middleware("http")
+    async def inject_user(request: Request, call_next):
+        request.state.user = bench_user
+        return await call_next(request)
+
+    @legacy.get("/api/credentials/count")
+    async def legacy_count(request: Request):
+        user = request.state.user
+        with next(get_db()) as db:
+            count = (
+                db.query(func.count(AuthCredentials.id))
+                .filter(credentials_visibility_clause(user))
+                .scalar()
+            )
+        return {"count": count}
+
+    @legacy.get("/bench/slow")
+    async def legacy_slow():
+        with next(get_db()) as db:
+            db.execute(text("SELECT pg_sleep(:s)"), {"s": slow_seconds})
+        return {"ok": True}
+
+    return legacy
+
+
+def build_async_app(bench_user: User, slow_seconds: float) -> FastAPI:
+    """构建现实现：使用 main.app 的路由与依赖注入"""
+    from main import app
+
+    app.dependency_overrides[get_current_api_user] = lambda: bench_user
+
+    if not any(getattr(r, "path", None) == "/bench/slow" for r in app.routes):
+
+        @app.get("/bench/slow")
+        async def async_slow(db: AsyncSession = Depends(get_async_db)):
+            await db.execute(text("SELECT pg_sleep(:s)"), {"s": slow_seconds})
+            return {"ok": True}
+
+    return app
+
+
+async def run_load(app, clients: int, total: int, slow_clients: int) -> tuple:
+    """并发压测：clients 个客户端共发出 total 个请求，同时 slow_clients 个客户端持续请求慢查询"""
+    transport = httpx.ASGITransport(app=app)
+    latencies = []
+    queue: asyncio.Queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(None)
+    done = asyncio.Event()
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def worker():
+            while True:
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                start = time.perf_counter()
+                response = await client.get("/api/credentials/count")
+                latencies.append((time.perf_counter() - start) * 1000)
+                response.raise_for_status()
+
+        async def slow_worker():
+            while not done.is_set():
+                await client.get("/bench/slow")
+
+        slow_tasks = [asyncio.create_task(slow_worker()) for _ in range(slow_clients)]
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(clients)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await asyncio.gather(*slow_tasks)
+
+    return latencies, elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="API 并发基准测试")
+    parser.add_argument("--clients", type=int, default=50, help="并发客户端数")
+    parser.add_argument("--requests", type=int, default=2000, help="总请求数")
+    parser.add_argument("--slow-ms", type=int, default=200, help="慢查询耗时（毫秒）")
+    parser.add_argument("--slow-clients", type=int, default=2, help="慢查询客户端数")
+    parser.add_argument("--username", default="user1", help="以该用户身份请求")
+    args = parser.parse_args()
+
+    # 关闭SQL回显，避免日志输出影响测量
+    engine.echo = False
+    async_engine.echo = False
+    logging.disable(logging.INFO)
+    install_sqlite_sleep(engine)
+    install_sqlite_sleep(async_engine)
+
+    with next(get_db()) as db:
+        bench_user = db.query(User).filter(User.username == args.username).one()
+        db.expunge(bench_user)
+
+    slow_seconds = args.slow_ms / 1000
+    print(
+        f"clients={args.clients} requests={args.requests} "
+        f"slow_clients={args.slow_clients} slow_ms={args.slow_ms} user={args.username}"
+    )
+
+    for title, app in (
+        ("before: sync session", build_legacy_app(bench_user, slow_seconds)),
+        ("after: AsyncSession", build_async_app(bench_user, slow_seconds)),
+    ):
+        latencies, elapsed = await run_load(
+            app, args.clients, args.requests, args.slow_clients
+        )
+        print_summary(title, latencies, elapsed)
+
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,88 @@
+"""
+批量写入吞吐基准测试
+对比初始化/导入数据时常用的写入路径（每种方式在事务中执行后回滚，不改变数据库内容）：
+1. ORM：构造模型对象 + session.add_all + flush
+2. Core：insert(table) 多行 executemany，不经过 ORM
+
+写入的行不包含 created_at / updated_at / pp_token，由字段默认值填充
+
+运行方式（项目根目录，需要 DATABASE_URL 指向可写的数据库）:
+    python -m benchmarks.bench_bulk_insert --rows 20000
+"""
+
+import argparse
+import time
+import uuid
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+
+def user_rows(count: int, tag: str) -> list:
+    return [
+        {
+            "username": f"bulk_{tag}_{i}",
+            "email": f"bulk_{tag}_{i}@example.com",
+            "hashed_password": "not-a-real-hash",
+            "description": {"department": "技术部", "index": i},
+        }
+        for i in range(count)
+    ]
+
+
+def credential_rows(count: int) -> list:
+    return [
+        {
+            "info": f"批量凭据-{i}",
+            "info_status": 0,
+            "config_info": {"api_url": f"https://api{i % 50}.example.com", "rate_limit": 1000},
+            "description": {"purpose": "批量写入基准测试"},
+        }
+        for i in range(count)
+    ]
+
+
+def run_orm(engine, model, rows: list) -> float:
+    with Session(engine) as session:
+        start = time.perf_counter()
+        session.add_all([model(**row) for row in rows])
+        session.flush()
+        elapsed = time.perf_counter() - start
+        session.rollback()
+    return elapsed
+
+
+def run_core(engine, model, rows: list) -> float:
+    with engine.connect() as conn:
+        start = time.perf_counter()
+        conn.execute(insert(model), rows)
+        elapsed = time.perf_counter() - start
+        conn.rollback()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="批量写入吞吐基准测试")
+    parser.add_argument("--rows", type=int, default=20000, help="每种方式写入的行数")
+    parser.add_argument("--repeat", type=int, default=3, help="每种方式的执行次数（取最优）")
+    args = parser.parse_args()
+
+    from base import get_engine
+    from models.auth_model import AuthCredentials, User
+
+    engine = get_engine()
+    cases = [
+        ("users ORM", run_orm, User, lambda: user_rows(args.rows, uuid.uuid4().hex[:8])),
+        ("users Core", run_core, User, lambda: user_rows(args.rows, uuid.uuid4().hex[:8])),
+        ("credentials ORM", run_orm, AuthCredentials, lambda: credential_rows(args.rows)),
+        ("credentials Core", run_core, AuthCredentials, lambda: credential_rows(args.rows)),
+    ]
+
+    print(f"{engine.dialect.name}，每种方式 {args.rows} 行，取 {args.repeat} 次最优")
+    for title, runner, model, make_rows in cases:
+        best = min(runner(engine, model, make_rows()) for _ in range(args.repeat))
+        print(f"{title:<20} {best * 1000:9.1f}ms {args.rows / best:10.0f} 行/秒")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+计数查询基准测试
+对比每个权限范围的 count(*) 与汇总 record_counts 计数行的耗时，并确认两者结果一致：
+1. 超级用户：全部凭据
+2. 普通用户：公开凭据 + 自己的私有凭据
+3. 用户总数
+
+先把 auth_credentials 填充到 --rows 行（标记 info='bench_counts'，按语句分批写入，
+计数由触发器在写入时维护），执行 VACUUM ANALYZE 后计时；--cleanup 删除填充的行
+
+运行方式（项目根目录，需要 PostgreSQL 且已执行 python init_db.py upgrade 安装计数触发器）:
+    python -m benchmarks.bench_counts --rows 10000000
+    python -m benchmarks.bench_counts --cleanup
+"""
+
+import argparse
+import sys
+import time
+
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+
+from benchmarks.bench_utils import time_call
+
+BENCH_TAG = "bench_counts"
+
+
+def fill_credentials(engine, target: int, batch_size: int) -> int:
+    """写入凭据直到表中有 target 行：每 10 行 1 条公开凭据，其余为私有凭据并轮流分配给现有用户"""
+    from models.auth_model import AuthCredentials, InfoStatusTypeEnum, User
+
+    with engine.connect() as conn:
+        existing = conn.scalar(select(func.count()).select_from(AuthCredentials))
+        user_ids = list(conn.scalars(select(User.id).order_by(User.id)))
+    if not user_ids:
+        raise SystemExit("没有用户，请先执行 python init_db.py")
+
+    missing = max(0, target - existing)
+    written = 0
+    start = time.perf_counter()
+    while written < missing:
+        count = min(batch_size, missing - written)
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "INSERT INTO auth_credentials (info, info_status, user_id) "
+                    "SELECT :tag, CASE WHEN g % 10 = 0 THEN :public ELSE :private END, "
+                    "CASE WHEN g % 10 = 0 THEN NULL "
+                    "ELSE (CAST(:user_ids AS integer[]))[g % :user_count + 1] END "
+                    "FROM generate_series(:first, :last) AS g"
+                ),
+                {
+                    "tag": BENCH_TAG,
+                    "public": InfoStatusTypeEnum.PUBLIC.value,
+                    "private": InfoStatusTypeEnum.PRIVATE.value,
+                    "user_ids": user_ids,
+                    "user_count": len(user_ids),
+                    "first": written + 1,
+                    "last": written + count,
+                },
+            )
+        written += count
+        print(f"\r已写入 {written}/{missing} 行", end="", flush=True)
+    if missing:
+        print(f"，耗时 {time.perf_counter() - start:.1f}s")
+    return existing + missing
+
+
+def cleanup(engine) -> None:
+    from models.auth_model import AuthCredentials
+
+    with engine.begin() as conn:
+        result = conn.execute(
+            AuthCredentials.__table__.delete().where(AuthCredentials.info == BENCH_TAG)
+        )
+    print(f"已删除 {result.rowcount} 行基准测试数据")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="计数查询基准测试")
+    parser.add_argument("--rows", type=int, default=10_000_000, help="auth_credentials 的目标行数")
+    parser.add_argument("--batch-size", type=int, default=1_000_000, help="每条 INSERT 语句写入的行数")
+    parser.add_argument("--repeat", type=int, default=5, help="每个查询的执行次数（取最优）")
+    parser.add_argument("--cleanup", action="store_true", help="删除填充的基准测试数据后退出")
+    args = parser.parse_args()
+
+    from auth.permissions import credentials_visibility_clause
+    from base import get_engine
+    from db.counters import credentials_counter_statement, users_counter_statement
+    from models.auth_model import AuthCredentials, User
+
+    engine = get_engine()
+    if engine.dialect.name != "postgresql":
+        print(f"需要 PostgreSQL（当前为 {engine.dialect.name}）")
+        return 1
+    if args.cleanup:
+        cleanup(engine)
+        return 0
+
+    total = fill_credentials(engine, args.rows, args.batch_size)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.exec_driver_sql("VACUUM ANALYZE auth_credentials")
+        conn.exec_driver_sql("VACUUM ANALYZE record_counts")
+
+    with Session(engine) as session:
+        superuser = session.scalars(select(User).where(User.is_superuser == True)).first()
+        regular = session.scalars(select(User).where(User.is_superuser == False)).first()
+
+    with engine.connect() as conn:
+        cases = [
+            (
+                f"凭据（超级用户 {superuser.username}）",
+                select(func.count()).select_from(AuthCredentials).where(
+                    credentials_visibility_clause(superuser)
+                ),
+                credentials_counter_statement(superuser),
+            ),
+            (
+                f"凭据（普通用户 {regular.username}）",
+                select(func.count()).select_from(AuthCredentials).where(
+                    credentials_visibility_clause(regular)
+                ),
+                credentials_counter_statement(regular),
+            ),
+            ("用户总数", select(func.count()).select_from(User), users_counter_statement()),
+        ]
+
+        print(f"auth_credentials {total} 行，每个查询取 {args.repeat} 次最优")
+        mismatches = 0
+        for title, scan, counter in cases:
+            expected, actual = conn.scalar(scan), conn.scalar(counter)
+            scan_time = time_call(lambda: conn.scalar(scan), args.repeat)
+            counter_time = time_call(lambda: conn.scalar(counter), args.repeat)
+            ok = expected == actual
+            mismatches += not ok
+            print(
+                f"{title:<24} count(*) {scan_time * 1000:10.2f}ms  "
+                f"计数表 {counter_time * 1000:8.3f}ms  "
+                f"x{scan_time / counter_time:8.0f}  "
+                f"{'一致' if ok else f'不一致: {expected} != {actual}'}"
+            )
+
+    if mismatches:
+        print("\n计数与实际行数不一致，可执行 python init_db.py reconcile-counts 校正")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""
+管理表单 JSON 字段基准测试
+对比 CustomJSONField 原实现（json.loads 解析、每次显示 json.dumps(indent=2)）
+与现实现（大小/深度检查 + orjson 解析，缩进文本只生成一次）的单次提交和显示耗时
+
+运行方式（项目根目录，无需数据库）:
+    python -m benchmarks.bench_json_field --keys 2000
+"""
+
+import argparse
+import json
+
+from benchmarks.bench_utils import time_call
+
+
+def make_document(keys: int) -> dict:
+    return {
+        f"key_{i}": {"id": i, "name": f"名称-{i}", "tags": ["a", "b", "c"], "enabled": i % 2 == 0}
+        for i in range(keys)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="管理表单 JSON 字段基准测试")
+    parser.add_argument("--keys", type=int, default=2000, help="文档的顶层键数")
+    parser.add_argument("--renders", type=int, default=3, help="每次请求显示字段的次数")
+    parser.add_argument("--repeat", type=int, default=20, help="执行次数（取最优）")
+    args = parser.parse_args()
+
+    from config import settings
+    from forms.auth_forms import dumps_pretty, parse_json_text
+
+    document = make_document(args.keys)
+    text = json.dumps(document, ensure_ascii=False, indent=2)
+    print(f"文档 {len(text) / 1024:.0f}KB，{args.keys} 个顶层键，每次显示 {args.renders} 次")
+
+    def old_submit():
+        data = json.loads(text)
+        for _ in range(args.renders):
+            json.dumps(data, ensure_ascii=False, indent=2)
+
+    def new_submit():
+        # 解析成功时显示沿用提交的原文
+        parse_json_text(text, settings.json_field_max_size * 16, settings.json_field_max_depth)
+
+    def old_render():
+        for _ in range(args.renders):
+            json.dumps(document, ensure_ascii=False, indent=2)
+
+    def new_render():
+        dumps_pretty(document)
+
+    for title, old, new in (("提交", old_submit, new_submit), ("编辑页显示", old_render, new_render)):
+        before, after = time_call(old, args.repeat), time_call(new, args.repeat)
+        print(f"{title:<10} 原实现 {before * 1000:8.2f}ms  现实现 {after * 1000:8.2f}ms  x{before / after:5.1f}")
+
+
+if __name__ == "__main__":
+    main()
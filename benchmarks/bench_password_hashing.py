@@ -0,0 +1,42 @@
+"""
+密码哈希吞吐基准测试
+对比逐个调用 User.hash_password 与进程池批量哈希（services/password_hashing.py）每秒计算的哈希数；
+进程池耗时包含首次创建进程池（spawn 工作进程）的开销
+
+运行方式（项目根目录，无需数据库）:
+    python -m benchmarks.bench_password_hashing --count 64
+    python -m benchmarks.bench_password_hashing --count 64 --workers 8
+"""
+
+import argparse
+import os
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="密码哈希吞吐基准测试")
+    parser.add_argument("--count", type=int, default=32, help="哈希的密码数")
+    parser.add_argument("--workers", type=int, default=None, help="进程数，默认 PASSWORD_HASH_WORKERS 或 CPU 核数")
+    args = parser.parse_args()
+
+    from models.auth_model import User
+    from services.password_hashing import PasswordHasher, password_hasher
+
+    passwords = [f"password-{i}" for i in range(args.count)]
+    hasher = PasswordHasher(args.workers) if args.workers else password_hasher
+
+    start = time.perf_counter()
+    for password in passwords:
+        User.hash_password(password)
+    sequential = time.perf_counter() - start
+    print(f"CPU 核数 {os.cpu_count()}，{args.count} 个密码")
+    print(f"{'逐个计算':<12} {sequential:8.2f}s {args.count / sequential:8.1f} 个/秒")
+
+    batch = hasher.hash_many(passwords)
+    print(f"{f'进程池 x{hasher.workers}':<12} {batch.seconds:8.2f}s {batch.rate:8.1f} 个/秒 "
+          f"（加速 {sequential / batch.seconds:.1f} 倍）")
+    hasher.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+权限错误处理开销基准测试
+对比旧的 BaseHTTPMiddleware 实现与注册在应用上的异常处理器：
+1. 正常请求的单请求开销
+2. 权限错误时 403 页面的渲染耗时（f-string 整页拼接 vs 预渲染模板）
+
+运行方式（项目根目录，无需数据库）:
+    python -m benchmarks.bench_permission_overhead --requests 20000
+"""
+
+import argparse
+import asyncio
+import time
+
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import HTMLResponse, PlainTextResponse, Response
+from starlette.routing import Route
+
+from admin.auth_admin import PermissionError
+from auth.error_handlers import (
+    register_permission_error_handlers,
+    render_forbidden_html,
+)
+from benchmarks.bench_utils import time_call
+
+
+class LegacyPermissionMiddleware(BaseHTTPMiddleware):
+    """旧实现（简化）：BaseHTTPMiddleware 包装每个请求，错误时 f-string 拼接页面"""
+
+    async def dispatch(self, request: Request, call_next):
+        try:
+            return await call_next(request)
+        except PermissionError as e:
+            return Response(legacy_render(e.message), 403, media_type="text/html")
+
+
+# 旧实现每次用 f-string 拼出整页字符串，再由 HTMLResponse 编码（且未转义错误信息）
+_LEGACY_HEAD, _LEGACY_TAIL = render_forbidden_html("\x00").decode("utf-8").split("\x00")
+
+
+def legacy_render(message: str) -> bytes:
+    return HTMLResponse(f"{_LEGACY_HEAD}{message}{_LEGACY_TAIL}").body
+
+
+def prebuilt_render(message: str) -> bytes:
+    return Response(render_forbidden_html(message), media_type="text/html").body
+
+
+async def ok(request):
+    return PlainTextResponse("ok")
+
+
+def build_app(legacy: bool) -> Starlette:
+    app = Starlette(routes=[Route("/static/custom.css", ok)])
+    if legacy:
+        app.add_middleware(LegacyPermissionMiddleware)
+    else:
+        register_permission_error_handlers(app)
+    return app
+
+
+async def drive(app, requests: int) -> float:
+    """直接以 ASGI 方式调用应用，返回平均单请求耗时（微秒）"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/static/custom.css",
+        "raw_path": b"/static/custom.css",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    # 预热
+    for _ in range(100):
+        await app(dict(scope), receive, send)
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="权限错误处理开销基准测试")
+    parser.add_argument("--requests", type=int, default=20000, help="请求数")
+    args = parser.parse_args()
+
+    print(f"requests={args.requests}")
+    for title, legacy in (
+        ("BaseHTTPMiddleware", True),
+        ("exception handler", False),
+    ):
+        per_request = asyncio.run(drive(build_app(legacy), args.requests))
+        print(f"{title:<22} {per_request:8.1f}us/request")
+
+    message = "只能编辑自己的私有认证凭据"
+    loops = 10000
+    legacy_time = time_call(lambda: [legacy_render(message) for _ in range(loops)])
+    fast_time = time_call(
+        lambda: [prebuilt_render(message) for _ in range(loops)]
+    )
+    print(f"{'403 f-string render':<22} {legacy_time / loops * 1e6:8.2f}us")
+    print(f"{'403 prebuilt render':<22} {fast_time / loops * 1e6:8.2f}us")
+
+
+if __name__ == "__main__":
+    main()
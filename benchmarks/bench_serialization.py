@@ -0,0 +1,106 @@
+"""
+API 序列化基准测试
+对比 10k 行凭据列表在不同序列化路径下的耗时：
+1. 旧实现：逐行构造dict + isoformat + jsonable_encoder + json.dumps
+2. FastAPI response_model（pydantic 校验与序列化）
+3. 现实现：行元组 -> 数据类 -> orjson（FastJSONResponse）
+
+运行方式（项目根目录，无需数据库）:
+    python -m benchmarks.bench_serialization --rows 10000
+"""
+
+import argparse
+import json
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from starlette.responses import JSONResponse
+
+from schemas.api_schemas import CredentialItem, FastJSONResponse
+from benchmarks.bench_utils import time_call
+
+
+def make_rows(count: int) -> list:
+    """构造与凭据列表查询结果相同形状的行元组"""
+    now = datetime.now()
+    return [
+        (
+            i,
+            f"凭据-{i}",
+            now + timedelta(days=i % 365) if i % 3 else None,
+            now - timedelta(minutes=i),
+            now,
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+class _FakeCredential:
+    """模拟ORM实体（旧实现逐属性读取）"""
+
+    __slots__ = ("id", "info", "expires_at", "created_at", "updated_at")
+
+    def __init__(self, row):
+        self.id, self.info, self.expires_at, self.created_at, self.updated_at = row
+
+
+def legacy_path(credentials: list) -> bytes:
+    payload = [
+        {
+            "id": cred.id,
+            "info": cred.info,
+            "expires_at": cred.expires_at.isoformat() if cred.expires_at else None,
+            "created_at": cred.created_at.isoformat() if cred.created_at else None,
+            "updated_at": cred.updated_at.isoformat() if cred.updated_at else None,
+            "can_edit": True,
+            "can_delete": True,
+        }
+        for cred in credentials
+    ]
+    return JSONResponse(jsonable_encoder(payload)).body
+
+
+_adapter = TypeAdapter(List[CredentialItem])
+
+
+def response_model_path(rows: list) -> bytes:
+    return _adapter.dump_json([CredentialItem(*row, True, True) for row in rows])
+
+
+def fast_path(rows: list) -> bytes:
+    return FastJSONResponse([CredentialItem(*row, True, True) for row in rows]).body
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API 序列化基准测试")
+    parser.add_argument("--rows", type=int, default=10000, help="行数")
+    parser.add_argument("--repeat", type=int, default=7, help="重复次数（取最优）")
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    credentials = [_FakeCredential(row) for row in rows]
+
+    # 校验新旧路径输出一致
+    assert json.loads(legacy_path(credentials)) == json.loads(fast_path(rows))
+
+    print(f"rows={args.rows}")
+    results = [
+        ("dict + jsonable_encoder", lambda: legacy_path(credentials)),
+        ("pydantic response_model", lambda: response_model_path(rows)),
+        ("dataclass + orjson", lambda: fast_path(rows)),
+    ]
+    baseline = None
+    for title, func in results:
+        elapsed = time_call(func, args.repeat)
+        baseline = baseline or elapsed
+        size = len(func())
+        print(
+            f"{title:<26} {elapsed * 1000:9.2f}ms  "
+            f"{size / 1024:8.1f}KiB  x{baseline / elapsed:5.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
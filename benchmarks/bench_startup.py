@@ -0,0 +1,119 @@
+"""
+启动耗时基准测试
+在全新子进程中用 -X importtime 测量各入口模块的导入耗时（取多次最优），超过预算时以非零状态退出，
+可在 CI 中防止启动时间回退：
+1. base / models.auth_model：只导入模型时不应加载数据库驱动或创建引擎
+2. main：完整应用（FastAPI + SQLAdmin）的导入和构建耗时，引擎在生命周期开始时才创建，导入时同样不应加载数据库驱动
+
+运行方式（项目根目录，main 需要可解析的 DATABASE_URL，但不会连接数据库）:
+    python -m benchmarks.bench_startup --repeat 5
+    python -m benchmarks.bench_startup --budget main=1500 --budget base=500
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+# 默认导入预算（毫秒，-X importtime 统计的模块累计耗时）
+DEFAULT_BUDGETS = {
+    "base": 600,
+    "models.auth_model": 700,
+    "main": 2000,
+}
+
+# 数据库驱动（及对应的 SQLAlchemy 方言模块）在首次创建引擎时才导入
+DRIVER_MODULES = ("psycopg2", "asyncpg", "aiosqlite", "sqlalchemy.dialects.sqlite.aiosqlite")
+
+# 导入各入口模块时不应加载的模块：main 的引擎在应用生命周期开始时才创建
+LAZY_MODULES = {
+    "base": DRIVER_MODULES + ("db.engine_factory",),
+    "models.auth_model": DRIVER_MODULES + ("db.engine_factory",),
+    "main": DRIVER_MODULES,
+}
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """解析 -X importtime 输出，返回顶层模块的累计耗时（微秒）"""
+    result = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if not name.startswith("  "):
+            result[name.strip()] = int(cumulative)
+    return result
+
+
+def measure(module: str, repeat: int) -> Tuple[float, float]:
+    """返回 (模块导入耗时, 进程总耗时)，单位毫秒，各取最优值"""
+    best_import, best_wall = float("inf"), float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+        )
+        wall = (time.perf_counter() - start) * 1000
+        if completed.returncode != 0:
+            raise RuntimeError(f"导入 {module} 失败:\n{completed.stderr[-2000:]}")
+        timings = parse_importtime(completed.stderr)
+        best_import = min(best_import, timings[module] / 1000)
+        best_wall = min(best_wall, wall)
+    return best_import, best_wall
+
+
+def loaded_lazy_modules(module: str) -> List[str]:
+    """导入 module 后已加载的本应延迟加载的模块"""
+    code = (
+        f"import sys, {module}\n"
+        f"print(','.join(m for m in {LAZY_MODULES[module]!r} if m in sys.modules))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout.strip()
+    return [name for name in output.split(",") if name]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="启动耗时基准测试")
+    parser.add_argument("--repeat", type=int, default=5, help="每个模块的测量次数（取最优）")
+    parser.add_argument(
+        "--budget",
+        action="append",
+        default=[],
+        metavar="MODULE=MS",
+        help="覆盖导入预算，如 main=1500（可多次指定）",
+    )
+    args = parser.parse_args()
+
+    budgets = dict(DEFAULT_BUDGETS)
+    for item in args.budget:
+        module, _, value = item.partition("=")
+        budgets[module] = float(value)
+
+    failures = []
+    for module, budget in budgets.items():
+        import_ms, wall_ms = measure(module, args.repeat)
+        status = "ok" if import_ms <= budget else "超出预算"
+        print(
+            f"{module:<20} import={import_ms:8.1f}ms process={wall_ms:8.1f}ms "
+            f"budget={budget:8.1f}ms {status}"
+        )
+        if import_ms > budget:
+            failures.append(module)
+
+    for module in LAZY_MODULES:
+        loaded = loaded_lazy_modules(module)
+        if loaded:
+            print(f"{module:<20} 导入时加载了应延迟加载的模块: {', '.join(loaded)}")
+            failures.append(module)
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+基准测试公共工具
+"""
+
+import statistics
+import time
+from typing import Callable, Dict, List
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """计算百分位数（最近秩法）"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """汇总延迟样本（单位：毫秒）"""
+    return {
+        "count": len(samples),
+        "mean": statistics.fmean(samples) if samples else 0.0,
+        "p50": percentile(samples, 50),
+        "p95": percentile(samples, 95),
+        "p99": percentile(samples, 99),
+        "max": max(samples) if samples else 0.0,
+    }
+
+
+def print_summary(title: str, samples: List[float], elapsed: float = None) -> None:
+    """打印延迟汇总"""
+    stats = summarize(samples)
+    line = (
+        f"{title:<28} n={stats['count']:<6} "
+        f"mean={stats['mean']:8.2f}ms p50={stats['p50']:8.2f}ms "
+        f"p95={stats['p95']:8.2f}ms p99={stats['p99']:8.2f}ms max={stats['max']:8.2f}ms"
+    )
+    if elapsed:
+        line += f" rps={stats['count'] / elapsed:8.1f}"
+    print(line)
+
+
+def time_call(func: Callable, repeat: int = 5) -> float:
+    """多次执行取最优耗时（秒）"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
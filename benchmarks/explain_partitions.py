@@ -0,0 +1,137 @@
+"""
+凭据分区裁剪验证
+对列表/计数接口和管理界面使用的凭据查询条件执行 EXPLAIN，确认按 user 方式分区
+（CREDENTIALS_PARTITIONING=user）时只扫描期望的分区，扫描了多余的分区时以非零状态退出。
+
+每个条件检查两种执行计划：
+- 参数内联的计划（psycopg2 同步引擎，规划时裁剪）
+- 参数化的通用计划（与 asyncpg 预编译语句相同，执行器启动时裁剪，EXPLAIN 中为 Subplans Removed）
+
+运行方式（项目根目录，需要 PostgreSQL 且已按 user 方式执行 python init_db.py 建表）:
+    CREDENTIALS_PARTITIONING=user python -m benchmarks.explain_partitions
+"""
+
+import json
+import re
+import sys
+from types import SimpleNamespace
+from typing import Iterator
+
+from sqlalchemy import func, select
+
+USER_ID = 7
+PRIVATE_HASH_PARTITION = re.compile(r"^auth_credentials_private_p\d+$")
+
+
+def plan_relations(node: dict) -> Iterator[str]:
+    """执行计划中扫描的全部表（分区）名"""
+    if "Relation Name" in node:
+        yield node["Relation Name"]
+    for child in node.get("Plans", []):
+        yield from plan_relations(child)
+
+
+def cases():
+    """(名称, 语句, 期望扫描的分区：public 为公开分区，private 为一个私有哈希分区)"""
+    from auth.permissions import credentials_visibility_clause
+    from models.auth_model import AuthCredentials, InfoStatusTypeEnum
+
+    user = SimpleNamespace(id=USER_ID, is_superuser=False)
+    visible = credentials_visibility_clause(user)
+    return [
+        ("列表（普通用户可见范围）", select(AuthCredentials.id).where(visible), {"public", "private"}),
+        ("计数（普通用户可见范围）", select(func.count(AuthCredentials.id)).where(visible), {"public", "private"}),
+        (
+            "我的凭据",
+            select(AuthCredentials.id).where(
+                AuthCredentials.info_status == InfoStatusTypeEnum.PRIVATE.value,
+                AuthCredentials.user_id == USER_ID,
+            ),
+            {"private"},
+        ),
+        (
+            "公开凭据",
+            select(AuthCredentials.id).where(
+                AuthCredentials.info_status == InfoStatusTypeEnum.PUBLIC.value
+            ),
+            {"public"},
+        ),
+    ]
+
+
+def scanned_kinds(relations: list) -> dict:
+    """按分区类型统计扫描次数：public / private（每个哈希分区计一次）/ 其他分区名"""
+    from db.partitioning import PUBLIC_PARTITION
+
+    counts = {}
+    for name in relations:
+        if name == PUBLIC_PARTITION:
+            kind = "public"
+        elif PRIVATE_HASH_PARTITION.match(name):
+            kind = "private"
+        else:
+            kind = name
+        counts[kind] = counts.get(kind, 0) + 1
+    return counts
+
+
+def explain_inline(conn, statement) -> list:
+    compiled = statement.compile(dialect=conn.dialect)
+    plan = conn.exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled.string}", compiled.params
+    ).scalar_one()
+    return list(plan_relations(plan[0]["Plan"]))
+
+
+def explain_generic(conn, statement) -> list:
+    """以 asyncpg 方言编译（$1 参数），PREPARE 后强制使用通用计划执行 EXPLAIN"""
+    from sqlalchemy.dialects.postgresql.asyncpg import dialect as asyncpg_dialect
+
+    compiled = statement.compile(dialect=asyncpg_dialect())
+    values = [compiled.params[name] for name in compiled.positiontup]
+    conn.exec_driver_sql("SET plan_cache_mode = force_generic_plan")
+    conn.exec_driver_sql(f"PREPARE partition_check AS {compiled.string}")
+    try:
+        placeholders = ", ".join(["%s"] * len(values))
+        execute = f"EXECUTE partition_check({placeholders})" if values else "EXECUTE partition_check"
+        plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {execute}", tuple(values)).scalar_one()
+    finally:
+        conn.exec_driver_sql("DEALLOCATE partition_check")
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return list(plan_relations(plan[0]["Plan"]))
+
+
+def main() -> int:
+    from base import get_engine
+    from db.partitioning import CREDENTIALS_PARTITIONING, credentials_table_kind
+
+    engine = get_engine()
+    if engine.dialect.name != "postgresql" or CREDENTIALS_PARTITIONING != "user":
+        print("需要 PostgreSQL 且 CREDENTIALS_PARTITIONING=user")
+        return 1
+
+    failures = 0
+    with engine.connect() as conn:
+        if credentials_table_kind(conn) != "p":
+            print("auth_credentials 不是分区表，请先按 user 方式执行 python init_db.py")
+            return 1
+
+        for title, statement, expected in cases():
+            for mode, explain in (("内联", explain_inline), ("通用", explain_generic)):
+                counts = scanned_kinds(explain(conn, statement))
+                # 公开条件附加的 user_id IS NULL 还会命中 NULL 所在的哈希分区（索引扫描，没有数据）
+                allowed_private = 2 if expected == {"public", "private"} else 1
+                ok = set(counts) == expected and counts.get("private", 0) <= allowed_private
+                failures += not ok
+                summary = ", ".join(f"{kind}×{count}" for kind, count in sorted(counts.items()))
+                print(f"{'ok  ' if ok else 'FAIL'} {title:<16} {mode}计划 扫描: {summary}")
+        conn.rollback()
+
+    if failures:
+        print(f"\n{failures} 个查询扫描了多余的分区")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
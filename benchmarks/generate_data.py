@@ -0,0 +1,350 @@
+"""
+合成数据生成器
+为负载和规模测试向当前数据库（DATABASE_URL）追加 N 个用户和 M 条凭据，可配置：
+- 公开/私有凭据比例
+- 过期时间分布：有过期时间的比例、其中已过期的比例、过期时间范围
+- JSONB 字段大小：config_info 附加指定长度的 notes 字段
+- 凭据归属倾斜：私有凭据按 Zipf 分布分配给用户（排名第 k 的用户权重为 1/k^skew），0 为均匀分配
+
+相同的种子、用户名前缀和基准日期生成相同的数据。PostgreSQL 通过 COPY 分批写入（计数触发器按语句汇总），
+其他数据库使用分批 executemany。生成的用户共用一个预先计算的低成本 bcrypt 哈希，密码为 user123456
+
+运行方式（项目根目录，需要已执行 python init_db.py 建表）:
+    python -m benchmarks.generate_data --users 10000 --credentials 1000000
+    python -m benchmarks.generate_data --users 1000 --credentials 10000000 --skew 1.2 --payload-bytes 2048
+"""
+
+import argparse
+import io
+import itertools
+import json
+import random
+import string
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, insert, select
+
+# bcrypt.hashpw(b"user123456", bcrypt.gensalt(rounds=4))：cost 4 只用于测试数据，登录校验仍按哈希中的 cost 计算
+FAKE_PASSWORD = "user123456"
+FAKE_PASSWORD_HASH = "$2b$04$sATIzjqCUPsGEZ/5jX9ab.wx01GpXZDOlGUR5vyPSEG/mT3rONKt6"
+
+DEPARTMENTS = ["技术部", "业务部", "测试部", "运维部", "财务部"]
+PERMISSIONS = ["read", "write", "delete", "admin"]
+SCOPES = ["read", "write", "admin", "profile"]
+
+# notes 填充内容的候选数，生成时从中随机选取，避免逐行构造长字符串
+FILLER_POOL_SIZE = 64
+DAY_SECONDS = 86400
+
+USER_COLUMNS = [
+    "username", "email", "pp_token", "hashed_password", "is_active",
+    "is_superuser", "remark", "description", "created_at", "updated_at",
+]
+CREDENTIAL_COLUMNS = [
+    "info", "info_status", "user_id", "expires_at",
+    "config_info", "description", "created_at", "updated_at",
+]
+# 生成器以文本形式给出 JSON 和时间戳（COPY 直接使用），其他写入方式再转换为对象
+JSON_COLUMNS = {"description", "config_info"}
+TIMESTAMP_COLUMNS = {"expires_at", "created_at", "updated_at"}
+
+
+@dataclass
+class GeneratorOptions:
+    users: int = 1000
+    credentials: int = 100000
+    public_ratio: float = 0.2  # 公开凭据比例
+    expires_ratio: float = 0.7  # 有过期时间的凭据比例
+    expired_ratio: float = 0.1  # 有过期时间的凭据中已过期的比例
+    expiry_days: int = 365  # 过期时间距基准日期的最大天数（前后）
+    history_days: int = 365  # created_at 分布在基准日期之前的天数
+    payload_bytes: int = 0  # config_info 中 notes 字段的长度
+    skew: float = 1.0  # 凭据归属的 Zipf 指数，0 为均匀分配
+    prefix: str = "load"  # 生成的用户名前缀
+    seed: int = 42
+    base_date: Optional[datetime] = None  # 时间戳的基准，默认当天零点
+    batch_size: int = 50000
+    defer_indexes: bool = False  # PostgreSQL 写入凭据前删除二级索引，写入后重建
+
+
+class DataGenerator:
+    """按列生成用户和凭据数据（只生成值，不访问数据库）
+
+    时间戳按相对基准日期的秒数生成，日期和时刻的文本分别缓存后拼接；
+    JSON 由预先序列化的片段拼接，逐行只做少量随机数和字符串操作
+    """
+
+    def __init__(self, options: GeneratorOptions):
+        self.options = options
+        # 不同前缀的数据（如多次追加）使用不同的随机序列，pp_token 不会重复
+        self.rng = random.Random(f"{options.seed}:{options.prefix}")
+        self.base = (options.base_date or datetime.now()).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        self.days: Dict[int, str] = {}
+        self.times = [
+            f"{second // 3600:02d}:{second // 60 % 60:02d}:{second % 60:02d}"
+            for second in range(DAY_SECONDS)
+        ]
+        self.scope_pairs = [
+            json.dumps([first, second]) for first in SCOPES for second in SCOPES if first != second
+        ]
+        self.notes = [
+            ',"notes":"%s"' % "".join(self.rng.choices(string.ascii_letters + string.digits, k=options.payload_bytes))
+            for _ in range(FILLER_POOL_SIZE)
+        ] if options.payload_bytes > 0 else [""]
+        self.descriptions = [
+            json.dumps({"purpose": "合成数据", "owner_team": f"team-{team}"}, ensure_ascii=False)
+            for team in range(20)
+        ]
+
+    def timestamp(self, seconds: int) -> str:
+        """基准日期零点之后 seconds 秒（可为负数）的时间戳文本"""
+        day, second = divmod(seconds, DAY_SECONDS)
+        text = self.days.get(day)
+        if text is None:
+            text = self.days[day] = (self.base + timedelta(days=day)).strftime("%Y-%m-%d")
+        return f"{text} {self.times[second]}"
+
+    def user_columns(self) -> Dict[str, list]:
+        rng, options = self.rng, self.options
+        history = max(1, options.history_days * DAY_SECONDS)
+        columns = {name: [] for name in USER_COLUMNS}
+        for index in range(1, options.users + 1):
+            username = f"{options.prefix}_{index}"
+            created = -rng.randrange(1, history + 1)
+            columns["username"].append(username)
+            columns["email"].append(f"{username}@example.com")
+            columns["pp_token"].append(f"pp_{rng.getrandbits(64):016x}")
+            columns["hashed_password"].append(FAKE_PASSWORD_HASH)
+            columns["is_active"].append(rng.random() >= 0.02)
+            columns["is_superuser"].append(False)
+            columns["remark"].append(f"合成数据用户 {index}")
+            columns["description"].append(
+                json.dumps(
+                    {
+                        "department": rng.choice(DEPARTMENTS),
+                        "permissions": rng.sample(PERMISSIONS, 2),
+                        "level": rng.randint(1, 5),
+                    },
+                    ensure_ascii=False,
+                )
+            )
+            columns["created_at"].append(self.timestamp(created))
+            columns["updated_at"].append(self.timestamp(created + rng.randrange(DAY_SECONDS)))
+        return columns
+
+    def owner_weights(self, count: int) -> List[float]:
+        """Zipf 累积权重：排名第 k 的用户权重为 1/k^skew"""
+        return list(itertools.accumulate(1 / rank ** self.options.skew for rank in range(1, count + 1)))
+
+    def credential_columns(self, start: int, count: int, owner_ids: List[int], cum_weights) -> Dict[str, list]:
+        """第 start 条起的 count 条凭据"""
+        from models.auth_model import InfoStatusTypeEnum
+
+        options = self.options
+        rand = self.rng.random
+        timestamp = self.timestamp
+        public, private = InfoStatusTypeEnum.PUBLIC.value, InfoStatusTypeEnum.PRIVATE.value
+        history = max(1, options.history_days * DAY_SECONDS)
+        expiry = max(1, options.expiry_days * DAY_SECONDS)
+        scope_pairs, notes, descriptions = self.scope_pairs, self.notes, self.descriptions
+        rate_limits = (100, 1000, 5000)
+        owners = iter(self.rng.choices(owner_ids, cum_weights=cum_weights, k=count))
+
+        info, statuses, user_ids, expires = [], [], [], []
+        configs, descs, created_at, updated_at = [], [], [], []
+        for index in range(start, start + count):
+            is_public = rand() < options.public_ratio
+            created = -1 - int(rand() * history)
+            if rand() < options.expires_ratio:
+                offset = 1 + int(rand() * expiry)
+                expires.append(timestamp(-offset if rand() < options.expired_ratio else offset))
+            else:
+                expires.append(None)
+
+            info.append(f"合成凭据-{index}")
+            statuses.append(public if is_public else private)
+            user_ids.append(None if is_public else next(owners))
+            configs.append(
+                f'{{"api_url":"https://api{index % 50}.example.com",'
+                f'"rate_limit":{rate_limits[int(rand() * 3)]},'
+                f'"scopes":{scope_pairs[int(rand() * len(scope_pairs))]}'
+                f"{notes[int(rand() * len(notes))]}}}"
+            )
+            descs.append(descriptions[index % 20])
+            created_at.append(timestamp(created))
+            updated_at.append(timestamp(created + int(rand() * DAY_SECONDS)))
+        return dict(zip(
+            CREDENTIAL_COLUMNS,
+            (info, statuses, user_ids, expires, configs, descs, created_at, updated_at),
+        ))
+
+
+def python_values(columns: Dict[str, list]) -> Dict[str, list]:
+    """文本形式的 JSON 和时间戳转换为对象（用于 executemany 写入）"""
+    converters = {name: json.loads for name in JSON_COLUMNS}
+    converters.update({name: datetime.fromisoformat for name in TIMESTAMP_COLUMNS})
+    return {
+        name: [None if value is None else converters[name](value) for value in values]
+        if name in converters
+        else values
+        for name, values in columns.items()
+    }
+
+
+def copy_rows(conn, table_name: str, columns: Dict[str, list]) -> None:
+    """以 COPY 文本格式写入（生成的值不含制表符、换行和反斜杠，无需转义；None 写为 \\N）"""
+    text_columns = [
+        values
+        if all(isinstance(value, str) for value in values)
+        else ["\\N" if value is None else str(value) for value in values]
+        for values in columns.values()
+    ]
+    buffer = io.StringIO()
+    buffer.writelines(f"{line}\n" for line in map("\t".join, zip(*text_columns)))
+    buffer.seek(0)
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {table_name} ({', '.join(columns)}) FROM STDIN", buffer)
+    finally:
+        cursor.close()
+
+
+def ensure_partitions(conn, generator: DataGenerator) -> None:
+    """按月分区时补建 created_at 覆盖范围内的分区"""
+    from config import settings
+    from db.partitioning import CREDENTIALS_PARTITIONING, credentials_table_kind, ensure_month_partitions
+
+    if CREDENTIALS_PARTITIONING != "month" or credentials_table_kind(conn) != "p":
+        return
+    start = generator.base - timedelta(days=generator.options.history_days)
+    months = (generator.base.year - start.year) * 12 + generator.base.month - start.month
+    created = ensure_month_partitions(
+        conn, months + settings.credentials_partition_months_ahead, start=start
+    )
+    if created:
+        print(f"已创建月份分区: {', '.join(created)}")
+
+
+def generate(engine, options: GeneratorOptions) -> Dict[str, tuple]:
+    """生成并写入数据，返回 {表名: (行数, 耗时)}，重建索引时另有 indexes: (索引数, 耗时)"""
+    from models.auth_model import AuthCredentials, User, json_preview_values
+
+    generator = DataGenerator(options)
+    use_copy = engine.dialect.name == "postgresql"
+    stats = {}
+
+    with engine.begin() as conn:
+        generated = User.username.startswith(f"{options.prefix}_", autoescape=True)
+        if conn.scalar(select(func.count()).select_from(User).where(generated)):
+            raise SystemExit(f"已存在前缀为 {options.prefix}_ 的用户，请使用其他 --prefix")
+        if use_copy:
+            ensure_partitions(conn, generator)
+
+        start = time.perf_counter()
+        if options.users:
+            columns = generator.user_columns()
+            if use_copy:
+                copy_rows(conn, User.__tablename__, columns)
+            else:
+                columns = python_values(columns)
+                rows = [dict(zip(columns, row)) for row in zip(*columns.values())]
+                conn.execute(insert(User.__table__), [{**row, **json_preview_values(User, row)} for row in rows])
+            owner_ids = list(conn.scalars(select(User.id).where(generated).order_by(User.id)))
+        else:
+            owner_ids = list(conn.scalars(select(User.id).order_by(User.id)))
+        stats["users"] = (options.users, time.perf_counter() - start)
+        if options.credentials and not owner_ids:
+            raise SystemExit("没有可关联的用户，请指定 --users 或先执行 python init_db.py")
+
+        # 大量写入时逐行维护 GIN 等二级索引比写入后一次性重建慢得多（删除索引期间表被锁定）
+        deferred = list(AuthCredentials.__table__.indexes) if use_copy and options.defer_indexes else []
+        for index in deferred:
+            index.drop(conn, checkfirst=True)
+
+        start = time.perf_counter()
+        cum_weights = generator.owner_weights(len(owner_ids)) if owner_ids else None
+        for offset in range(0, options.credentials, options.batch_size):
+            count = min(options.batch_size, options.credentials - offset)
+            columns = generator.credential_columns(offset + 1, count, owner_ids, cum_weights)
+            if use_copy:
+                copy_rows(conn, AuthCredentials.__tablename__, columns)
+            else:
+                for batch in AuthCredentials.insert_batches(python_values(columns), options.batch_size):
+                    # 非 PostgreSQL 数据库的 JSON 预览列随行写入（PostgreSQL 上为生成列）
+                    for row in batch:
+                        row.update(json_preview_values(AuthCredentials, row))
+                    conn.execute(insert(AuthCredentials.__table__), batch)
+            elapsed = time.perf_counter() - start
+            done = offset + count
+            print(f"\r凭据 {done}/{options.credentials}，{done / elapsed:,.0f} 行/秒", end="", flush=True)
+        if options.credentials:
+            print()
+        stats["credentials"] = (options.credentials, time.perf_counter() - start)
+
+        if deferred:
+            start = time.perf_counter()
+            for index in deferred:
+                index.create(conn)
+            stats["indexes"] = (len(deferred), time.perf_counter() - start)
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.exec_driver_sql("ANALYZE")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="合成数据生成器（负载和规模测试）")
+    parser.add_argument("--users", type=int, default=1000, help="生成的用户数（0 时凭据分配给现有用户）")
+    parser.add_argument("--credentials", type=int, default=100000, help="生成的凭据数")
+    parser.add_argument("--public-ratio", type=float, default=0.2, help="公开凭据比例")
+    parser.add_argument("--expires-ratio", type=float, default=0.7, help="有过期时间的凭据比例")
+    parser.add_argument("--expired-ratio", type=float, default=0.1, help="有过期时间的凭据中已过期的比例")
+    parser.add_argument("--expiry-days", type=int, default=365, help="过期时间距基准日期的最大天数")
+    parser.add_argument("--history-days", type=int, default=365, help="创建时间分布的天数")
+    parser.add_argument("--payload-bytes", type=int, default=0, help="config_info 附加的 notes 字段长度")
+    parser.add_argument("--skew", type=float, default=1.0, help="凭据归属的 Zipf 指数，0 为均匀分配")
+    parser.add_argument("--prefix", default="load", help="用户名前缀")
+    parser.add_argument("--seed", type=int, default=42, help="随机数种子")
+    parser.add_argument("--base-date", type=datetime.fromisoformat, help="时间戳基准日期，默认当天（如 2026-01-01）")
+    parser.add_argument("--batch-size", type=int, default=50000, help="每批写入行数")
+    parser.add_argument(
+        "--defer-indexes", action="store_true", help="PostgreSQL 写入凭据前删除二级索引，写入后重建"
+    )
+    args = parser.parse_args()
+
+    from base import get_engine
+
+    options = GeneratorOptions(
+        users=args.users,
+        credentials=args.credentials,
+        public_ratio=args.public_ratio,
+        expires_ratio=args.expires_ratio,
+        expired_ratio=args.expired_ratio,
+        expiry_days=args.expiry_days,
+        history_days=args.history_days,
+        payload_bytes=args.payload_bytes,
+        skew=args.skew,
+        prefix=args.prefix,
+        seed=args.seed,
+        base_date=args.base_date,
+        batch_size=args.batch_size,
+        defer_indexes=args.defer_indexes,
+    )
+    engine = get_engine()
+    stats = generate(engine, options)
+    for name, (rows, elapsed) in stats.items():
+        if name == "indexes":
+            print(f"重建 {rows} 个凭据表索引 {elapsed:.1f}s")
+            continue
+        rate = f"{rows / elapsed:,.0f} 行/秒" if rows and elapsed else "-"
+        print(f"{name:<12} {rows:>10} 行 {elapsed:8.1f}s {rate}")
+    print(f"生成的用户密码为 {FAKE_PASSWORD}")
+
+
+if __name__ == "__main__":
+    main()
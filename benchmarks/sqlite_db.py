@@ -0,0 +1,193 @@
+"""
+SQLite 基准测试数据库
+无需 PostgreSQL 即可运行基准测试：创建 SQLite 数据库文件，写入接近真实规模的用户和凭据数据，
+之后通过环境变量让应用和其他基准测试使用该数据库
+
+运行方式（项目根目录）:
+    python -m benchmarks.sqlite_db --users 1000 --credentials 100000
+    DATABASE_URL=sqlite:////tmp/my_sqladmin_bench.db DATABASE_PROFILE=benchmark \\
+        python -m benchmarks.bench_api_concurrency
+
+同步引擎（SQLAdmin）和异步引擎（API）各自打开连接，内存数据库无法在两者之间共享，因此使用数据库文件
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import bcrypt
+from sqlalchemy import event, insert
+
+DEFAULT_PATH = os.path.join(tempfile.gettempdir(), "my_sqladmin_bench.db")
+
+# 与 init_db.py 相同的示例账户，基准测试默认以 user1 身份请求
+SAMPLE_ACCOUNTS = (
+    ("admin", "admin123456", True),
+    ("user1", "user123456", False),
+    ("user2", "user123456", False),
+)
+
+
+def sqlite_url(path: str) -> str:
+    return f"sqlite:///{os.path.abspath(path)}"
+
+
+def install_sqlite_sleep(engine) -> None:
+    """为 SQLite 连接注册 pg_sleep(seconds)，基准测试的慢查询语句无需区分数据库"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if sync_engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(sync_engine, "connect")
+    def register_sleep(dbapi_connection, connection_record):
+        # aiosqlite 的适配连接需要取出底层 sqlite3 连接注册函数
+        raw = getattr(dbapi_connection, "driver_connection", dbapi_connection)
+        raw = getattr(raw, "_conn", raw)
+        raw.create_function("pg_sleep", 1, lambda seconds: time.sleep(seconds))
+
+
+def make_users(count: int, rng: random.Random) -> list:
+    """生成用户行：示例账户 + 批量普通用户（密码哈希每种密码只计算一次）"""
+    from models.auth_model import User
+
+    hashes = {}
+
+    def hashed(password: str) -> str:
+        if password not in hashes:
+            hashes[password] = bcrypt.hashpw(
+                password.encode("utf-8"), bcrypt.gensalt()
+            ).decode("utf-8")
+        return hashes[password]
+
+    now = datetime.now()
+    rows = []
+    for index in range(count):
+        if index < len(SAMPLE_ACCOUNTS):
+            username, password, is_superuser = SAMPLE_ACCOUNTS[index]
+        else:
+            username, password, is_superuser = f"bench_user_{index}", "user123456", False
+        created_at = now - timedelta(days=rng.randint(30, 720))
+        rows.append(
+            {
+                "id": index + 1,
+                "username": username,
+                "email": f"{username}@example.com",
+                "pp_token": User.generate_pp_token(),
+                "hashed_password": hashed(password),
+                "is_active": rng.random() > 0.02 or index < len(SAMPLE_ACCOUNTS),
+                "is_superuser": is_superuser,
+                "remark": f"基准测试用户 {index + 1}",
+                "description": {
+                    "department": rng.choice(["技术部", "业务部", "测试部", "运维部"]),
+                    "permissions": rng.sample(["read", "write", "delete", "admin"], 2),
+                },
+                "created_at": created_at,
+                "updated_at": created_at + timedelta(days=rng.randint(0, 29)),
+            }
+        )
+    return rows
+
+
+def make_credentials(start: int, count: int, user_count: int, rng: random.Random) -> list:
+    """生成一批凭据行：约 20% 公开，其余为随机用户的私有凭据"""
+    from models.auth_model import InfoStatusTypeEnum
+
+    now = datetime.now()
+    rows = []
+    for i in range(start, start + count):
+        public = rng.random() < 0.2
+        created_at = now - timedelta(minutes=rng.randint(0, 365 * 24 * 60))
+        rows.append(
+            {
+                "id": i,
+                "info": f"凭据-{i}",
+                "info_status": (
+                    InfoStatusTypeEnum.PUBLIC.value
+                    if public
+                    else InfoStatusTypeEnum.PRIVATE.value
+                ),
+                "user_id": None if public else rng.randint(1, user_count),
+                "expires_at": now + timedelta(days=rng.randint(1, 365)) if i % 3 else None,
+                "config_info": {
+                    "api_url": f"https://api{i % 50}.example.com",
+                    "rate_limit": rng.choice([100, 1000, 5000]),
+                    "scopes": rng.sample(["read", "write", "admin", "profile"], 2),
+                },
+                "description": {"purpose": f"基准测试凭据 {i}", "owner_team": f"team-{i % 20}"},
+                "created_at": created_at,
+                "updated_at": created_at + timedelta(minutes=rng.randint(0, 60 * 24)),
+            }
+        )
+    return rows
+
+
+def create_database(
+    path: str, users: int, credentials: int, batch_size: int = 5000, seed: int = 42
+) -> str:
+    """重新创建 SQLite 基准测试数据库并写入数据，返回连接URL"""
+    from base import Base
+    from db.engine_factory import create_sync_engine
+    from models.auth_model import User, AuthCredentials, json_preview_values
+
+    if os.path.exists(path):
+        os.remove(path)
+    url = sqlite_url(path)
+    engine = create_sync_engine(url, profile="benchmark")
+    rng = random.Random(seed)
+
+    with engine.begin() as conn:
+        # WAL 模式下读写互不阻塞，同步和异步引擎可以并发访问
+        conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+    Base.metadata.create_all(engine)
+
+    start = time.perf_counter()
+    user_count = max(users, len(SAMPLE_ACCOUNTS))
+    with engine.begin() as conn:
+        # Core 批量插入不经过ORM，JSON 预览列随行写入
+        conn.execute(
+            insert(User.__table__),
+            [{**row, **json_preview_values(User, row)} for row in make_users(user_count, rng)],
+        )
+        for offset in range(0, credentials, batch_size):
+            rows = make_credentials(
+                offset + 1, min(batch_size, credentials - offset), user_count, rng
+            )
+            conn.execute(
+                insert(AuthCredentials.__table__),
+                [{**row, **json_preview_values(AuthCredentials, row)} for row in rows],
+            )
+        conn.exec_driver_sql("ANALYZE")
+    engine.dispose()
+
+    print(
+        f"已创建 {path}: 用户 {user_count}，凭据 {credentials}，"
+        f"耗时 {time.perf_counter() - start:.1f}s"
+    )
+    return url
+
+
+def main():
+    parser = argparse.ArgumentParser(description="创建 SQLite 基准测试数据库")
+    parser.add_argument("--path", default=DEFAULT_PATH, help="数据库文件路径（已存在时重建）")
+    parser.add_argument("--users", type=int, default=1000, help="用户数")
+    parser.add_argument("--credentials", type=int, default=100000, help="认证凭据数")
+    parser.add_argument("--batch-size", type=int, default=5000, help="每批插入行数")
+    parser.add_argument("--seed", type=int, default=42, help="随机数种子")
+    args = parser.parse_args()
+
+    url = sqlite_url(args.path)
+    # 先设置环境变量再导入 base，模块级引擎使用 SQLite 创建
+    os.environ["DATABASE_URL"] = url
+    os.environ.setdefault("DATABASE_ECHO", "false")
+
+    create_database(args.path, args.users, args.credentials, args.batch_size, args.seed)
+    print("\n使用该数据库运行基准测试或应用:")
+    print(f"    export DATABASE_URL={url} DATABASE_PROFILE=benchmark")
+    print("    python -m benchmarks.bench_api_concurrency")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+"""
+pytest 夹具
+snapshot_database_url：每个测试使用从快照复制的独立数据库（需先执行 python init_db.py snapshot），
+测试结束后删除
+"""
+
+from typing import Iterator
+
+import pytest
+
+from db.snapshots import cloned_database
+
+
+@pytest.fixture
+def snapshot_database_url() -> Iterator[str]:
+    """每个测试使用从快照复制的独立数据库"""
+    with cloned_database() as url:
+        yield url
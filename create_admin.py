@@ -4,6 +4,7 @@
 
 from base import get_db
 from models.auth_model import User
+from services.password_hashing import password_hasher
 
 
 def create_admin_user():
@@ -73,16 +74,19 @@ def create_test_users():
             },
         ]
 
-        for user_data in test_users:
-            existing_user = (
-                db.query(User).filter(User.username == user_data["username"]).first()
-            )
+        new_users = [
+            {**user_data, "password": "password123"}
+            for user_data in test_users
+            if not db.query(User).filter(User.username == user_data["username"]).first()
+        ]
+
+        # 密码哈希在进程池中批量计算
+        if new_users:
+            print(password_hasher.hash_user_passwords(new_users).summary())
 
-            if not existing_user:
-                user = User(**user_data)
-                user.hashed_password = User.hash_password("password123")
-                db.add(user)
-                print(f"✅ 创建测试用户: {user_data['username']}")
+        for user_data in new_users:
+            db.add(User(**user_data))
+            print(f"✅ 创建测试用户: {user_data['username']}")
 
         db.commit()
 
@@ -0,0 +1,69 @@
+"""
+管理界面数据库执行器
+
+SQLAdmin 使用同步会话时（ADMIN_DB_MODE=threadpool，默认），管理界面的查询、增删改和
+认证后端的用户查询都通过这里在工作线程中执行：
+- 并发数由专用的 CapacityLimiter 限制（ADMIN_DB_THREADS），不占用事件循环，
+  也不与其他 to_thread 调用争用 anyio 默认线程池的 40 个名额
+- 排队数、执行中数和排队耗时导出为监控指标，慢页面堆积时可以直接看到
+
+ADMIN_DB_MODE=async 时管理界面改用异步会话（async_engine），数据库操作不再经过线程池
+"""
+
+import time
+from typing import Any, Callable, Optional
+
+import anyio
+import anyio.to_thread
+
+from config import settings
+from instrumentation.metrics import ADMIN_DB_TASKS, ADMIN_DB_WAIT_SECONDS
+
+ADMIN_DB_MODES = ("threadpool", "async")
+
+
+class AdminDBExecutor:
+    """有界线程池执行器（基于 anyio 工作线程 + 专用并发限制）"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._limiter: Optional[anyio.CapacityLimiter] = None
+        ADMIN_DB_TASKS.set_function(self._samples)
+
+    @property
+    def limiter(self) -> anyio.CapacityLimiter:
+        # CapacityLimiter 需要在事件循环中创建
+        if self._limiter is None:
+            self._limiter = anyio.CapacityLimiter(self.size)
+        return self._limiter
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """在工作线程中执行同步函数（复制当前上下文，读写路由和SQL统计照常生效）"""
+        queued_at = time.perf_counter()
+
+        def call():
+            ADMIN_DB_WAIT_SECONDS.observe(time.perf_counter() - queued_at)
+            return func(*args)
+
+        return await anyio.to_thread.run_sync(call, limiter=self.limiter)
+
+    def _samples(self):
+        if self._limiter is None:
+            return [({"state": "size"}, self.size)]
+        statistics = self._limiter.statistics()
+        return [
+            ({"state": "size"}, statistics.total_tokens),
+            ({"state": "active"}, statistics.borrowed_tokens),
+            ({"state": "queued"}, statistics.tasks_waiting),
+        ]
+
+
+def get_admin_db_mode() -> str:
+    mode = settings.admin_db_mode
+    if mode not in ADMIN_DB_MODES:
+        raise ValueError(f"未知的管理界面数据库模式: {mode}，可选: {', '.join(ADMIN_DB_MODES)}")
+    return mode
+
+
+# 全局执行器
+admin_db_executor = AdminDBExecutor(settings.admin_db_threads)
@@ -0,0 +1,249 @@
+"""
+记录数计数表（仅 PostgreSQL）
+record_counts 保存每个权限范围分组的行数，由语句级触发器在写入的同一事务中维护：
+触发器通过转换表（REFERENCING NEW/OLD TABLE）把一条语句影响的行按分组汇总成增量，
+再按固定顺序 upsert 计数行，批量写入每条语句每个分组只更新一次。
+
+- 认证凭据：每个 (info_status, user_id) 一行，未关联用户的 user_id 记为 0
+- 用户：一行总数
+
+计数查询汇总少量计数行代替 count(*)：超级用户汇总全部凭据分组，普通用户汇总公开分组和自己的私有分组。
+触发器由 init_db.py 建表/升级时安装，应用启动时确认触发器存在后才使用计数表（record_counters.enabled），
+否则仍执行 count(*)。TRUNCATE 清空对应计数；分离分区等绕过触发器的修改由调用方调整计数，
+其他偏差由 python init_db.py reconcile-counts 按实际行数校正
+"""
+
+import logging
+from typing import List, Tuple
+
+from sqlalchemy import BigInteger, and_, cast, delete, func, or_, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from config import settings
+from models.auth_model import AuthCredentials, InfoStatusTypeEnum, RecordCount, User
+
+logger = logging.getLogger(__name__)
+
+CREDENTIALS = AuthCredentials.__tablename__
+USERS = User.__tablename__
+
+# 增量 upsert：按主键顺序写入，并发语句以相同顺序锁定计数行，避免死锁
+UPSERT_DELTAS = f"""
+    INSERT INTO {RecordCount.__tablename__} AS counts (table_name, info_status, user_id, count)
+    SELECT TG_TABLE_NAME, info_status, user_id, delta FROM (
+        SELECT info_status, user_id, sum(delta) AS delta FROM (%s) AS changes
+        GROUP BY info_status, user_id
+    ) AS grouped
+    WHERE delta <> 0
+    ORDER BY info_status, user_id
+    ON CONFLICT (table_name, info_status, user_id)
+    DO UPDATE SET count = counts.count + excluded.count
+"""
+
+# 各表的分组列：(info_status 表达式, user_id 表达式)
+GROUP_COLUMNS = {
+    CREDENTIALS: ("info_status", "coalesce(user_id, 0)"),
+    USERS: ("0", "0"),
+}
+
+
+def trigger_function_sql(table_name: str) -> str:
+    status, owner = GROUP_COLUMNS[table_name]
+    inserted = f"SELECT {status} AS info_status, {owner} AS user_id, 1 AS delta FROM new_rows"
+    deleted = f"SELECT {status} AS info_status, {owner} AS user_id, -1 AS delta FROM old_rows"
+    return f"""
+CREATE OR REPLACE FUNCTION record_counts_{table_name}() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        {UPSERT_DELTAS % inserted};
+    ELSIF TG_OP = 'DELETE' THEN
+        {UPSERT_DELTAS % deleted};
+    ELSE
+        {UPSERT_DELTAS % (inserted + " UNION ALL " + deleted)};
+    END IF;
+    RETURN NULL;
+END
+$$"""
+
+
+TRUNCATE_FUNCTION_SQL = f"""
+CREATE OR REPLACE FUNCTION record_counts_truncate() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    DELETE FROM {RecordCount.__tablename__} WHERE table_name = TG_TABLE_NAME;
+    RETURN NULL;
+END
+$$"""
+
+
+def trigger_definitions(table_name: str) -> List[Tuple[str, str]]:
+    """(触发器名, 定义) 列表"""
+    function = f"record_counts_{table_name}()"
+    definitions = [
+        ("insert", f"AFTER INSERT ON {table_name} REFERENCING NEW TABLE AS new_rows "
+                   f"FOR EACH STATEMENT EXECUTE FUNCTION {function}"),
+        ("delete", f"AFTER DELETE ON {table_name} REFERENCING OLD TABLE AS old_rows "
+                   f"FOR EACH STATEMENT EXECUTE FUNCTION {function}"),
+        ("truncate", f"AFTER TRUNCATE ON {table_name} "
+                     f"FOR EACH STATEMENT EXECUTE FUNCTION record_counts_truncate()"),
+    ]
+    if table_name == CREDENTIALS:
+        # 修改 info_status / user_id 会在分组之间移动计数；用户表的更新不改变行数
+        definitions.append(
+            ("update", f"AFTER UPDATE ON {table_name} "
+                       f"REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+                       f"FOR EACH STATEMENT EXECUTE FUNCTION {function}")
+        )
+    return [(f"trg_{table_name}_counts_{op}", definition) for op, definition in definitions]
+
+
+def install_counter_triggers(conn) -> None:
+    """创建（或替换）计数触发器函数和触发器"""
+    conn.exec_driver_sql(TRUNCATE_FUNCTION_SQL)
+    for table_name in GROUP_COLUMNS:
+        conn.exec_driver_sql(trigger_function_sql(table_name))
+        for name, definition in trigger_definitions(table_name):
+            conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {name} ON {table_name}")
+            conn.exec_driver_sql(f"CREATE TRIGGER {name} {definition}")
+
+
+def install_record_counters(engine) -> List[Tuple[str, int, int, int, int]]:
+    """安装计数触发器并按现有数据校正计数（非 PostgreSQL 数据库不安装），返回校正的分组"""
+    if engine.dialect.name != "postgresql":
+        return []
+    with engine.begin() as conn:
+        install_counter_triggers(conn)
+        return reconcile_counts(conn)
+
+
+def actual_counts(conn) -> dict:
+    """按实际数据统计的各分组行数"""
+    owner = func.coalesce(AuthCredentials.user_id, 0)
+    rows = conn.execute(
+        select(AuthCredentials.info_status, owner, func.count()).group_by(
+            AuthCredentials.info_status, owner
+        )
+    )
+    counts = {(CREDENTIALS, status, user_id): count for status, user_id, count in rows}
+    counts[(USERS, 0, 0)] = conn.scalar(select(func.count()).select_from(User))
+    return counts
+
+
+def reconcile_counts(conn) -> List[Tuple[str, int, int, int, int]]:
+    """按实际行数校正计数表，返回有偏差的分组：(表名, info_status, user_id, 原计数, 实际行数)
+
+    统计期间以 SHARE 模式锁定数据表（阻塞写入、不阻塞读取），保证统计结果与计数增量不会交错；
+    需要在事务中调用
+    """
+    conn.exec_driver_sql(f"LOCK TABLE {CREDENTIALS}, {USERS} IN SHARE MODE")
+    actual = {key: count for key, count in actual_counts(conn).items() if count}
+    stored = {
+        (table_name, status, user_id): count
+        for table_name, status, user_id, count in conn.execute(
+            select(
+                RecordCount.table_name,
+                RecordCount.info_status,
+                RecordCount.user_id,
+                RecordCount.count,
+            )
+        )
+    }
+
+    drift = []
+    for key in sorted(actual.keys() | stored.keys()):
+        expected, current = actual.get(key, 0), stored.get(key, 0)
+        if expected != current:
+            drift.append((*key, current, expected))
+
+    # 行数为 0 的分组删除计数行
+    conn.execute(delete(RecordCount).where(RecordCount.count == 0))
+    for table_name, status, user_id, _, expected in drift:
+        key = and_(
+            RecordCount.table_name == table_name,
+            RecordCount.info_status == status,
+            RecordCount.user_id == user_id,
+        )
+        if expected:
+            statement = pg_insert(RecordCount).values(
+                table_name=table_name, info_status=status, user_id=user_id, count=expected
+            )
+            conn.execute(
+                statement.on_conflict_do_update(
+                    index_elements=["table_name", "info_status", "user_id"],
+                    set_={"count": statement.excluded.count},
+                )
+            )
+        else:
+            conn.execute(delete(RecordCount).where(key))
+    return drift
+
+
+def subtract_table_counts(conn, source: str) -> None:
+    """从凭据计数中减去 source 表（如刚分离的分区）的行，用于不经过触发器的删除"""
+    conn.exec_driver_sql(
+        f"INSERT INTO {RecordCount.__tablename__} AS counts (table_name, info_status, user_id, count) "
+        f"SELECT '{CREDENTIALS}', info_status, coalesce(user_id, 0), -count(*) FROM {source} "
+        f"GROUP BY 2, 3 ORDER BY 2, 3 "
+        f"ON CONFLICT (table_name, info_status, user_id) "
+        f"DO UPDATE SET count = counts.count + excluded.count"
+    )
+
+
+def count_statement(table_name: str, *conditions):
+    """汇总计数行的查询（没有匹配的计数行时为 0）"""
+    return select(
+        cast(func.coalesce(func.sum(RecordCount.count), 0), BigInteger)
+    ).where(RecordCount.table_name == table_name, *conditions)
+
+
+def credentials_counter_statement(user):
+    """与 credentials_visibility_clause 相同范围的凭据数"""
+    if user.is_superuser:
+        return count_statement(CREDENTIALS)
+    return count_statement(
+        CREDENTIALS,
+        or_(
+            RecordCount.info_status == InfoStatusTypeEnum.PUBLIC.value,
+            and_(
+                RecordCount.info_status == InfoStatusTypeEnum.PRIVATE.value,
+                RecordCount.user_id == user.id,
+            ),
+        ),
+    )
+
+
+def users_counter_statement():
+    return count_statement(USERS)
+
+
+class RecordCounters:
+    """计数表的启用状态：启动时检查触发器是否已安装"""
+
+    def __init__(self):
+        self.enabled = False
+
+    async def check(self, engine) -> bool:
+        if not settings.record_counters_enabled or engine.dialect.name != "postgresql":
+            return False
+        expected = [
+            name for table_name in GROUP_COLUMNS for name, _ in trigger_definitions(table_name)
+        ]
+        try:
+            async with engine.connect() as conn:
+                installed = set(
+                    await conn.scalars(
+                        text("SELECT tgname FROM pg_trigger WHERE tgname = ANY(:names)"),
+                        {"names": expected},
+                    )
+                )
+        except Exception as e:
+            logger.warning(f"检查计数触发器失败，计数查询使用 count(*): {e}")
+            return False
+        self.enabled = installed == set(expected)
+        if not self.enabled:
+            logger.warning("计数触发器未安装（python init_db.py upgrade），计数查询使用 count(*)")
+        return self.enabled
+
+
+record_counters = RecordCounters()
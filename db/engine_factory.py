@@ -0,0 +1,157 @@
+"""
+数据库引擎工厂
+同步引擎（SQLAdmin、脚本）和异步引擎（FastAPI 路由）统一在这里按 Settings 创建，
+连接池大小、超时、预检、语句超时等参数由命名配置档（dev / prod / benchmark）提供，
+Settings 中显式设置的 DB_* 参数覆盖配置档的值
+"""
+
+from dataclasses import dataclass, replace
+from typing import Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from config import settings, get_async_database_url
+
+
+@dataclass(frozen=True)
+class EngineProfile:
+    """连接池配置档"""
+
+    pool_size: int
+    max_overflow: int
+    pool_timeout: float  # 等待空闲连接的超时（秒）
+    pool_recycle: int  # 连接最长复用时间（秒），-1 不回收
+    pool_pre_ping: bool  # 取出连接前检测是否可用
+    echo: bool
+    statement_timeout_ms: int  # 服务端语句超时，0 不限制
+    statement_cache_size: int  # asyncpg 预编译语句缓存大小
+
+
+PROFILES = {
+    # 开发：小连接池，按 DATABASE_ECHO 输出SQL
+    "dev": EngineProfile(
+        pool_size=5,
+        max_overflow=10,
+        pool_timeout=30,
+        pool_recycle=1800,
+        pool_pre_ping=True,
+        echo=settings.database_echo,
+        statement_timeout_ms=0,
+        statement_cache_size=100,
+    ),
+    # 生产：较大连接池，快速失败，限制慢查询
+    "prod": EngineProfile(
+        pool_size=10,
+        max_overflow=20,
+        pool_timeout=10,
+        pool_recycle=1800,
+        pool_pre_ping=True,
+        echo=False,
+        statement_timeout_ms=30000,
+        statement_cache_size=500,
+    ),
+    # 基准测试：连接池足够容纳所有并发，去掉预检和日志开销
+    "benchmark": EngineProfile(
+        pool_size=50,
+        max_overflow=0,
+        pool_timeout=30,
+        pool_recycle=-1,
+        pool_pre_ping=False,
+        echo=False,
+        statement_timeout_ms=0,
+        statement_cache_size=1000,
+    ),
+}
+
+
+def get_engine_profile(name: Optional[str] = None) -> EngineProfile:
+    """获取配置档，并应用 Settings 中显式设置的覆盖项"""
+    name = name or settings.database_profile
+    if name not in PROFILES:
+        raise ValueError(f"未知的数据库配置档: {name}，可选: {', '.join(PROFILES)}")
+
+    overrides = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "statement_timeout_ms": settings.db_statement_timeout_ms,
+        "statement_cache_size": settings.db_statement_cache_size,
+    }
+    return replace(
+        PROFILES[name], **{key: value for key, value in overrides.items() if value is not None}
+    )
+
+
+def _engine_kwargs(url: str, profile: EngineProfile, is_async: bool) -> dict:
+    """根据方言生成 create_engine 参数"""
+    kwargs = {"echo": profile.echo}
+    backend = make_url(url).get_backend_name()
+
+    if backend == "sqlite":
+        # SQLite 使用 SQLAlchemy 默认的连接池，不支持服务端参数
+        return kwargs
+
+    kwargs.update(
+        pool_size=profile.pool_size,
+        max_overflow=profile.max_overflow,
+        pool_timeout=profile.pool_timeout,
+        pool_recycle=profile.pool_recycle,
+        pool_pre_ping=profile.pool_pre_ping,
+    )
+
+    if backend == "postgresql":
+        if is_async:
+            server_settings = {"application_name": settings.db_application_name}
+            if profile.statement_timeout_ms:
+                server_settings["statement_timeout"] = str(profile.statement_timeout_ms)
+            kwargs["connect_args"] = {
+                "server_settings": server_settings,
+                "prepared_statement_cache_size": profile.statement_cache_size,
+            }
+        else:
+            connect_args = {"application_name": settings.db_application_name}
+            if profile.statement_timeout_ms:
+                connect_args["options"] = f"-c statement_timeout={profile.statement_timeout_ms}"
+            kwargs["connect_args"] = connect_args
+
+    return kwargs
+
+
+def _enable_sqlite_foreign_keys(engine: Engine) -> None:
+    """SQLite 默认不检查外键，每个连接建立时开启，与 PostgreSQL 的约束行为保持一致"""
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragma(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+def create_sync_engine(
+    url: Optional[str] = None, profile: Optional[str] = None, **overrides
+) -> Engine:
+    """创建同步引擎（psycopg2 / sqlite），overrides 直接传给 create_engine"""
+    url = url or settings.database_url
+    kwargs = _engine_kwargs(url, get_engine_profile(profile), is_async=False)
+    kwargs.update(overrides)
+    engine = create_engine(url, **kwargs)
+    _enable_sqlite_foreign_keys(engine)
+    return engine
+
+
+def create_async_db_engine(
+    url: Optional[str] = None, profile: Optional[str] = None, **overrides
+) -> AsyncEngine:
+    """创建异步引擎（asyncpg / aiosqlite），overrides 直接传给 create_async_engine"""
+    url = url or get_async_database_url()
+    kwargs = _engine_kwargs(url, get_engine_profile(profile), is_async=True)
+    kwargs.update(overrides)
+    engine = create_async_engine(url, **kwargs)
+    _enable_sqlite_foreign_keys(engine.sync_engine)
+    return engine
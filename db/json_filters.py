@@ -0,0 +1,176 @@
+"""
+JSON 字段过滤
+管理界面列表过滤和凭据列表 API 共用，路径只允许标识符，全部值以绑定参数传入：
+
+- 包含（@>）：config_info@>{"provider": "aws"}，也可带路径 config_info.auth@>{"type": "oauth"}
+- 存在键（?）：config_info?provider，嵌套路径 config_info.auth?token
+- 路径等于（->>）：config_info.provider=aws，按文本比较，与 ->> / #>> 的结果一致
+
+PostgreSQL 上包含和路径等于可以使用 jsonb_path_ops GIN 索引（路径等于额外生成等价的包含条件供索引使用）；
+jsonb_path_ops 不支持存在键运算符，该条件在其他条件缩小的结果上过滤。
+其他数据库（SQLite）使用 json_extract / json_type 实现相同语义，包含条件不支持数组
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import String, and_, cast, func, or_, true, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.engine import make_url
+
+from base import DATABASE_URL
+
+# 管理界面过滤操作（值, 显示名称）
+JSON_FILTER_OPERATIONS = [
+    ("contains", "包含 (@>)"),
+    ("has_key", "存在键 (?)"),
+    ("path_equals", "路径等于 (->>)"),
+]
+
+# 查询字符串表达式的运算符
+EXPRESSION = re.compile(r"^([A-Za-z_][A-Za-z0-9_.-]*)(@>|\?|=)(.*)$", re.DOTALL)
+EXPRESSION_OPERATIONS = {"@>": "contains", "?": "has_key", "=": "path_equals"}
+
+# 路径段必须是标识符（不支持数组下标，保证包含条件与路径比较语义一致）
+PATH_SEGMENT = re.compile(r"^[A-Za-z_][A-Za-z0-9_-]{0,63}$")
+MAX_PATH_DEPTH = 5
+MAX_ARGUMENT_LENGTH = 2048
+MAX_FILTERS = 5
+
+JSONB_SUPPORTED = make_url(DATABASE_URL).get_backend_name() == "postgresql"
+
+
+class JSONFilterError(ValueError):
+    """过滤表达式不合法"""
+
+
+def _reject_constant(name: str):
+    raise ValueError(f"不支持的数值: {name}")
+
+
+def parse_path(text: str) -> List[str]:
+    path = text.split(".")
+    if len(path) > MAX_PATH_DEPTH or not all(PATH_SEGMENT.match(key) for key in path):
+        raise JSONFilterError(f"JSON 路径不合法: {text!r}")
+    return path
+
+
+def parse_json(text: str) -> Any:
+    """解析包含条件的 JSON 值（拒绝 NaN/Infinity）"""
+    try:
+        return json.loads(text, parse_constant=_reject_constant)
+    except (ValueError, RecursionError):
+        raise JSONFilterError(f"包含条件不是合法的 JSON: {text!r}")
+
+
+def nest(path: Sequence[str], value: Any) -> Any:
+    """按路径包装为嵌套对象：(a, b), 1 -> {"a": {"b": 1}}"""
+    for key in reversed(path):
+        value = {key: value}
+    return value
+
+
+def sqlite_path(path: Sequence[str]) -> str:
+    return "$" + "".join(f'."{key}"' for key in path)
+
+
+def contains_clause(column, path: Sequence[str], value: Any):
+    if JSONB_SUPPORTED:
+        return type_coerce(column, JSONB).contains(nest(path, value))
+
+    # 非 PostgreSQL：对象逐个叶子值比较
+    if isinstance(value, list):
+        raise JSONFilterError("当前数据库的包含过滤不支持数组")
+    if isinstance(value, dict) and value:
+        return and_(
+            *(contains_clause(column, [*path, key], item) for key, item in value.items())
+        )
+    if isinstance(value, dict):
+        return func.json_type(column, sqlite_path(path)) == "object" if path else true()
+    if value is None:
+        return func.json_type(column, sqlite_path(path)) == "null"
+    return func.json_extract(column, sqlite_path(path)) == value
+
+
+def has_key_clause(column, path: Sequence[str]):
+    if JSONB_SUPPORTED:
+        document = type_coerce(column, JSONB)
+        *parent, key = path
+        if parent:
+            document = document[tuple(parent)]
+        return document.has_key(key)
+    return func.json_type(column, sqlite_path(path)).is_not(None)
+
+
+def path_equals_clause(column, path: Sequence[str], value: str):
+    if not JSONB_SUPPORTED:
+        return cast(func.json_extract(column, sqlite_path(path)), String) == value
+
+    document = type_coerce(column, JSONB)
+    text = (document[path[0]] if len(path) == 1 else document[tuple(path)]).astext
+
+    # ->> 等于 value 时，该路径的 JSON 值只能是字符串 value 或与 value 文本相同的数字/布尔值等，
+    # 把这些候选值写成包含条件，GIN 索引先缩小范围，再由 ->> 条件保证精确的文本语义
+    candidates = [value]
+    try:
+        parsed = json.loads(value, parse_constant=_reject_constant)
+    except (ValueError, RecursionError):
+        pass
+    else:
+        if parsed is not None and not isinstance(parsed, str):
+            candidates.append(parsed)
+    return and_(
+        or_(*(document.contains(nest(path, candidate)) for candidate in candidates)),
+        text == value,
+    )
+
+
+def json_filter_clause(column, operation: str, argument: str):
+    """管理界面过滤条件：argument 为包含的 JSON、存在的键路径或 “路径=值”"""
+    argument = argument.strip()
+    if len(argument) > MAX_ARGUMENT_LENGTH:
+        raise JSONFilterError("过滤条件过长")
+
+    if operation == "contains":
+        return contains_clause(column, [], parse_json(argument))
+    if operation == "has_key":
+        return has_key_clause(column, parse_path(argument))
+    if operation == "path_equals":
+        path, separator, value = argument.partition("=")
+        if not separator:
+            raise JSONFilterError("路径等于的格式为 路径=值")
+        return path_equals_clause(column, parse_path(path.strip()), value.strip())
+    raise JSONFilterError(f"不支持的过滤操作: {operation}")
+
+
+def parse_json_filters(expressions: Sequence[str], fields: Dict[str, Any]) -> list:
+    """解析查询字符串中的过滤表达式，返回 WHERE 条件列表（字段名不在 fields 中时拒绝）"""
+    if len(expressions) > MAX_FILTERS:
+        raise JSONFilterError(f"最多支持 {MAX_FILTERS} 个 JSON 过滤条件")
+
+    clauses = []
+    for expression in expressions:
+        match = EXPRESSION.match(expression)
+        if not match or len(expression) > MAX_ARGUMENT_LENGTH:
+            raise JSONFilterError(f"过滤表达式不合法: {expression!r}")
+        target, operator, argument = match.groups()
+        field, _, path_text = target.partition(".")
+        column = fields.get(field)
+        if column is None:
+            raise JSONFilterError(f"字段不支持 JSON 过滤: {field}")
+        path = parse_path(path_text) if path_text else []
+
+        operation = EXPRESSION_OPERATIONS[operator]
+        if operation == "contains":
+            clauses.append(contains_clause(column, path, parse_json(argument)))
+        elif operation == "has_key":
+            key_path = path + parse_path(argument)
+            if len(key_path) > MAX_PATH_DEPTH:
+                raise JSONFilterError(f"JSON 路径不合法: {expression!r}")
+            clauses.append(has_key_clause(column, key_path))
+        else:
+            if not path:
+                raise JSONFilterError("路径等于需要指定路径，如 config_info.provider=aws")
+            clauses.append(path_equals_clause(column, path, argument))
+    return clauses
@@ -0,0 +1,37 @@
+"""
+JSON 预览列
+用户补充信息、凭据配置信息和补充信息各有三个预览列（<字段>_key_count、<字段>_keys、<字段>_preview），
+保存键数/元素数、前几个顶层键和文本开头，管理界面列表只读取预览列，不加载完整的 JSON 文档：
+
+- PostgreSQL：预览列为生成列（GENERATED ALWAYS AS ... STORED），由数据库在写入时计算
+- 其他数据库（SQLite）：预览列为普通列，ORM写入前由 models.auth_model.fill_json_previews 计算，
+  不经过ORM的批量插入用 json_preview_values 补充，已有数据由 backfill_json_previews 补算
+"""
+
+from sqlalchemy import bindparam, select, update
+
+from models.auth_model import json_preview_values
+
+
+def backfill_json_previews(conn, model, batch_size: int = 1000) -> int:
+    """按现有数据重新计算 model 的预览列（非 PostgreSQL 数据库），返回处理的行数"""
+    table = model.__table__
+    fields = [table.c[name] for name in model.json_preview_fields]
+    # SET 子句按参数中的预览列名生成
+    statement = update(table).where(table.c.id == bindparam("_id"))
+
+    total, last_id = 0, 0
+    while True:
+        rows = conn.execute(
+            select(table.c.id, *fields)
+            .where(table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(batch_size)
+        ).mappings().all()
+        if not rows:
+            return total
+        conn.execute(
+            statement, [{"_id": row["id"], **json_preview_values(model, row)} for row in rows]
+        )
+        total += len(rows)
+        last_id = rows[-1]["id"]
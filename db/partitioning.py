@@ -0,0 +1,239 @@
+"""
+认证凭据表分区（仅 PostgreSQL，可选）
+CREDENTIALS_PARTITIONING 选择 auth_credentials 的建表方式，由 init_db.py 创建表时使用：
+
+- none：普通表（默认）
+- user：按 info_status 列表分区，公开凭据单独一个分区，私有凭据再按 user_id 哈希分区；
+  普通用户的列表查询（公开，或私有且属于自己）只扫描公开分区和一个哈希分区
+- month：按 created_at 每月一个范围分区，清理旧数据时分离（DETACH）整个分区，
+  不产生逐行 DELETE、死元组和索引膨胀
+
+分区表的主键必须包含全部分区键：user 方式的 user_id 可以为空，不能建主键，
+id 由序列生成并保留普通索引；month 方式的主键为 (id, created_at)。
+已存在的普通表不会被自动转换，需要重新初始化或自行迁移数据
+"""
+
+import re
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import column, delete, insert, literal, select, table, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.schema import AddConstraint, CreateColumn, CreateIndex, SetColumnComment
+
+from base import Base, DATABASE_URL
+from config import settings
+from db.counters import subtract_table_counts
+from models.auth_model import (
+    AuthCredentials,
+    DeletedRecord,
+    InfoStatusTypeEnum,
+    PartitionDetachment,
+    local_now,
+)
+
+PARTITIONING_LAYOUTS = ("none", "user", "month")
+
+PUBLIC_PARTITION = "auth_credentials_public"
+PRIVATE_PARTITION = "auth_credentials_private"
+OTHER_PARTITION = "auth_credentials_other"
+
+# 范围分区边界：FOR VALUES FROM ('2026-01-01 00:00:00') TO ('2026-02-01 00:00:00')
+RANGE_UPPER_BOUND = re.compile(r"TO \('([^']+)'\)")
+
+
+def partitioning_layout(backend: str) -> str:
+    """配置的分区方式，非 PostgreSQL 数据库始终为 none"""
+    layout = settings.credentials_partitioning.lower()
+    if layout not in PARTITIONING_LAYOUTS:
+        raise ValueError(
+            f"CREDENTIALS_PARTITIONING 不支持 {layout!r}，可选值: {', '.join(PARTITIONING_LAYOUTS)}"
+        )
+    return layout if backend == "postgresql" else "none"
+
+
+CREDENTIALS_PARTITIONING = partitioning_layout(make_url(DATABASE_URL).get_backend_name())
+
+
+def month_start(moment: datetime, offset: int = 0) -> datetime:
+    """moment 所在月份（向后偏移 offset 个月）的第一天零点"""
+    months = moment.year * 12 + moment.month - 1 + offset
+    return datetime(months // 12, months % 12 + 1, 1)
+
+
+def month_partition_name(start: datetime) -> str:
+    return f"auth_credentials_y{start.year}m{start.month:02d}"
+
+
+def credentials_table_kind(conn) -> Optional[str]:
+    """auth_credentials 的类型：p 为分区表，r 为普通表，不存在时为 None"""
+    return conn.scalar(
+        text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:name)"),
+        {"name": AuthCredentials.__tablename__},
+    )
+
+
+def create_partitioned_credentials(conn, layout: str) -> None:
+    """按分区方式创建 auth_credentials 及其分区、外键、索引和注释"""
+    credentials = AuthCredentials.__table__
+    preparer = conn.dialect.identifier_preparer
+    name = preparer.format_table(credentials)
+
+    definitions = [
+        str(CreateColumn(col).compile(dialect=conn.dialect)) for col in credentials.columns
+    ]
+    if layout == "month":
+        definitions.append("PRIMARY KEY (id, created_at)")
+        partition_by = "RANGE (created_at)"
+    else:
+        partition_by = "LIST (info_status)"
+    conn.exec_driver_sql(
+        f"CREATE TABLE {name} (\n\t" + ",\n\t".join(definitions) + f"\n) PARTITION BY {partition_by}"
+    )
+
+    if layout == "user":
+        # 公开凭据不关联用户（与构造函数和创建接口的归属规则一致），
+        # 约束保证列表查询在公开条件上附加的 user_id IS NULL 不改变结果
+        conn.exec_driver_sql(
+            f"CREATE TABLE {PUBLIC_PARTITION} PARTITION OF {name} "
+            f"(CONSTRAINT ck_{PUBLIC_PARTITION}_user_id CHECK (user_id IS NULL)) "
+            f"FOR VALUES IN ({InfoStatusTypeEnum.PUBLIC.value})"
+        )
+        conn.exec_driver_sql(
+            f"CREATE TABLE {PRIVATE_PARTITION} PARTITION OF {name} "
+            f"FOR VALUES IN ({InfoStatusTypeEnum.PRIVATE.value}) PARTITION BY HASH (user_id)"
+        )
+        modulus = settings.credentials_hash_partitions
+        for remainder in range(modulus):
+            conn.exec_driver_sql(
+                f"CREATE TABLE {PRIVATE_PARTITION}_p{remainder:02d} PARTITION OF {PRIVATE_PARTITION} "
+                f"FOR VALUES WITH (MODULUS {modulus}, REMAINDER {remainder})"
+            )
+        # 其他 info_status 取值
+        conn.exec_driver_sql(f"CREATE TABLE {OTHER_PARTITION} PARTITION OF {name} DEFAULT")
+
+    # 分区表上的外键和索引会自动应用到全部分区
+    for constraint in credentials.foreign_key_constraints:
+        conn.execute(AddConstraint(constraint))
+    for index in credentials.indexes:
+        conn.execute(CreateIndex(index))
+    for col in credentials.columns:
+        if col.comment:
+            conn.execute(SetColumnComment(col))
+
+
+def ensure_month_partitions(conn, months_ahead: int, start: Optional[datetime] = None) -> List[str]:
+    """创建从 start（默认数据库当前时间）所在月份起、之后 months_ahead 个月的分区，返回新建的分区名"""
+    if start is None:
+        start = conn.scalar(select(local_now()))
+    existing = {name for name, _, _ in credential_partitions(conn)}
+    created = []
+    for offset in range(months_ahead + 1):
+        lower, upper = month_start(start, offset), month_start(start, offset + 1)
+        name = month_partition_name(lower)
+        if name in existing:
+            continue
+        conn.exec_driver_sql(
+            f"CREATE TABLE {name} PARTITION OF {AuthCredentials.__tablename__} "
+            f"FOR VALUES FROM ('{lower.isoformat(' ')}') TO ('{upper.isoformat(' ')}')"
+        )
+        created.append(name)
+    return created
+
+
+def credential_partitions(conn) -> List[Tuple[str, str, bool]]:
+    """auth_credentials 的直接分区：(分区名, 分区边界, 是否处于未完成的并发分离状态)"""
+    rows = conn.execute(
+        text(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid), i.inhdetachpending "
+            "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:name) ORDER BY c.relname"
+        ),
+        {"name": AuthCredentials.__tablename__},
+    )
+    return [tuple(row) for row in rows]
+
+
+def create_tables(engine) -> None:
+    """创建缺少的表，auth_credentials 按配置的分区方式创建（已存在的表不受影响）"""
+    layout = partitioning_layout(engine.dialect.name)
+    if layout == "none":
+        Base.metadata.create_all(engine)
+        return
+
+    credentials = AuthCredentials.__table__
+    Base.metadata.create_all(
+        engine, tables=[t for t in Base.metadata.sorted_tables if t is not credentials]
+    )
+    with engine.begin() as conn:
+        kind = credentials_table_kind(conn)
+        if kind is None:
+            create_partitioned_credentials(conn, layout)
+        elif kind != "p":
+            print(f"auth_credentials 已是普通表，未转换为分区表（CREDENTIALS_PARTITIONING={layout}）")
+            return
+        if layout == "month":
+            created = ensure_month_partitions(conn, settings.credentials_partition_months_ahead)
+            if created:
+                print(f"已创建月份分区: {', '.join(created)}")
+
+
+def detach_month_partitions(engine, keep_months: int, drop: bool = False) -> List[str]:
+    """分离 keep_months 个月（含当前月）之前的月份分区，返回分离的分区名
+
+    使用 DETACH PARTITION ... CONCURRENTLY，不阻塞对其他分区的读写；上次中断的并发分离会先完成（FINALIZE）。
+    分离的凭据写入删除记录（增量同步客户端会收到删除）并从计数表中减去；drop 为 False 时分离的表保留用于归档
+
+    分离前先在 partition_detachments 中登记分区，删除记录、扣减计数和删除登记在同一事务中完成，
+    任何一步中断后重新执行都会继续处理登记的分区，不会遗漏或重复
+    """
+    if keep_months < 1:
+        raise ValueError("至少保留 1 个月的分区")
+
+    credentials = AuthCredentials.__tablename__
+    detachments = PartitionDetachment.__table__
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if credentials_table_kind(conn) != "p":
+            raise ValueError("auth_credentials 不是分区表")
+        # 升级前创建的数据库可能还没有登记表
+        detachments.create(conn, checkfirst=True)
+        cutoff = month_start(conn.scalar(select(local_now())), 1 - keep_months)
+        registered = set(conn.scalars(select(PartitionDetachment.partition_name)))
+
+        expired = []
+        for name, bound, pending in credential_partitions(conn):
+            match = RANGE_UPPER_BOUND.search(bound)
+            if not match:
+                raise ValueError(f"分区 {name} 不是按 created_at 的范围分区（{bound}）")
+            if pending or name in registered or datetime.fromisoformat(match.group(1)) <= cutoff:
+                expired.append((name, pending))
+
+        for name, pending in expired:
+            if name not in registered:
+                conn.execute(insert(detachments).values(partition_name=name))
+                registered.add(name)
+            mode = "FINALIZE" if pending else "CONCURRENTLY"
+            conn.exec_driver_sql(f"ALTER TABLE {credentials} DETACH PARTITION {name} {mode}")
+
+    # 登记的分区此时都已分离，包括上次分离后未处理完的分区
+    detached = sorted(registered)
+    for name in detached:
+        partition = table(name, column("id"), column("info_status"), column("user_id"))
+        with engine.begin() as conn:
+            conn.execute(
+                insert(DeletedRecord).from_select(
+                    ["table_name", "record_id", "info_status", "user_id"],
+                    select(
+                        literal(credentials),
+                        partition.c.id,
+                        partition.c.info_status,
+                        partition.c.user_id,
+                    ),
+                )
+            )
+            # 分离不经过删除触发器，从计数表中减去分区的行
+            subtract_table_counts(conn, name)
+            if drop:
+                conn.exec_driver_sql(f"DROP TABLE {name}")
+            conn.execute(delete(detachments).where(detachments.c.partition_name == name))
+    return detached
@@ -0,0 +1,95 @@
+"""
+连接池预热
+
+每个 worker 在应用 lifespan 启动阶段（开始接收请求之前）：
+- 建立连接池常驻连接，首批请求不再承担建连、认证和 TLS 握手耗时
+- 在每个连接上通过会话执行一遍热点查询（参数取不存在的值，不返回数据），
+  填充 SQLAlchemy 编译缓存和 asyncpg 的预编译语句缓存
+
+预热失败只记录日志，不阻止启动（就绪检查 /health 会反映数据库状态）
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import AsyncExitStack, ExitStack
+from typing import Any, Iterable, Optional, Sequence, Tuple
+
+import anyio.to_thread
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# (语句, 参数)
+WarmupStatement = Tuple[Any, Optional[dict]]
+
+
+def pool_capacity(engine, limit: Optional[int] = None) -> int:
+    """预热的连接数：连接池常驻连接数（不含溢出连接），可用 limit 进一步限制"""
+    size = getattr(engine.pool, "size", None)
+    capacity = size() if callable(size) else 1
+    return max(1, min(capacity, limit) if limit else capacity)
+
+
+async def prewarm_async_engine(
+    engine: AsyncEngine, statements: Sequence[WarmupStatement], connections: int
+) -> None:
+    """同时持有 connections 个连接（保证建立的是不同连接），在每个连接上执行热点查询"""
+
+    async def warm(conn) -> None:
+        async with AsyncSession(bind=conn) as session:
+            for statement, params in statements:
+                await session.execute(statement, params)
+
+    async with AsyncExitStack() as stack:
+        conns = [
+            await stack.enter_async_context(engine.connect()) for _ in range(connections)
+        ]
+        await asyncio.gather(*(warm(conn) for conn in conns))
+
+
+def prewarm_sync_engine(
+    engine: Engine, statements: Sequence[WarmupStatement], connections: int
+) -> None:
+    with ExitStack() as stack:
+        conns = [stack.enter_context(engine.connect()) for _ in range(connections)]
+        for conn in conns:
+            with Session(bind=conn) as session:
+                for statement, params in statements:
+                    session.execute(statement, params)
+
+
+async def prewarm(
+    async_engines: Iterable[Tuple[str, AsyncEngine]],
+    sync_engines: Iterable[Tuple[str, Engine]],
+    statements: Sequence[WarmupStatement],
+    sync_connections: Optional[int] = None,
+) -> None:
+    """预热全部引擎（同步引擎在线程中执行，不阻塞事件循环）"""
+    start = time.perf_counter()
+    jobs = []
+    for name, engine in async_engines:
+        jobs.append(
+            (name, prewarm_async_engine(engine, statements, pool_capacity(engine.sync_engine)))
+        )
+    for name, engine in sync_engines:
+        jobs.append(
+            (
+                name,
+                anyio.to_thread.run_sync(
+                    prewarm_sync_engine,
+                    engine,
+                    statements,
+                    pool_capacity(engine, sync_connections),
+                ),
+            )
+        )
+
+    results = await asyncio.gather(*(job for _, job in jobs), return_exceptions=True)
+    for (name, _), result in zip(jobs, results):
+        if isinstance(result, BaseException):
+            logger.warning(f"数据库连接池预热失败 ({name}): {result}")
+
+    logger.info(f"数据库连接池预热完成，耗时 {(time.perf_counter() - start) * 1000:.0f}ms")
@@ -0,0 +1,217 @@
+"""
+只读副本路由
+
+配置 DATABASE_REPLICA_URLS 后：
+- 管理界面和 /api 的 GET/HEAD 请求中的查询发送到只读副本（轮询，跳过不健康的副本）
+- 写操作（flush、INSERT/UPDATE/DELETE）和其他请求始终发送到主库
+- 用户自己修改数据后的 READ_YOUR_WRITES_SECONDS 秒内，该用户的读请求也发送到主库，
+  保存后立即看到最新数据（写入时间记录在会话 cookie 中，多 worker 之间也有效）
+- 后台定期检查副本可用性和复制延迟，不可用或延迟过大的副本暂时不参与路由
+
+未配置副本时不启用路由，会话直接绑定主库
+"""
+
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from sqlalchemy import Delete, Insert, Update, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config import settings, get_async_url
+from db.engine_factory import create_async_db_engine, create_sync_engine
+
+logger = logging.getLogger(__name__)
+
+PRIMARY = "primary"
+REPLICA = "replica"
+
+# 当前请求的读路由目标，默认主库（脚本、后台任务等不经过中间件的场景）
+current_read_target: ContextVar[str] = ContextVar("current_read_target", default=PRIMARY)
+
+# 会话中记录最近一次写请求时间的键
+LAST_WRITE_SESSION_KEY = "last_write_at"
+
+SAFE_METHODS = ("GET", "HEAD")
+
+# 始终读主库的路径：增量同步按水位线推进游标，副本延迟会导致永久漏掉变更
+PRIMARY_ONLY_PREFIXES = ("/api/sync/",)
+
+# 复制延迟查询：主库（未处于恢复模式）返回 0
+REPLICATION_LAG_SQL = text(
+    "SELECT CASE WHEN pg_is_in_recovery() "
+    "THEN COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "ELSE 0 END"
+)
+
+
+@dataclass
+class Replica:
+    """单个只读副本（同一数据库的同步和异步引擎）"""
+
+    name: str
+    sync_engine: Engine
+    async_engine: AsyncEngine
+    healthy: bool = True
+    lag_seconds: float = 0.0
+    last_error: Optional[str] = None
+
+
+@dataclass
+class ReplicaSet:
+    """只读副本集合：轮询选择健康的副本"""
+
+    replicas: List[Replica] = field(default_factory=list)
+
+    def __post_init__(self):
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    def choose(self) -> Optional[Replica]:
+        """轮询选择一个健康副本，全部不可用时返回 None（回退到主库）"""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        with self._lock:
+            index = next(self._counter)
+        return healthy[index % len(healthy)]
+
+    async def check(self) -> None:
+        """检查所有副本的可用性和复制延迟"""
+        for replica in self.replicas:
+            try:
+                async with replica.async_engine.connect() as conn:
+                    lag = await asyncio.wait_for(
+                        conn.scalar(REPLICATION_LAG_SQL),
+                        timeout=settings.health_check_timeout,
+                    )
+                replica.lag_seconds = float(lag or 0)
+                healthy = replica.lag_seconds <= settings.replica_max_lag_seconds
+                replica.last_error = None if healthy else f"复制延迟 {lag:.1f}s"
+            except Exception as e:
+                healthy = False
+                replica.last_error = str(e) or e.__class__.__name__
+
+            if healthy != replica.healthy:
+                if healthy:
+                    logger.info(f"只读副本 {replica.name} 已恢复")
+                else:
+                    logger.warning(f"只读副本 {replica.name} 不可用: {replica.last_error}")
+            replica.healthy = healthy
+
+    async def run_health_checks(self) -> None:
+        """后台健康检查循环（应用生命周期内运行）"""
+        while True:
+            await self.check()
+            await asyncio.sleep(settings.replica_health_check_interval)
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            replica.sync_engine.dispose()
+            await replica.async_engine.dispose()
+
+
+def create_replica_set(urls: List[str]) -> ReplicaSet:
+    """按副本URL创建引擎（与主库使用相同的连接池配置档）"""
+    replicas = [
+        Replica(
+            name=f"replica{index}",
+            sync_engine=create_sync_engine(url),
+            async_engine=create_async_db_engine(get_async_url(url)),
+        )
+        for index, url in enumerate(urls)
+    ]
+    return ReplicaSet(replicas)
+
+
+class RoutingSession(Session):
+    """读写分离会话：写操作和非只读请求使用主库，只读请求的查询轮询副本
+
+    子类需设置 primary（同步引擎）、replicas 和 use_async_engines；
+    AsyncSession 通过 sync_session_class 使用，返回异步引擎对应的 sync_engine
+    """
+
+    primary: Engine = None
+    replicas: ReplicaSet = None
+    use_async_engines: bool = False
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if (
+            not self._flushing
+            and not isinstance(clause, (Insert, Update, Delete))
+            and current_read_target.get() == REPLICA
+        ):
+            replica = self.replicas.choose()
+            if replica is not None:
+                if self.use_async_engines:
+                    return replica.async_engine.sync_engine
+                return replica.sync_engine
+        return self.primary
+
+
+def make_routing_session_class(
+    name: str, primary: Engine, replicas: ReplicaSet, use_async_engines: bool = False
+) -> type:
+    return type(
+        name,
+        (RoutingSession,),
+        {"primary": primary, "replicas": replicas, "use_async_engines": use_async_engines},
+    )
+
+
+class ReadRoutingMiddleware:
+    """按请求决定读路由目标，并记录写请求时间（需在 SessionMiddleware 内层）"""
+
+    def __init__(self, app: ASGIApp, prefixes=None) -> None:
+        self.app = app
+        self.prefixes = tuple(prefixes or (settings.admin_base_url, "/api/"))
+
+    def read_target(self, scope: Scope) -> str:
+        path = scope["path"]
+        if (
+            scope["method"] not in SAFE_METHODS
+            or not path.startswith(self.prefixes)
+            or path.startswith(PRIMARY_ONLY_PREFIXES)
+        ):
+            return PRIMARY
+        session = scope.get("session") or {}
+        last_write_at = session.get(LAST_WRITE_SESSION_KEY)
+        if last_write_at and time.time() - last_write_at < settings.read_your_writes_seconds:
+            # 读己之写：刚修改过数据的用户继续读主库
+            return PRIMARY
+        return REPLICA
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = current_read_target.set(self.read_target(scope))
+        is_write = scope["method"] not in SAFE_METHODS and "session" in scope
+
+        async def send_wrapper(message: Message) -> None:
+            # 在 SessionMiddleware 写出 cookie 之前记录写请求时间
+            if (
+                is_write
+                and message["type"] == "http.response.start"
+                and message["status"] < 400
+                and scope["session"]
+            ):
+                scope["session"][LAST_WRITE_SESSION_KEY] = time.time()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_read_target.reset(token)
@@ -0,0 +1,146 @@
+"""
+测试数据库快照
+测试和基准测试每次重置数据时不再执行 drop_all / create_all 并通过 ORM 重新写入示例数据（含密码哈希），
+而是先构建一次快照（表结构 + 示例数据，可附加合成数据），之后按快照复制数据库：
+
+- PostgreSQL：快照为模板数据库（默认 <数据库名>_template），复制使用 CREATE DATABASE ... TEMPLATE，
+  按文件复制，与数据量无关的固定开销远小于重新建表和写入
+- SQLite：快照为数据库文件的副本（默认 <文件名>.template），复制即复制文件
+
+恢复会强制断开目标数据库的现有连接（PostgreSQL 13+ 的 DROP DATABASE ... WITH (FORCE)），
+进程内已创建的引擎应在恢复后 dispose()。测试中可使用 cloned_database() 或 pytest 夹具
+snapshot_database_url（见项目根目录的 conftest.py）为每个测试复制独立的数据库
+"""
+
+import os
+import shutil
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.pool import NullPool
+
+from config import settings
+
+
+def template_url(url: str) -> URL:
+    """快照（模板数据库或文件）的连接URL"""
+    source = make_url(url)
+    if source.get_backend_name() == "sqlite":
+        if not source.database or source.database == ":memory:":
+            raise ValueError("内存 SQLite 数据库不支持快照")
+        return source.set(database=settings.db_snapshot_template or f"{source.database}.template")
+    return source.set(database=settings.db_snapshot_template or f"{source.database}_template")
+
+
+@contextmanager
+def maintenance_connection(url: URL):
+    """连接同一服务器的 postgres 库执行 CREATE / DROP DATABASE（不能在事务中执行）"""
+    engine = create_engine(
+        url.set(database="postgres"), poolclass=NullPool, isolation_level="AUTOCOMMIT"
+    )
+    try:
+        with engine.connect() as conn:
+            yield conn
+    finally:
+        engine.dispose()
+
+
+def quote(conn, name: str) -> str:
+    return conn.dialect.identifier_preparer.quote(name)
+
+
+def remove_sqlite_files(path: str) -> None:
+    """删除 SQLite 数据库文件及 WAL 模式的附属文件"""
+    for suffix in ("", "-wal", "-shm", "-journal"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def drop_database(url) -> None:
+    """删除数据库（不存在时忽略）"""
+    target = make_url(url)
+    if target.get_backend_name() == "sqlite":
+        remove_sqlite_files(target.database)
+        return
+    with maintenance_connection(target) as conn:
+        name = quote(conn, target.database)
+        # 模板数据库不能直接删除
+        exists = conn.exec_driver_sql(
+            "SELECT 1 FROM pg_database WHERE datname = %(name)s", {"name": target.database}
+        ).scalar()
+        if exists:
+            conn.exec_driver_sql(f"ALTER DATABASE {name} WITH IS_TEMPLATE false")
+            conn.exec_driver_sql(f"DROP DATABASE {name} WITH (FORCE)")
+
+
+def build_snapshot(url: str, populate: Callable[[str], None]) -> str:
+    """重新构建快照：创建空的模板数据库，由 populate(模板URL) 建表和写入数据，返回模板URL"""
+    template = template_url(url)
+    rendered = template.render_as_string(hide_password=False)
+    drop_database(rendered)
+    if template.get_backend_name() != "sqlite":
+        with maintenance_connection(template) as conn:
+            conn.exec_driver_sql(f"CREATE DATABASE {quote(conn, template.database)}")
+
+    populate(rendered)
+
+    if template.get_backend_name() != "sqlite":
+        with maintenance_connection(template) as conn:
+            # 标记为模板：普通用户也能以其为模板复制，且不能被误删
+            conn.exec_driver_sql(f"ALTER DATABASE {quote(conn, template.database)} WITH IS_TEMPLATE true")
+    return rendered
+
+
+def snapshot_exists(url: str) -> bool:
+    template = template_url(url)
+    if template.get_backend_name() == "sqlite":
+        return os.path.exists(template.database)
+    with maintenance_connection(template) as conn:
+        return bool(
+            conn.exec_driver_sql(
+                "SELECT 1 FROM pg_database WHERE datname = %(name)s", {"name": template.database}
+            ).scalar()
+        )
+
+
+def restore_snapshot(url: str, target: Optional[str] = None) -> float:
+    """用快照替换 target（默认为 url 本身）数据库，返回耗时（秒）"""
+    template = template_url(url)
+    destination = make_url(target or url)
+    if not snapshot_exists(url):
+        raise RuntimeError(f"快照 {template.database} 不存在，请先执行 python init_db.py snapshot")
+
+    start = time.perf_counter()
+    if destination.get_backend_name() == "sqlite":
+        remove_sqlite_files(destination.database)
+        shutil.copyfile(template.database, destination.database)
+    else:
+        with maintenance_connection(destination) as conn:
+            name = quote(conn, destination.database)
+            conn.exec_driver_sql(f"DROP DATABASE IF EXISTS {name} WITH (FORCE)")
+            conn.exec_driver_sql(
+                f"CREATE DATABASE {name} TEMPLATE {quote(conn, template.database)}"
+            )
+    return time.perf_counter() - start
+
+
+@contextmanager
+def cloned_database(url: Optional[str] = None) -> Iterator[str]:
+    """从快照复制一个临时数据库，返回其连接URL，退出时删除"""
+    url = url or settings.database_url
+    source = make_url(url)
+    suffix = uuid.uuid4().hex[:8]
+    if source.get_backend_name() == "sqlite":
+        clone = source.set(database=f"{source.database}.{suffix}")
+    else:
+        clone = source.set(database=f"{source.database}_{suffix}")
+    rendered = clone.render_as_string(hide_password=False)
+    restore_snapshot(url, rendered)
+    try:
+        yield rendered
+    finally:
+        drop_database(rendered)
@@ -21,7 +21,11 @@ SQLAdmin 管理界面配置
 参考官方文档：https://aminalaee.github.io/sqladmin/model_convertors/
 """
 
-from typing import Any
+import logging
+import re
+from functools import lru_cache
+from itertools import accumulate
+from typing import Any, Callable, Optional
 from wtforms import (
     SelectField,
     TextAreaField,
@@ -31,7 +35,61 @@ from wtforms import (
 from wtforms.widgets import PasswordInput
 import json
 
-from models.auth_model import InfoStatusTypeEnum
+import orjson
+
+try:
+    import fastjsonschema
+except ImportError:  # fastjsonschema 为可选依赖，未安装时不校验 JSON Schema
+    fastjsonschema = None
+
+from config import settings
+from models.auth_model import JSON_PREVIEW_KEYS, JSON_PREVIEW_LENGTH, InfoStatusTypeEnum
+
+logger = logging.getLogger(__name__)
+
+# JSON 嵌套深度检查：先去掉转义字符和字符串内容，再累计括号，全部为线性扫描
+JSON_ESCAPE = re.compile(r"\\.", re.S)
+JSON_STRING = re.compile(r'"[^"]*"')
+JSON_NON_BRACKET = re.compile(r"[^\[\]{}]+")
+BRACKET_DEPTH = {"[": 1, "{": 1, "]": -1, "}": -1}
+# orjson 把超出 int64/uint64 范围的整数解析为浮点数（19 位的负数就可能超出），
+# 出现 19 位以上的数字时改用标准库保持精度
+LONG_INTEGER = re.compile(r"\d{19,}")
+
+
+def json_nesting_depth(text: str) -> int:
+    """JSON 文本的最大嵌套深度（不解析，字符串中的括号不计）"""
+    brackets = JSON_NON_BRACKET.sub("", JSON_STRING.sub("", JSON_ESCAPE.sub("", text)))
+    return max(accumulate(map(BRACKET_DEPTH.__getitem__, brackets)), default=0)
+
+
+def parse_json_text(text: str, max_size: int, max_depth: int) -> Any:
+    """按大小和嵌套深度限制解析 JSON 文本，超限或格式错误时抛出 ValueError"""
+    if len(text) > max_size:
+        raise ValueError(f"JSON 内容过大（{len(text)} 个字符，最多 {max_size} 个）")
+    depth = json_nesting_depth(text)
+    if depth > max_depth:
+        raise ValueError(f"JSON 嵌套层数过深（{depth} 层，最多 {max_depth} 层）")
+    if LONG_INTEGER.search(text):
+        return json.loads(text)
+    return orjson.loads(text)
+
+
+def dumps_pretty(data: Any) -> str:
+    """缩进格式的 JSON 文本（表单和详情页显示）"""
+    try:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    except TypeError:  # 超过 64 位的整数等 orjson 不支持的值
+        return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+@lru_cache(maxsize=64)
+def compile_json_schema(schema_text: str) -> Optional[Callable[[Any], Any]]:
+    """编译 JSON Schema（按内容缓存，每个 schema 只编译一次）"""
+    if fastjsonschema is None:
+        logger.warning("未安装 fastjsonschema，JSON 字段不校验 JSON Schema")
+        return None
+    return fastjsonschema.compile(json.loads(schema_text))
 
 
 # JSON字段格式化函数
@@ -64,34 +122,91 @@ def format_json_column(data: Any, max_length: int = 100) -> str:
         )
 
 
+def format_json_preview(model: Any, name: str, max_length: int = 100) -> str:
+    """按预览列格式化JSON字段用于列表显示（结果与 format_json_column 相同，不读取完整的JSON）"""
+    count = getattr(model, f"{name}_key_count")
+    keys = getattr(model, f"{name}_keys")
+    preview = getattr(model, f"{name}_preview")
+    if preview is None or preview == "null":
+        return "无"
+
+    if keys is not None:
+        # 对象：预览列保存了前 JSON_PREVIEW_KEYS 个键
+        if count <= JSON_PREVIEW_KEYS:
+            key_str = ", ".join(f'"{k}"' for k in keys)
+            return f"{{{key_str}}}"
+        key_str = ", ".join(f'"{k}"' for k in keys[:2])
+        return f"{{{key_str}, ...}} ({count}个字段)"
+    if count is not None:
+        return f"[数组] ({count}个元素)"
+    max_length = min(max_length, JSON_PREVIEW_LENGTH)
+    if len(preview) > max_length:
+        return preview[:max_length] + "..."
+    return preview
+
+
 def format_json_detail(data: Any) -> str:
     """格式化JSON数据用于详情显示"""
     if data is None:
         return "无"
 
     try:
-        return json.dumps(data, ensure_ascii=False, indent=2)
+        return dumps_pretty(data)
     except Exception:
         return str(data)
 
 
 # 自定义JSON字段（参考官方Model Convertors文档）
 class CustomJSONField(TextAreaField):
-    """自定义JSON字段，支持友好显示和验证"""
+    """自定义JSON字段，支持友好显示和验证
+
+    提交的内容先检查大小（JSON_FIELD_MAX_SIZE）和嵌套深度（JSON_FIELD_MAX_DEPTH）再解析，
+    可通过 form_args 传入 json_schema 按 JSON Schema 校验（需安装 fastjsonschema）。
+    显示的缩进文本只生成一次：解析成功时沿用提交的原文，否则首次显示时序列化
+    """
+
+    def __init__(
+        self,
+        label=None,
+        validators=None,
+        json_schema: Optional[dict] = None,
+        max_size: Optional[int] = None,
+        max_depth: Optional[int] = None,
+        **kwargs,
+    ):
+        super().__init__(label, validators, **kwargs)
+        self.max_size = settings.json_field_max_size if max_size is None else max_size
+        self.max_depth = settings.json_field_max_depth if max_depth is None else max_depth
+        self.validate_schema = (
+            compile_json_schema(json.dumps(json_schema, sort_keys=True)) if json_schema else None
+        )
+        self._text: Optional[str] = None
+
+    def process_data(self, value):
+        self.data = value
+        self._text = None
 
     def process_formdata(self, valuelist):
+        self._text = None
         if valuelist and valuelist[0]:
             try:
                 # 尝试解析JSON
                 if valuelist[0].strip():
-                    parsed_data = json.loads(valuelist[0])
+                    parsed_data = parse_json_text(valuelist[0], self.max_size, self.max_depth)
                     self.data = parsed_data
+                    self._text = valuelist[0]
                 else:
                     self.data = None
             except (json.JSONDecodeError, ValueError) as e:
                 # 如果不是有效的JSON，保存原始数据并添加验证错误
-                self.data = valuelist[0]
+                # （超过大小限制的内容不回显，避免重新渲染巨大的文本）
+                self.data = valuelist[0] if len(valuelist[0]) <= self.max_size else ""
                 raise ValidationError(f"无效的JSON格式: {str(e)}")
+            if self.validate_schema is not None and self.data is not None:
+                try:
+                    self.validate_schema(self.data)
+                except fastjsonschema.JsonSchemaException as e:
+                    raise ValidationError(f"JSON 内容不符合要求: {e.message}")
         else:
             self.data = None
 
@@ -100,7 +215,9 @@ class CustomJSONField(TextAreaField):
             if isinstance(self.data, str):
                 # 如果是字符串，直接返回（可能是验证失败的情况）
                 return self.data
-            return json.dumps(self.data, ensure_ascii=False, indent=2)
+            if self._text is None:
+                self._text = dumps_pretty(self.data)
+            return self._text
         return ""
 
     def __call__(self, **kwargs):
@@ -5,20 +5,36 @@
 
 import asyncio
 import json
+import time
 from datetime import datetime, timedelta
-from sqlalchemy import create_engine
+from sqlalchemy import delete, inspect, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateColumn
 
 from base import Base, DATABASE_URL
-from models.auth_model import User, AuthCredentials, InfoStatusTypeEnum
+from config import settings
+from db.counters import install_record_counters, reconcile_counts
+from db.engine_factory import create_sync_engine
+from db.json_previews import backfill_json_previews
+from db.partitioning import create_tables, detach_month_partitions, ensure_month_partitions
+from db.snapshots import build_snapshot, restore_snapshot
+from models.auth_model import (
+    User,
+    AuthCredentials,
+    DeletedRecord,
+    InfoStatusTypeEnum,
+    json_previews_generated,
+)
+from services.password_hashing import password_hasher
 
 
-def init_database():
+def init_database(database_url: str = DATABASE_URL):
     """初始化数据库"""
     print("开始初始化数据库...")
 
     # 创建引擎和会话
-    engine = create_engine(DATABASE_URL, echo=True)
+    engine = create_sync_engine(database_url, echo=True)
     Session = sessionmaker(bind=engine)
 
     # 删除现有表（如果存在）
@@ -26,9 +42,10 @@ def init_database():
     Base.metadata.drop_all(engine)
     print("现有表删除完成!")
 
-    # 创建所有表
+    # 创建所有表（auth_credentials 按 CREDENTIALS_PARTITIONING 创建为分区表）
     print("创建数据库表...")
-    Base.metadata.create_all(engine)
+    create_tables(engine)
+    install_record_counters(engine)
     print("数据库表创建完成!")
 
     # 创建会话并插入示例数据
@@ -79,6 +96,9 @@ def init_database():
             },
         ]
 
+        # 密码哈希在进程池中批量计算
+        print(password_hasher.hash_user_passwords(users_data).summary())
+
         created_users = []
         for user_data in users_data:
             user = User(**user_data)
@@ -214,13 +234,14 @@ def init_database():
         raise
     finally:
         session.close()
+        engine.dispose()
 
 
 def reset_database():
     """重置数据库（删除所有表和数据）"""
     print("开始重置数据库...")
 
-    engine = create_engine(DATABASE_URL, echo=True)
+    engine = create_sync_engine(DATABASE_URL, echo=True)
 
     # 删除所有表
     print("删除所有表...")
@@ -228,10 +249,159 @@ def reset_database():
     print("数据库重置完成!")
 
 
+def upgrade_database():
+    """升级已有数据库：创建新增的表和索引，不删除已有数据"""
+    print("开始升级数据库...")
+
+    engine = create_sync_engine(DATABASE_URL, echo=True)
+
+    # 创建缺少的表（已存在的表不受影响），按月分区时补建之后几个月的分区
+    create_tables(engine)
+
+    # create_all 也不会为已存在的表补建新增的列（如 JSON 预览列），逐个检查添加；
+    # PostgreSQL 的生成列在添加时即按现有数据计算（会重写整张表）
+    preparer = engine.dialect.identifier_preparer
+    added = []
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                definition = CreateColumn(column).compile(dialect=engine.dialect)
+                conn.execute(
+                    text(f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {definition}")
+                )
+                added.append(column)
+    if added and not json_previews_generated(engine.dialect.name):
+        # 其他数据库的预览列为普通列，按现有数据补算
+        with engine.begin() as conn:
+            for model in (User, AuthCredentials):
+                count = backfill_json_previews(conn, model)
+                print(f"已计算 {model.__tablename__} 的 JSON 预览列: {count} 行")
+
+    # 安装（或更新）计数触发器，并按现有数据初始化计数
+    install_record_counters(engine)
+
+    # create_all 不会为已存在的表补建索引，逐个检查创建
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+
+    # create_all 也不会修改已存在列的默认值，补充设置服务端默认值（时间戳、pp_token）
+    if engine.dialect.name == "sqlite":
+        print("SQLite 不支持修改列默认值，旧数据库请重新创建")
+    else:
+        with engine.begin() as conn:
+            for table in Base.metadata.sorted_tables:
+                for column in table.columns:
+                    # 生成列没有默认值
+                    if column.server_default is None or column.computed is not None:
+                        continue
+                    default = column.server_default.arg.compile(dialect=engine.dialect)
+                    conn.execute(
+                        text(
+                            f"ALTER TABLE {preparer.format_table(table)} "
+                            f"ALTER COLUMN {preparer.format_column(column)} SET DEFAULT {default}"
+                        )
+                    )
+
+    print("数据库升级完成!")
+
+
+def purge_tombstones(retention_days: int = None):
+    """清理超过保留期的删除记录（墓碑）"""
+    days = settings.sync_tombstone_retention_days if retention_days is None else retention_days
+    cutoff = datetime.now() - timedelta(days=days)
+
+    engine = create_sync_engine(DATABASE_URL, echo=True)
+    with engine.begin() as conn:
+        result = conn.execute(delete(DeletedRecord).where(DeletedRecord.deleted_at < cutoff))
+    print(f"已清理 {result.rowcount} 条 {days} 天前的删除记录")
+
+
+def reconcile_record_counts():
+    """按实际行数校正计数表（建议定期执行，校正期间短暂阻塞对用户表和凭据表的写入）"""
+    engine = create_sync_engine(DATABASE_URL, echo=True)
+    if engine.dialect.name != "postgresql":
+        print("计数表只在 PostgreSQL 上使用")
+        return
+    with engine.begin() as conn:
+        drift = reconcile_counts(conn)
+    for table_name, info_status, user_id, stored, actual in drift:
+        print(f"- {table_name} info_status={info_status} user_id={user_id}: {stored} -> {actual}")
+    print(f"计数校正完成，{len(drift)} 个分组有偏差")
+
+
+def snapshot_database(users: int = 0, credentials: int = 0):
+    """构建测试数据库快照：表结构和示例数据，可附加合成用户和凭据"""
+
+    def populate(url: str):
+        init_database(url)
+        if users or credentials:
+            from benchmarks.generate_data import GeneratorOptions, generate
+
+            engine = create_sync_engine(url)
+            try:
+                generate(engine, GeneratorOptions(users=users, credentials=credentials))
+            finally:
+                engine.dispose()
+
+    start = time.perf_counter()
+    url = build_snapshot(DATABASE_URL, populate)
+    print(f"\n快照已创建: {make_url(url).database}（{time.perf_counter() - start:.1f}s）")
+    print("运行 python init_db.py restore 用快照重置数据库")
+
+
+def restore_database():
+    """用快照替换当前数据库（断开现有连接）"""
+    try:
+        elapsed = restore_snapshot(DATABASE_URL)
+    except RuntimeError as e:
+        raise SystemExit(str(e))
+    print(f"已从快照恢复数据库 {make_url(DATABASE_URL).database}（{elapsed * 1000:.0f}ms）")
+
+
+def create_partitions(months_ahead: int = None):
+    """按月分区时创建当前月份及之后的分区（建议定期执行，插入的 created_at 没有对应分区会失败）"""
+    months = settings.credentials_partition_months_ahead if months_ahead is None else months_ahead
+
+    engine = create_sync_engine(DATABASE_URL, echo=True)
+    with engine.begin() as conn:
+        created = ensure_month_partitions(conn, months)
+    print(f"已创建 {len(created)} 个月份分区: {', '.join(created) or '无'}")
+
+
+def detach_partitions(keep_months: int = None, drop: bool = False):
+    """按月分区时分离超过保留期的月份分区，drop 为 True 时删除分离的表"""
+    months = settings.credentials_retention_months if keep_months is None else keep_months
+
+    engine = create_sync_engine(DATABASE_URL, echo=True)
+    detached = detach_month_partitions(engine, months, drop=drop)
+    action = "分离并删除" if drop else "分离"
+    print(f"已{action} {len(detached)} 个超过保留期（{months} 个月）的分区: {', '.join(detached) or '无'}")
+
+
 if __name__ == "__main__":
     import sys
 
-    if len(sys.argv) > 1 and sys.argv[1] == "reset":
+    if len(sys.argv) > 1 and sys.argv[1] == "upgrade":
+        upgrade_database()
+    elif len(sys.argv) > 1 and sys.argv[1] == "snapshot":
+        snapshot_database(*(int(arg) for arg in sys.argv[2:4]))
+    elif len(sys.argv) > 1 and sys.argv[1] == "restore":
+        restore_database()
+    elif len(sys.argv) > 1 and sys.argv[1] == "reconcile-counts":
+        reconcile_record_counts()
+    elif len(sys.argv) > 1 and sys.argv[1] == "create-partitions":
+        create_partitions(int(sys.argv[2]) if len(sys.argv) > 2 else None)
+    elif len(sys.argv) > 1 and sys.argv[1] == "detach-partitions":
+        args = [arg for arg in sys.argv[2:] if arg != "--drop"]
+        detach_partitions(int(args[0]) if args else None, drop="--drop" in sys.argv[2:])
+    elif len(sys.argv) > 1 and sys.argv[1] == "purge-tombstones":
+        purge_tombstones(int(sys.argv[2]) if len(sys.argv) > 2 else None)
+    elif len(sys.argv) > 1 and sys.argv[1] == "reset":
         # 重置数据库
         reset_database()
         print("数据库已重置，可以运行 'python init_db.py' 重新初始化")
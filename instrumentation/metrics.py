@@ -0,0 +1,264 @@
+"""
+Prometheus 风格的指标注册表
+
+提供 Counter / Histogram / Gauge 三种指标和文本格式导出，不依赖 prometheus_client。
+指标可能在线程池中更新（SQLAdmin 同步查询），所有写操作都加锁。
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Prometheus 默认延迟分桶（秒）
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 每请求 SQL 语句数分桶
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+def _escape(value: str) -> str:
+    """转义标签值中的反斜杠、双引号和换行"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    """格式化标签：{name="value",...}"""
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    """指标基类"""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def expose(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """单调递增计数器"""
+
+    type_name = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Histogram(Metric):
+    """直方图（累计分桶 + 总和 + 计数）"""
+
+    type_name = "histogram"
+
+    def __init__(self, *args, buckets: Iterable[float] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # [各分桶计数..., 总和, 总数]
+                state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            state[bisect_left(self.buckets, value)] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """计时上下文：with HISTOGRAM.time(op="hash"): ..."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(state)) for key, state in self._values.items()]
+
+        lines = []
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                labels = _format_labels(
+                    self.labelnames, key, f'le="{_format_value(bound)}"'
+                )
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(state[-2])}")
+            lines.append(f"{self.name}_count{labels} {state[-1]}")
+        return lines
+
+
+class Gauge(Metric):
+    """瞬时值，可设置固定值或在导出时通过回调采集"""
+
+    type_name = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._callbacks: List[Callable[[], Iterable[Tuple[Dict[str, str], float]]]] = []
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set_function(
+        self, callback: Callable[[], Iterable[Tuple[Dict[str, str], float]]]
+    ) -> None:
+        """注册导出时调用的回调，回调返回 (标签, 值) 列表"""
+        self._callbacks.append(callback)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        for callback in self._callbacks:
+            items.extend((self._key(labels), value) for labels, value in callback())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class MetricsRegistry:
+    """指标注册表"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets=buckets))
+
+    def gauge(self, name: str, documentation: str, labelnames=()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def expose(self) -> str:
+        """导出 Prometheus 文本格式"""
+        return "\n".join(metric.expose() for metric in self._metrics.values()) + "\n"
+
+
+# 全局注册表
+registry = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP 请求耗时（秒），按路由模板统计",
+    ("method", "route", "status"),
+)
+ADMIN_VIEW_SECONDS = registry.histogram(
+    "admin_view_duration_seconds",
+    "管理界面视图耗时（秒），按模型和操作统计",
+    ("view", "action"),
+)
+REQUEST_SQL_STATEMENTS = registry.histogram(
+    "http_request_sql_statements",
+    "单个请求执行的 SQL 语句数",
+    ("route",),
+    buckets=COUNT_BUCKETS,
+)
+REQUEST_SQL_SECONDS = registry.histogram(
+    "http_request_sql_duration_seconds",
+    "单个请求的 SQL 总耗时（秒）",
+    ("route",),
+)
+SQL_STATEMENT_SECONDS = registry.histogram(
+    "sql_statement_duration_seconds",
+    "单条 SQL 语句耗时（秒）",
+    ("engine",),
+)
+SQL_STATEMENTS_TOTAL = registry.counter(
+    "sql_statements_total", "SQL 语句执行总数", ("engine",)
+)
+DB_POOL_CONNECTIONS = registry.gauge(
+    "db_pool_connections",
+    "数据库连接池状态（size/checked_in/checked_out/overflow）",
+    ("engine", "state"),
+)
+ADMIN_DB_TASKS = registry.gauge(
+    "admin_db_executor_tasks",
+    "管理界面数据库线程池状态（size/active/queued）",
+    ("state",),
+)
+ADMIN_DB_WAIT_SECONDS = registry.histogram(
+    "admin_db_executor_wait_seconds",
+    "管理界面数据库操作在线程池中的排队耗时（秒）",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+BCRYPT_SECONDS = registry.histogram(
+    "bcrypt_duration_seconds",
+    "bcrypt 哈希/校验耗时（秒）",
+    ("op",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.0),
+)
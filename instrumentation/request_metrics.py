@@ -0,0 +1,165 @@
+"""
+请求级指标采集
+- TimingMiddleware：纯 ASGI 计时中间件，按路由模板和管理界面视图记录耗时
+- instrument_engine：通过 SQLAlchemy 引擎事件统计每个请求的 SQL 语句数和耗时，
+  并在导出时采集连接池状态
+"""
+
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from starlette.routing import Mount
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config import settings
+from instrumentation.metrics import (
+    ADMIN_VIEW_SECONDS,
+    DB_POOL_CONNECTIONS,
+    HTTP_REQUEST_SECONDS,
+    REQUEST_SQL_SECONDS,
+    REQUEST_SQL_STATEMENTS,
+    SQL_STATEMENT_SECONDS,
+    SQL_STATEMENTS_TOTAL,
+)
+
+# SQLAdmin 中需要单独统计的视图操作
+ADMIN_ACTIONS = {"list", "details", "edit", "create", "delete"}
+
+
+@dataclass
+class RequestStats:
+    """单个请求的 SQL 统计（在线程池和 greenlet 中共享同一对象）"""
+
+    statements: int = 0
+    sql_seconds: float = 0.0
+
+
+current_request_stats: ContextVar[Optional[RequestStats]] = ContextVar(
+    "current_request_stats", default=None
+)
+
+
+def route_label(scope: Scope) -> str:
+    """根据路由匹配结果生成低基数的路由标签，如 /admin/{identity}/list"""
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path is not None:
+        root_path = scope.get("root_path", "")
+        if isinstance(route, Mount):
+            # 挂载点（如静态资源）：root_path 已包含挂载路径
+            return f"{root_path}/{{path}}"
+        return f"{root_path}{path}"
+
+    endpoint = scope.get("endpoint")
+    if endpoint is not None:
+        name = getattr(endpoint, "__name__", None)
+        if name is None:
+            # 挂载的 ASGI 应用（如静态资源）不设置 route，按挂载路径归类
+            return f"{scope.get('root_path', '')}/{{path}}"
+        return name
+    return "<unmatched>"
+
+
+class TimingMiddleware:
+    """请求计时中间件（纯 ASGI，不包装请求体和响应体）"""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            current_request_stats.reset(token)
+            self.record(scope, status_code, duration, stats)
+
+    @staticmethod
+    def record(scope: Scope, status_code: int, duration: float, stats: RequestStats) -> None:
+        route = route_label(scope)
+        HTTP_REQUEST_SECONDS.observe(
+            duration, method=scope["method"], route=route, status=status_code
+        )
+        REQUEST_SQL_STATEMENTS.observe(stats.statements, route=route)
+        REQUEST_SQL_SECONDS.observe(stats.sql_seconds, route=route)
+
+        # 管理界面视图：/admin/{identity}/{action}
+        endpoint = scope.get("endpoint")
+        action = getattr(endpoint, "__name__", None)
+        if (
+            action in ADMIN_ACTIONS
+            and scope.get("root_path", "").rstrip("/") == settings.admin_base_url
+        ):
+            identity = scope.get("path_params", {}).get("identity", "")
+            ADMIN_VIEW_SECONDS.observe(duration, view=identity, action=action)
+
+
+# 已接入指标的引擎：名称 -> 同步引擎
+_instrumented_engines: Dict[str, object] = {}
+
+
+def instrument_engine(name: str, engine) -> None:
+    """为引擎注册 SQL 计时事件（支持同步引擎和 AsyncEngine）"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if name in _instrumented_engines:
+        return
+    _instrumented_engines[name] = sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info["query_start_time"].pop()
+        SQL_STATEMENT_SECONDS.observe(duration, engine=name)
+        SQL_STATEMENTS_TOTAL.inc(engine=name)
+
+        stats = current_request_stats.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.sql_seconds += duration
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(exception_context):
+        # 语句失败时清理计时栈
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start_time"):
+            conn.info["query_start_time"].pop()
+
+
+def _pool_samples():
+    """导出时采集各引擎连接池状态"""
+    for name, engine in _instrumented_engines.items():
+        pool = engine.pool
+        for state, method in (
+            ("size", "size"),
+            ("checked_in", "checkedin"),
+            ("checked_out", "checkedout"),
+            ("overflow", "overflow"),
+        ):
+            # NullPool / StaticPool 等不提供全部统计方法
+            getter = getattr(pool, method, None)
+            if getter is not None:
+                yield {"engine": name, "state": state}, getter()
+
+
+DB_POOL_CONNECTIONS.set_function(_pool_samples)
@@ -0,0 +1,358 @@
+"""
+请求级 SQL 性能分析（N+1 检测）
+
+开启后记录请求执行的每条 SQL 语句（耗时、调用位置），并生成报告：
+- 同一语句形态在一个请求内重复执行达到阈值时标记为 N+1
+- 超过慢查询阈值的语句标记为慢查询，超过 EXPLAIN 阈值的 SELECT 语句
+  在同一连接上执行 EXPLAIN (ANALYZE, BUFFERS) 记录执行计划
+- 报告通过响应头（X-SQL-Profile-Id、Server-Timing）、HTML 页面底部面板
+  和调试端点 /debug/sql-profiles 查看
+
+开启方式：SQL_PROFILE_ENABLED=true 时安装中间件和引擎监听，对所有请求生效；
+未开启时不产生任何开销（与 DEBUG 无关，避免未关闭调试模式的部署执行 EXPLAIN ANALYZE）
+"""
+
+import itertools
+import logging
+import os
+import re
+import sys
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from html import escape
+from typing import Deque, Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import greenlet
+except ImportError:  # 仅异步引擎需要 greenlet
+    greenlet = None
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INSTRUMENTATION_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 查找调用位置时跳过的框架代码
+_LIBRARY_MARKERS = (
+    f"{os.sep}sqlalchemy{os.sep}",
+    f"{os.sep}asyncio{os.sep}",
+    f"{os.sep}anyio{os.sep}",
+    f"{os.sep}concurrent{os.sep}",
+    f"{os.sep}threading.py",
+    INSTRUMENTATION_DIR,
+)
+
+_WHITESPACE = re.compile(r"\s+")
+_NUMBER = re.compile(r"(?<![$\w])\d+\b")
+# IN 列表展开后的参数个数随数据变化，归一化为一个占位符
+_IN_LIST = re.compile(r"\bIN \((?:\s*(?:%\(\w+\)s|\$\d+|\?|:\w+)\s*,?)+\)", re.IGNORECASE)
+
+
+def statement_shape(statement: str) -> str:
+    """归一化语句形态：合并空白、数字常量和 IN 列表"""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _IN_LIST.sub("IN (...)", shape)
+    return _NUMBER.sub("?", shape)
+
+
+def _iter_frames(frame) -> Iterator:
+    while frame is not None:
+        yield frame
+        frame = frame.f_back
+    # 异步引擎的语句在 greenlet 中执行，调用方（await 处）位于父 greenlet
+    if greenlet is not None:
+        parent = greenlet.getcurrent().parent
+        if parent is not None:
+            frame = parent.gr_frame
+            while frame is not None:
+                yield frame
+                frame = frame.f_back
+
+
+def find_call_site() -> str:
+    """定位执行语句的调用位置：优先项目代码，其次第一个非 SQLAlchemy 的调用方"""
+    fallback = None
+    for frame in _iter_frames(sys._getframe(1)):
+        filename = frame.f_code.co_filename
+        if any(marker in filename for marker in _LIBRARY_MARKERS):
+            continue
+        location = f"{filename}:{frame.f_lineno} in {frame.f_code.co_name}"
+        if filename.startswith(PROJECT_ROOT) and "site-packages" not in filename:
+            return os.path.relpath(filename, PROJECT_ROOT) + location[len(filename) :]
+        if fallback is None:
+            fallback = location.split("site-packages" + os.sep)[-1]
+    return fallback or "<unknown>"
+
+
+@dataclass
+class StatementRecord:
+    """单条语句的执行记录"""
+
+    statement: str
+    parameters: str
+    duration: float
+    call_site: str
+    shape: str
+    engine: str
+    explain: Optional[List[str]] = None
+
+
+@dataclass
+class SQLProfile:
+    """单个请求的 SQL 分析结果"""
+
+    id: int
+    method: str
+    path: str
+    started_at: datetime = field(default_factory=datetime.now)
+    duration: float = 0.0
+    status_code: int = 0
+    statements: List[StatementRecord] = field(default_factory=list)
+
+    @property
+    def sql_seconds(self) -> float:
+        return sum(record.duration for record in self.statements)
+
+    def repeated_shapes(self) -> List[List[StatementRecord]]:
+        """同一形态重复执行达到阈值的语句组（疑似 N+1），按次数降序"""
+        groups: Dict[str, List[StatementRecord]] = {}
+        for record in self.statements:
+            groups.setdefault(record.shape, []).append(record)
+        repeated = [
+            records
+            for records in groups.values()
+            if len(records) >= settings.sql_profile_repeat_threshold
+        ]
+        return sorted(repeated, key=len, reverse=True)
+
+    def slow_statements(self) -> List[StatementRecord]:
+        threshold = settings.sql_profile_slow_ms / 1000
+        return [record for record in self.statements if record.duration >= threshold]
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "status_code": self.status_code,
+            "duration_ms": round(self.duration * 1000, 2),
+            "statements": len(self.statements),
+            "sql_ms": round(self.sql_seconds * 1000, 2),
+            "n_plus_one": len(self.repeated_shapes()),
+            "slow": len(self.slow_statements()),
+        }
+
+    def report(self) -> str:
+        """生成文本报告"""
+        lines = [
+            f"#{self.id} {self.method} {self.path} -> {self.status_code}  "
+            f"{len(self.statements)} statements, SQL {self.sql_seconds * 1000:.1f}ms "
+            f"/ total {self.duration * 1000:.1f}ms"
+        ]
+
+        for records in self.repeated_shapes():
+            total = sum(record.duration for record in records) * 1000
+            lines.append(f"\n[N+1] {len(records)}x {total:.1f}ms  {records[0].shape}")
+            for call_site in sorted({record.call_site for record in records}):
+                lines.append(f"    at {call_site}")
+
+        for record in self.slow_statements():
+            lines.append(f"\n[SLOW] {record.duration * 1000:.1f}ms  {record.shape}")
+            lines.append(f"    at {record.call_site}")
+            lines.append(f"    params: {record.parameters}")
+            if record.explain:
+                lines.append("    EXPLAIN (ANALYZE, BUFFERS):")
+                lines.extend(f"      {line}" for line in record.explain)
+
+        lines.append("\nStatements:")
+        for index, record in enumerate(self.statements, 1):
+            lines.append(
+                f"{index:>4}. {record.duration * 1000:8.2f}ms [{record.engine}] "
+                f"{record.shape[:160]}"
+            )
+            lines.append(f"        at {record.call_site}")
+        return "\n".join(lines)
+
+
+current_sql_profile: ContextVar[Optional[SQLProfile]] = ContextVar(
+    "current_sql_profile", default=None
+)
+
+# 最近的分析结果（供调试端点查看）
+recent_profiles: Deque[SQLProfile] = deque(maxlen=settings.sql_profile_history)
+_profile_ids = itertools.count(1)
+
+
+def get_profile(profile_id: int) -> Optional[SQLProfile]:
+    for profile in recent_profiles:
+        if profile.id == profile_id:
+            return profile
+    return None
+
+
+def _explain(conn, statement: str, parameters) -> Optional[List[str]]:
+    """在同一连接上执行 EXPLAIN (ANALYZE, BUFFERS)，使用保存点避免失败时中断事务"""
+    explain_cursor = conn.connection.cursor()
+    try:
+        explain_cursor.execute("SAVEPOINT sql_profile_explain")
+        try:
+            explain_cursor.execute(
+                f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters
+            )
+            plan = [row[0] for row in explain_cursor.fetchall()]
+        except Exception:
+            explain_cursor.execute("ROLLBACK TO SAVEPOINT sql_profile_explain")
+            raise
+        explain_cursor.execute("RELEASE SAVEPOINT sql_profile_explain")
+        return plan
+    except Exception as e:
+        logger.warning(f"EXPLAIN 执行失败: {e}")
+        return None
+    finally:
+        explain_cursor.close()
+
+
+_profiled_engines: set = set()
+
+
+def profile_engine(name: str, engine) -> None:
+    """为引擎注册 SQL 分析事件（支持同步引擎和 AsyncEngine），未开启分析的请求只多一次 ContextVar 读取"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if name in _profiled_engines:
+        return
+    _profiled_engines.add(name)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if current_sql_profile.get() is not None:
+            conn.info.setdefault("sql_profile_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        profile = current_sql_profile.get()
+        if profile is None or not conn.info.get("sql_profile_start"):
+            return
+        duration = time.perf_counter() - conn.info["sql_profile_start"].pop()
+
+        record = StatementRecord(
+            statement=statement,
+            parameters=repr(parameters)[:500],
+            duration=duration,
+            call_site=find_call_site(),
+            shape=statement_shape(statement),
+            engine=name,
+        )
+        explain_threshold = settings.sql_profile_explain_ms / 1000
+        if (
+            explain_threshold > 0
+            and duration >= explain_threshold
+            and not executemany
+            and conn.dialect.name == "postgresql"
+            and record.shape.upper().startswith(("SELECT", "WITH"))
+            # 同一形态每个请求只分析一次
+            and not any(
+                r.explain for r in profile.statements if r.shape == record.shape
+            )
+        ):
+            record.explain = _explain(conn, statement, parameters)
+        profile.statements.append(record)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("sql_profile_start"):
+            conn.info["sql_profile_start"].pop()
+
+
+def render_html_panel(profile: SQLProfile) -> bytes:
+    """页面底部的折叠报告面板"""
+    summary = profile.summary()
+    flagged = summary["n_plus_one"] or summary["slow"]
+    title = (
+        f"SQL #{profile.id}: {summary['statements']} statements, "
+        f"{summary['sql_ms']}ms, N+1 {summary['n_plus_one']}, slow {summary['slow']}"
+    )
+    return (
+        '<details class="sql-profile" style="position:fixed;bottom:0;left:0;right:0;'
+        "max-height:50vh;overflow:auto;z-index:9999;background:#fff;font-size:12px;"
+        f'border-top:2px solid {"#d63939" if flagged else "#2fb344"};padding:4px 8px">'
+        f"<summary>{escape(title)}</summary><pre>{escape(profile.report())}</pre>"
+        "</details>"
+    ).encode("utf-8")
+
+
+class SQLProfilerMiddleware:
+    """SQL 分析中间件（纯 ASGI），需放在 GZip 中间件内层以便向 HTML 注入报告"""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = SQLProfile(
+            id=next(_profile_ids), method=scope["method"], path=scope["path"]
+        )
+        token = current_sql_profile.set(profile)
+        start = time.perf_counter()
+        pending_start: Optional[Message] = None
+        body_chunks: List[bytes] = []
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal pending_start
+            if message["type"] == "http.response.start":
+                profile.status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers["x-sql-profile-id"] = str(profile.id)
+                headers.append(
+                    "server-timing",
+                    f'sql;dur={profile.sql_seconds * 1000:.2f};'
+                    f'desc="{len(profile.statements)} statements"',
+                )
+                if headers.get("content-type", "").startswith(
+                    "text/html"
+                ) and not headers.get("content-encoding"):
+                    # HTML 响应缓存到结束后注入报告面板
+                    pending_start = message
+                    return
+                await send(message)
+                return
+
+            if message["type"] == "http.response.body" and pending_start is not None:
+                body_chunks.append(message.get("body", b""))
+                if message.get("more_body", False):
+                    return
+                body = b"".join(body_chunks)
+                profile.duration = time.perf_counter() - start
+                panel = render_html_panel(profile)
+                index = body.rfind(b"</body>")
+                body = body[:index] + panel + body[index:] if index >= 0 else body + panel
+                headers = MutableHeaders(scope=pending_start)
+                headers["content-length"] = str(len(body))
+                await send(pending_start)
+                await send({"type": "http.response.body", "body": body})
+                return
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_sql_profile.reset(token)
+            profile.duration = time.perf_counter() - start
+            recent_profiles.append(profile)
+            summary = profile.summary()
+            if summary["n_plus_one"] or summary["slow"]:
+                logger.warning(f"SQL 分析发现问题:\n{profile.report()}")
@@ -9,24 +9,72 @@
 4. 所有权限控制都在查询层面实现，确保数据安全
 """
 
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import RedirectResponse, HTMLResponse
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse, RedirectResponse
 from sqladmin import Admin
+from starlette.middleware.gzip import GZipMiddleware
 from starlette.middleware.sessions import SessionMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
-import json
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from types import SimpleNamespace
+from typing import List
+import asyncio
 import logging
 
 from config import settings, get_admin_config
-from base import DATABASE_URL, postgres_engine_2
-from models.auth_model import User, AuthCredentials
+from base import (
+    DATABASE_URL,
+    DeferredAsyncSessionMaker,
+    DeferredSessionMaker,
+    get_async_db,
+    get_async_engine,
+    get_async_session_local,
+    get_engine,
+    get_replicas,
+    get_session_local,
+)
+from db.admin_executor import get_admin_db_mode
+from db.counters import record_counters
+from db.prewarm import prewarm
+from db.routing import ReadRoutingMiddleware
+from models.auth_model import User, AuthCredentials, InfoStatusTypeEnum
 from admin.auth_admin import (
     UserPermissionAdmin,
     CredentialsPermissionAdmin,
-    PermissionError,
 )
 from auth.authentication import flexible_auth_backend
+from auth.permissions import (
+    get_current_api_user,
+    credentials_count_statement,
+    credentials_visibility_clause,
+    users_count_statement,
+)
+from auth.error_handlers import register_permission_error_handlers
+from api.credentials_api import (
+    BATCH_GET_SELECT,
+    credential_json_filters,
+    router as credentials_router,
+)
+from api.sync_api import router as sync_router
+from services.credential_events import credential_events
+from static_assets import install_static_assets
+from instrumentation.metrics import registry
+from instrumentation.request_metrics import TimingMiddleware, instrument_engine
+from instrumentation.sql_profiler import (
+    SQLProfilerMiddleware,
+    get_profile,
+    profile_engine,
+    recent_profiles,
+)
+from schemas.api_schemas import (
+    FastJSONResponse,
+    PermissionFlags,
+    UserProfile,
+    CountResult,
+    CredentialItem,
+    CREDENTIAL_ITEM_COLUMNS,
+)
 
 # 设置日志
 logging.basicConfig(
@@ -35,96 +83,36 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-class PermissionMiddleware(BaseHTTPMiddleware):
-    """权限检查中间件 - 处理权限错误"""
-
-    async def dispatch(self, request: Request, call_next):
-        try:
-            response = await call_next(request)
-            return response
-        except PermissionError as e:
-            logger.warning(
-                f"权限错误: {e.message} - 用户: {getattr(request.state, 'user', 'Unknown')}"
-            )
-
-            # 如果是API请求，返回JSON错误
-            if request.url.path.startswith("/api/"):
-                return Response(
-                    content=json.dumps({"error": e.message}),
-                    status_code=403,
-                    media_type="application/json",
-                )
-            # 如果是管理界面请求，返回友好的错误页面
-            else:
-                error_html = f"""
-                <!DOCTYPE html>
-                <html>
-                <head>
-                    <title>访问被拒绝</title>
-                    <meta charset="utf-8">
-                    <style>
-                        body {{ 
-                            font-family: Arial, sans-serif; 
-                            margin: 40px;
-                            background-color: #f8f9fa;
-                        }}
-                        .error-container {{ 
-                            max-width: 600px; 
-                            margin: 0 auto; 
-                            text-align: center;
-                            background: white;
-                            padding: 40px;
-                            border-radius: 8px;
-                            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-                        }}
-                        .error-code {{ 
-                            font-size: 72px; 
-                            color: #dc3545; 
-                            margin: 20px 0;
-                            font-weight: bold;
-                        }}
-                        .error-message {{ 
-                            font-size: 24px; 
-                            color: #495057; 
-                            margin: 20px 0;
-                        }}
-                        .error-description {{ 
-                            font-size: 16px; 
-                            color: #6c757d; 
-                            margin: 20px 0;
-                            line-height: 1.5;
-                        }}
-                        .back-link {{ 
-                            margin-top: 30px; 
-                        }}
-                        .back-link a {{ 
-                            color: #007bff; 
-                            text-decoration: none;
-                            font-weight: bold;
-                            padding: 10px 20px;
-                            border: 2px solid #007bff;
-                            border-radius: 5px;
-                            transition: all 0.3s;
-                        }}
-                        .back-link a:hover {{ 
-                            background-color: #007bff;
-                            color: white;
-                        }}
-                    </style>
-                </head>
-                <body>
-                    <div class="error-container">
-                        <div class="error-code">403</div>
-                        <div class="error-message">访问被拒绝</div>
-                        <div class="error-description">{e.message}</div>
-                        <div class="back-link">
-                            <a href="/admin">返回管理界面</a>
-                        </div>
-                    </div>
-                </body>
-                </html>
-                """
-                return HTMLResponse(content=error_html, status_code=403)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """应用生命周期：启动时创建引擎并注册监控事件、预压缩静态资源、检查计数触发器，
+    启动/停止凭据变更事件总线和副本健康检查"""
+    instrument_engines()
+    async_engine, replicas = get_async_engine(), get_replicas()
+    for static_app in static_apps:
+        static_app.precompress()
+    await credential_events.start()
+    # 确认计数触发器已安装后计数查询才使用计数表
+    await record_counters.check(async_engine)
+    if settings.db_prewarm:
+        # 开始接收请求之前建立连接并预热热点查询
+        await prewarm(
+            [("async", async_engine)]
+            + [(f"{r.name}_async", r.async_engine) for r in replicas.replicas],
+            [("sync", get_engine())]
+            + [(f"{r.name}_sync", r.sync_engine) for r in replicas.replicas],
+            warmup_statements(),
+            sync_connections=settings.admin_db_threads,
+        )
+    health_task = None
+    if replicas:
+        await replicas.check()
+        health_task = asyncio.create_task(replicas.run_health_checks())
+    yield
+    if health_task is not None:
+        health_task.cancel()
+        await replicas.dispose()
+    await credential_events.stop()
 
 
 # 创建FastAPI应用
@@ -133,8 +121,13 @@ app = FastAPI(
     description=f"{settings.app_description} - 基于SQLAdmin官方最佳实践的完整权限控制",
     version=settings.app_version,
     debug=settings.debug,
+    lifespan=lifespan,
 )
 
+# 添加读写分离中间件（在会话中间件内层，读取和记录用户最近的写请求时间）
+if settings.database_replica_urls:
+    app.add_middleware(ReadRoutingMiddleware)
+
 # 添加会话中间件（认证所需）
 app.add_middleware(
     SessionMiddleware,
@@ -142,16 +135,55 @@ app.add_middleware(
     max_age=3600,  # 1小时会话过期
 )
 
-# 添加权限检查中间件
-app.add_middleware(PermissionMiddleware)
+# 添加SQL分析中间件（在压缩中间件内层，可向HTML页面注入分析报告）
+sql_profiler_available = settings.sql_profile_enabled
+if sql_profiler_available:
+    app.add_middleware(SQLProfilerMiddleware)
+
+# 添加响应压缩中间件（HTML/JSON 超过阈值时 gzip 压缩，已编码的静态资源不重复压缩）
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=settings.gzip_minimum_size,
+    compresslevel=settings.gzip_compress_level,
+)
+
+# 添加请求计时中间件（最外层，统计完整请求耗时和每请求SQL）
+if settings.metrics_enabled:
+    app.add_middleware(TimingMiddleware)
+
+
+def instrument_engines() -> None:
+    """为主库和副本引擎注册SQL分析和计时事件（生命周期开始时调用，引擎在此时创建）"""
+    engines = [("sync", get_engine()), ("async", get_async_engine())]
+    for replica in get_replicas().replicas:
+        engines.append((f"{replica.name}_sync", replica.sync_engine))
+        engines.append((f"{replica.name}_async", replica.async_engine))
+    for name, engine in engines:
+        if sql_profiler_available:
+            profile_engine(name, engine)
+        if settings.metrics_enabled:
+            instrument_engine(name, engine)
+
+
+def __getattr__(name: str):
+    # 使用统一的数据库引擎（与base.py保持一致），首次访问时创建
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# 使用统一的数据库引擎（与base.py保持一致）
-engine = postgres_engine_2
+
+# 管理界面会话工厂（与 base.py 一致，配置副本时按请求路由读写），首次创建会话时才绑定引擎：
+# threadpool 模式使用同步会话，数据库操作在有界线程池中执行；
+# async 模式使用异步会话（单独的工厂，SQLAdmin 修改的会话配置不影响 API）
+if get_admin_db_mode() == "async":
+    admin_session_maker = DeferredAsyncSessionMaker(get_async_session_local)
+else:
+    admin_session_maker = DeferredSessionMaker(get_session_local)
 
 # 创建Admin实例，使用灵活认证后端
 admin = Admin(
     app=app,
-    engine=engine,
+    session_maker=admin_session_maker,
     title=f"{settings.admin_title} - 完整权限管理版",
     # 使用灵活认证后端，允许所有有效用户登录
     authentication_backend=flexible_auth_backend,
@@ -161,6 +193,12 @@ admin = Admin(
 admin.add_view(UserPermissionAdmin)
 admin.add_view(CredentialsPermissionAdmin)
 
+# 注册权限错误处理器（主应用和管理界面子应用）
+register_permission_error_handlers(app, admin.admin)
+
+# 挂载指纹化、预压缩的静态资源
+static_apps = install_static_assets(app, admin)
+
 logger.info("已注册完整权限管理界面")
 
 
@@ -171,12 +209,32 @@ async def root():
     return RedirectResponse(url="/admin")
 
 
-# 健康检查端点
+async def _ping_database() -> None:
+    """执行 SELECT 1 确认数据库可用"""
+    async with get_async_engine().connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+# 健康检查端点（就绪探针：数据库不可用时返回503）
 @app.get("/health")
 async def health_check():
     """健康检查"""
-    return {
+    try:
+        await asyncio.wait_for(_ping_database(), timeout=settings.health_check_timeout)
+    except Exception as e:
+        logger.warning(f"就绪检查失败: {e}")
+        return FastJSONResponse(
+            {
+                "status": "unhealthy",
+                "database": "unavailable",
+                "message": "数据库连接失败",
+            },
+            status_code=503,
+        )
+
+    response = {
         "status": "healthy",
+        "database": "ok",
         "message": "SQLAdmin 完整权限管理系统运行正常",
         "features": [
             "超级用户完全权限",
@@ -185,220 +243,218 @@ async def health_check():
             "细粒度字段控制",
         ],
     }
+    replicas = get_replicas()
+    if replicas:
+        # 副本不可用时读请求回退到主库，不影响就绪状态
+        response["replicas"] = [
+            {
+                "name": replica.name,
+                "healthy": replica.healthy,
+                "lag_seconds": replica.lag_seconds,
+            }
+            for replica in replicas.replicas
+        ]
+    return response
 
 
-# API路由 - 带权限控制
-@app.get("/api/user/profile")
-async def get_user_profile(request: Request):
-    """获取当前用户信息"""
-    user = getattr(request.state, "user", None)
-    if not user:
-        raise HTTPException(status_code=401, detail="未登录")
+# 指标端点（Prometheus 文本格式）
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """导出监控指标"""
+    return PlainTextResponse(
+        registry.expose(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
 
-    return {
-        "id": user.id,
-        "username": user.username,
-        "email": user.email,
-        "is_superuser": user.is_superuser,
-        "is_active": user.is_active,
-        "created_at": user.created_at.isoformat() if user.created_at else None,
-        "permissions": {
-            "can_see_all_users": user.is_superuser,
-            "can_create_users": user.is_superuser,
-            "can_see_all_credentials": user.is_superuser,
-            "can_create_public_credentials": user.is_superuser,
-        },
-    }
 
+async def get_profiler_user(user: User = Depends(get_current_api_user)) -> User:
+    """SQL 分析结果包含查询参数，只允许超级用户查看"""
+    if not sql_profiler_available:
+        raise HTTPException(status_code=404, detail="SQL 分析未开启")
+    if not user.is_superuser:
+        raise HTTPException(status_code=403, detail="只有超级管理员可以查看SQL分析结果")
+    return user
 
-@app.get("/api/users/count")
-async def get_users_count(request: Request):
-    """获取用户总数（根据权限过滤）"""
-    user = getattr(request.state, "user", None)
-    if not user:
-        raise HTTPException(status_code=401, detail="未登录")
 
-    from base import get_db
-    from sqlalchemy import func
+@app.get("/debug/sql-profiles", include_in_schema=False)
+async def list_sql_profiles(user: User = Depends(get_profiler_user)):
+    """最近的SQL分析结果摘要"""
+    return FastJSONResponse([profile.summary() for profile in reversed(recent_profiles)])
+
+
+@app.get("/debug/sql-profiles/{profile_id}", include_in_schema=False)
+async def get_sql_profile(profile_id: int, user: User = Depends(get_profiler_user)):
+    """单个请求的SQL分析报告"""
+    profile = get_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="分析结果不存在或已过期")
+    return PlainTextResponse(profile.report())
+
 
-    with next(get_db()) as db:
-        if user.is_superuser:
-            # 超级用户看到所有用户数量
-            count = db.query(func.count(User.id)).scalar()
-        else:
-            # 普通用户只能看到自己，所以数量是1
-            count = 1
+# API路由 - 带权限控制（异步会话，通过依赖注入获取当前用户）
+@app.get("/api/user/profile", response_model=UserProfile)
+async def get_user_profile(user: User = Depends(get_current_api_user)):
+    """获取当前用户信息"""
+    return FastJSONResponse(
+        UserProfile(
+            id=user.id,
+            username=user.username,
+            email=user.email,
+            is_superuser=user.is_superuser,
+            is_active=user.is_active,
+            created_at=user.created_at,
+            permissions=PermissionFlags(
+                can_see_all_users=user.is_superuser,
+                can_create_users=user.is_superuser,
+                can_see_all_credentials=user.is_superuser,
+                can_create_public_credentials=user.is_superuser,
+            ),
+        )
+    )
+
+
+@app.get("/api/users/count", response_model=CountResult)
+async def get_users_count(
+    user: User = Depends(get_current_api_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """获取用户总数（根据权限过滤）"""
+    if user.is_superuser:
+        # 超级用户看到所有用户数量
+        count = await db.scalar(users_count_statement())
+    else:
+        # 普通用户只能看到自己，所以数量是1
+        count = 1
 
-        return {"count": count, "is_filtered": not user.is_superuser}
+    return FastJSONResponse(CountResult(count, not user.is_superuser))
 
 
-@app.get("/api/credentials/count")
-async def get_credentials_count(request: Request):
+@app.get("/api/credentials/count", response_model=CountResult)
+async def get_credentials_count(
+    user: User = Depends(get_current_api_user),
+    db: AsyncSession = Depends(get_async_db),
+):
     """获取认证凭据总数（根据权限过滤）"""
-    user = getattr(request.state, "user", None)
-    if not user:
-        raise HTTPException(status_code=401, detail="未登录")
-
-    from base import get_db
-    from sqlalchemy import func, or_, and_
-    from models.auth_model import InfoStatusTypeEnum
-
-    with next(get_db()) as db:
-        if user.is_superuser:
-            # 超级用户看到所有凭据数量
-            count = db.query(func.count(AuthCredentials.id)).scalar()
-        else:
-            # 普通用户只能看到公开凭据和自己的私有凭据
-            count = (
-                db.query(func.count(AuthCredentials.id))
-                .filter(
-                    or_(
-                        AuthCredentials.info_status == InfoStatusTypeEnum.PUBLIC.value,
-                        and_(
-                            AuthCredentials.info_status
-                            == InfoStatusTypeEnum.PRIVATE.value,
-                            AuthCredentials.user_id == user.id,
-                        ),
-                    )
-                )
-                .scalar()
-            )
-
-        return {"count": count, "is_filtered": not user.is_superuser}
-
-
-@app.get("/api/my/credentials")
-async def get_my_credentials(request: Request):
-    """获取当前用户的私有认证凭据"""
-    user = getattr(request.state, "user", None)
-    if not user:
-        raise HTTPException(status_code=401, detail="未登录")
+    # 超级用户看到所有凭据数量，普通用户只能看到公开凭据和自己的私有凭据
+    count = await db.scalar(credentials_count_statement(user))
+
+    return FastJSONResponse(CountResult(count, not user.is_superuser))
+
+
+# 认证凭据批量接口和增量同步接口
+app.include_router(credentials_router)
+app.include_router(sync_router)
 
-    from base import get_db
-    from models.auth_model import InfoStatusTypeEnum
 
-    with next(get_db()) as db:
-        credentials = (
-            db.query(AuthCredentials)
-            .filter(
+# 凭据列表只查询需要的列，行元组直接构造响应对象，不加载ORM实体和关联用户
+CREDENTIAL_ITEM_SELECT = select(
+    *(getattr(AuthCredentials, name) for name in CREDENTIAL_ITEM_COLUMNS)
+)
+
+
+def warmup_statements():
+    """连接池预热执行的热点查询（认证、凭据计数、凭据列表和批量查询），参数不匹配任何数据"""
+    superuser = SimpleNamespace(id=0, is_superuser=True)
+    regular_user = SimpleNamespace(id=0, is_superuser=False)
+    statements = [
+        (select(User).where(User.id == 0, User.is_active == True), None),
+        (
+            CREDENTIAL_ITEM_SELECT.where(
                 AuthCredentials.info_status == InfoStatusTypeEnum.PRIVATE.value,
-                AuthCredentials.user_id == user.id,
-            )
-            .all()
+                AuthCredentials.user_id == 0,
+            ),
+            None,
+        ),
+    ]
+    for user in (superuser, regular_user):
+        statements.append((credentials_count_statement(user), None))
+        statements.append(
+            (BATCH_GET_SELECT.where(credentials_visibility_clause(user)), {"ids": []})
         )
+    return statements
 
-        return [
-            {
-                "id": cred.id,
-                "info": cred.info,
-                "expires_at": cred.expires_at.isoformat() if cred.expires_at else None,
-                "created_at": cred.created_at.isoformat() if cred.created_at else None,
-                "updated_at": cred.updated_at.isoformat() if cred.updated_at else None,
-                "can_edit": True,  # 自己的私有凭据可以编辑
-                "can_delete": True,  # 自己的私有凭据可以删除
-            }
-            for cred in credentials
-        ]
+
+@app.get("/api/my/credentials", response_model=List[CredentialItem])
+async def get_my_credentials(
+    user: User = Depends(get_current_api_user),
+    db: AsyncSession = Depends(get_async_db),
+    json_filters: list = Depends(credential_json_filters),
+):
+    """获取当前用户的私有认证凭据"""
+    result = await db.execute(
+        CREDENTIAL_ITEM_SELECT.where(
+            AuthCredentials.info_status == InfoStatusTypeEnum.PRIVATE.value,
+            AuthCredentials.user_id == user.id,
+            *json_filters,
+        )
+    )
+
+    # 自己的私有凭据可以编辑和删除
+    return FastJSONResponse(
+        [CredentialItem(*row, True, True) for row in result.tuples()]
+    )
 
 
-@app.get("/api/public/credentials")
-async def get_public_credentials(request: Request):
+@app.get("/api/public/credentials", response_model=List[CredentialItem])
+async def get_public_credentials(
+    user: User = Depends(get_current_api_user),
+    db: AsyncSession = Depends(get_async_db),
+    json_filters: list = Depends(credential_json_filters),
+):
     """获取公开的认证凭据"""
-    user = getattr(request.state, "user", None)
-    if not user:
-        raise HTTPException(status_code=401, detail="未登录")
-
-    from base import get_db
-    from models.auth_model import InfoStatusTypeEnum
-
-    with next(get_db()) as db:
-        credentials = (
-            db.query(AuthCredentials)
-            .filter(AuthCredentials.info_status == InfoStatusTypeEnum.PUBLIC.value)
-            .all()
+    result = await db.execute(
+        CREDENTIAL_ITEM_SELECT.where(
+            AuthCredentials.info_status == InfoStatusTypeEnum.PUBLIC.value,
+            *json_filters,
         )
+    )
 
-        return [
-            {
-                "id": cred.id,
-                "info": cred.info,
-                "expires_at": cred.expires_at.isoformat() if cred.expires_at else None,
-                "created_at": cred.created_at.isoformat() if cred.created_at else None,
-                "updated_at": cred.updated_at.isoformat() if cred.updated_at else None,
-                "can_edit": user.is_superuser,  # 只有超级用户可以编辑公开凭据
-                "can_delete": user.is_superuser,  # 只有超级用户可以删除公开凭据
-            }
-            for cred in credentials
-        ]
+    # 只有超级用户可以编辑和删除公开凭据
+    editable = user.is_superuser
+    return FastJSONResponse(
+        [CredentialItem(*row, editable, editable) for row in result.tuples()]
+    )
 
 
 @app.get("/api/permissions/test")
-async def test_permissions(request: Request):
+async def test_permissions(
+    user: User = Depends(get_current_api_user),
+    db: AsyncSession = Depends(get_async_db),
+):
     """测试权限系统的API端点"""
-    user = getattr(request.state, "user", None)
-    if not user:
-        raise HTTPException(status_code=401, detail="未登录")
-
-    from base import get_db
-
-    with next(get_db()) as db:
-        # 测试用户查询权限
-        if user.is_superuser:
-            all_users = db.query(User).all()
-            visible_users = len(all_users)
-        else:
-            visible_users = 1  # 只能看到自己
-
-        # 测试凭据查询权限
-        if user.is_superuser:
-            all_credentials = db.query(AuthCredentials).all()
-            visible_credentials = len(all_credentials)
-        else:
-            from sqlalchemy import or_, and_
-            from models.auth_model import InfoStatusTypeEnum
-
-            filtered_credentials = (
-                db.query(AuthCredentials)
-                .filter(
-                    or_(
-                        AuthCredentials.info_status == InfoStatusTypeEnum.PUBLIC.value,
-                        and_(
-                            AuthCredentials.info_status
-                            == InfoStatusTypeEnum.PRIVATE.value,
-                            AuthCredentials.user_id == user.id,
-                        ),
-                    )
-                )
-                .all()
-            )
-            visible_credentials = len(filtered_credentials)
-
-        return {
-            "user": {
-                "id": user.id,
-                "username": user.username,
-                "is_superuser": user.is_superuser,
-            },
-            "permissions": {
-                "visible_users": visible_users,
-                "visible_credentials": visible_credentials,
-                "can_create_users": user.is_superuser,
-                "can_create_public_credentials": user.is_superuser,
-                "can_edit_all_credentials": user.is_superuser,
-            },
-            "message": "权限测试完成"
-            + (" - 超级用户模式" if user.is_superuser else " - 普通用户模式"),
-        }
+    # 测试用户查询权限
+    if user.is_superuser:
+        visible_users = await db.scalar(users_count_statement())
+    else:
+        visible_users = 1  # 只能看到自己
+
+    # 测试凭据查询权限
+    visible_credentials = await db.scalar(credentials_count_statement(user))
+
+    return {
+        "user": {
+            "id": user.id,
+            "username": user.username,
+            "is_superuser": user.is_superuser,
+        },
+        "permissions": {
+            "visible_users": visible_users,
+            "visible_credentials": visible_credentials,
+            "can_create_users": user.is_superuser,
+            "can_create_public_credentials": user.is_superuser,
+            "can_edit_all_credentials": user.is_superuser,
+        },
+        "message": "权限测试完成"
+        + (" - 超级用户模式" if user.is_superuser else " - 普通用户模式"),
+    }
 
 
 if __name__ == "__main__":
-    import uvicorn
+    from run import start_production_server, start_server
 
     logger.info("启动完整权限管理应用")
-    uvicorn.run(
-        "main:app",
-        host=settings.host,
-        port=settings.port,
-        reload=settings.reload,
-        log_level=settings.log_level.lower(),
-    )
+    if settings.server_mode == "prod":
+        start_production_server(settings.host, settings.port)
+    else:
+        start_server(
+            settings.host, settings.port, reload=settings.reload, open_browser=False
+        )
@@ -2,24 +2,196 @@
 认证管理数据模型 - SQLAlchemy 2.0 风格
 """
 
+import json
 import uuid
 import bcrypt
 from datetime import datetime, timezone
-from typing import Optional
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
 from sqlalchemy import (
+    BigInteger,
+    Computed,
+    Index,
     Integer,
     String,
     Boolean,
     DateTime,
     Text,
     ForeignKey,
+    JSON,
     Enum as SQLEnum,
+    event,
+    insert,
+    inspect,
 )
 from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import relationship, Mapped, mapped_column
+from sqlalchemy.sql.expression import FunctionElement
 from enum import Enum
 
 from base import Base
+from instrumentation.metrics import BCRYPT_SECONDS
+
+
+# JSON 字段类型：PostgreSQL 使用 JSONB，其他数据库（如基准测试用的 SQLite）使用通用 JSON
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+
+class local_now(FunctionElement):
+    """数据库当前本地时间（不带时区，与应用原先使用的 datetime.now() 一致），用作服务端默认值"""
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(local_now)
+def _compile_local_now(element, compiler, **kw):
+    return "LOCALTIMESTAMP"
+
+
+@compiles(local_now, "sqlite")
+def _compile_local_now_sqlite(element, compiler, **kw):
+    # 毫秒精度，补齐为 SQLAlchemy 存储的 6 位小数格式，与应用写入的时间可以直接比较
+    return "strftime('%Y-%m-%d %H:%M:%f000', 'now', 'localtime')"
+
+
+class new_pp_token(FunctionElement):
+    """数据库生成的 PP 平台 token（pp_ + 16 位随机十六进制），格式与 User.generate_pp_token 相同"""
+
+    type = String()
+    inherit_cache = True
+
+
+@compiles(new_pp_token)
+def _compile_new_pp_token(element, compiler, **kw):
+    return "('pp_' || substr(replace(CAST(gen_random_uuid() AS TEXT), '-', ''), 1, 16))"
+
+
+@compiles(new_pp_token, "sqlite")
+def _compile_new_pp_token_sqlite(element, compiler, **kw):
+    return "('pp_' || lower(hex(randomblob(8))))"
+
+
+def jsonb_path_index(name: str, column: str) -> Index:
+    """JSON 字段的 GIN 索引（jsonb_path_ops，支持 @> 包含查询），只在 PostgreSQL 上创建"""
+    return Index(
+        name,
+        column,
+        postgresql_using="gin",
+        postgresql_ops={column: "jsonb_path_ops"},
+    ).ddl_if(dialect="postgresql")
+
+
+# JSON 预览列：列表页只读取预览，不加载完整的 JSON 文档
+JSON_PREVIEW_KEYS = 3  # 保存的顶层键数
+JSON_PREVIEW_LENGTH = 100  # 文本预览长度（多保存一个字符，用于判断是否被截断）
+
+
+class postgresql_computed(Computed):
+    """只在 PostgreSQL 上建为生成列；其他数据库建为普通列，由应用在写入时计算（见 fill_json_previews）"""
+
+    def _copy(self, **kw):
+        computed = super()._copy(**kw)
+        return postgresql_computed(computed.sqltext, persisted=computed.persisted)
+
+
+@compiles(postgresql_computed)
+def _compile_postgresql_computed(element, compiler, **kw):
+    return ""
+
+
+@compiles(postgresql_computed, "postgresql")
+def _compile_postgresql_computed_pg(element, compiler, **kw):
+    return compiler.visit_computed_column(element, **kw)
+
+
+def json_key_count_column(source: str, comment: str):
+    """JSON 对象的键数或数组的元素数（其他值为空）"""
+    return mapped_column(
+        Integer,
+        postgresql_computed(
+            f"CASE jsonb_typeof({source}) "
+            f"WHEN 'object' THEN jsonb_array_length(jsonb_path_query_array({source}, '$.keyvalue().key')) "
+            f"WHEN 'array' THEN jsonb_array_length({source}) END",
+            persisted=True,
+        ),
+        nullable=True,
+        comment=f"{comment}键数/元素数",
+    )
+
+
+def json_keys_column(source: str, comment: str):
+    """JSON 对象的前几个顶层键（非对象为空）"""
+    return mapped_column(
+        JSONType,
+        postgresql_computed(
+            f"CASE WHEN jsonb_typeof({source}) = 'object' THEN jsonb_path_query_array("
+            f"jsonb_path_query_array({source}, '$.keyvalue().key'), '$[0 to {JSON_PREVIEW_KEYS - 1}]') END",
+            persisted=True,
+        ),
+        nullable=True,
+        comment=f"{comment}顶层键",
+    )
+
+
+def json_preview_column(source: str, comment: str):
+    """JSON 文本的开头部分"""
+    return mapped_column(
+        Text,
+        postgresql_computed(
+            f"left(CAST({source} AS TEXT), {JSON_PREVIEW_LENGTH + 1})", persisted=True
+        ),
+        nullable=True,
+        comment=f"{comment}预览",
+    )
+
+
+def jsonb_ordered(data: Any) -> Any:
+    """按 jsonb 的规则重排对象的键（先按 UTF-8 字节长度、再按字节比较，逐层处理）"""
+    if isinstance(data, dict):
+        return {
+            key: jsonb_ordered(data[key])
+            for key in sorted(data, key=lambda key: (len(key.encode("utf-8")), key.encode("utf-8")))
+        }
+    if isinstance(data, list):
+        return [jsonb_ordered(item) for item in data]
+    return data
+
+
+def json_preview(data: Any) -> Tuple[Optional[int], Optional[list], Optional[str]]:
+    """在应用中计算 (键数/元素数, 顶层键, 文本预览)
+
+    键按 jsonb 的顺序排列，顶层键和文本预览与 PostgreSQL 生成列相同（重复的键在解析时已按最后一个保留）；
+    数字的文本形式可能不同，如 jsonb 把 1e3 存为 1000，json.dumps 输出 1000.0；
+    None 的预览为空，PostgreSQL 上 JSON null 的预览为 "null"（列表都显示为“无”）
+    """
+    if data is None:
+        return None, None, None
+    data = jsonb_ordered(data)
+    text = json.dumps(data, ensure_ascii=False)[: JSON_PREVIEW_LENGTH + 1]
+    if isinstance(data, dict):
+        return len(data), list(islice(data, JSON_PREVIEW_KEYS)), text
+    if isinstance(data, list):
+        return len(data), None, text
+    return None, None, text
+
+
+def json_preview_values(model, row: Mapping[str, Any]) -> Dict[str, Any]:
+    """row 中 JSON 字段对应的预览列值（用于不经过ORM的批量插入）"""
+    values = {}
+    for name in model.json_preview_fields:
+        if name in row:
+            count, keys, text = json_preview(row[name])
+            values.update(
+                {f"{name}_key_count": count, f"{name}_keys": keys, f"{name}_preview": text}
+            )
+    return values
+
+
+def json_previews_generated(dialect_name: str) -> bool:
+    """预览列是否由数据库生成（否则需要应用写入）"""
+    return dialect_name == "postgresql"
 
 
 class AuthStatusEnum(str, Enum):
@@ -47,11 +219,41 @@ class InfoStatusTypeEnum(int, Enum):
     PRIVATE = 1  # 私有
 
 
+def coerce_info_status(value: Any) -> int:
+    """info_status 输入值转换为整数：支持枚举、"PUBLIC"/"PRIVATE"（不区分大小写）和数字字符串，
+    无法识别的值视为私有"""
+    if isinstance(value, str):
+        upper = value.upper()
+        if upper == "PUBLIC":
+            return InfoStatusTypeEnum.PUBLIC.value
+        if upper == "PRIVATE":
+            return InfoStatusTypeEnum.PRIVATE.value
+        try:
+            return int(value)
+        except ValueError:
+            return InfoStatusTypeEnum.PRIVATE.value
+    if isinstance(value, InfoStatusTypeEnum):
+        return value.value
+    if isinstance(value, int):
+        return value
+    return InfoStatusTypeEnum.PRIVATE.value
+
+
 # FastAdmin需要的用户模型
 class User(Base):
     """用户表 - FastAdmin管理员用户"""
 
     __tablename__ = "users"
+    __table_args__ = (
+        # 增量同步按 (updated_at, id) 水位线排序和过滤
+        Index("ix_users_updated_at_id", "updated_at", "id"),
+        jsonb_path_index("ix_users_description_gin", "description"),
+    )
+    # 服务端默认值在 INSERT/UPDATE 时通过 RETURNING 取回，flush 后即可读取，无需再次查询
+    __mapper_args__ = {"eager_defaults": True}
+
+    # 有预览列的 JSON 字段
+    json_preview_fields = ("description",)
 
     # 使用 UUID 主键
     id: Mapped[int] = mapped_column(
@@ -69,7 +271,7 @@ class User(Base):
         nullable=False,
         index=True,
         comment="PP平台token",
-        default=lambda: str(uuid.uuid4()),
+        server_default=new_pp_token(),
     )
     hashed_password: Mapped[str] = mapped_column(
         String(255), nullable=False, default="default_password"
@@ -82,26 +284,21 @@ class User(Base):
         Text, nullable=True, comment="备注信息"
     )
     description: Mapped[Optional[dict]] = mapped_column(
-        JSONB, nullable=True, comment="补充信息"
-    )  # 使用JSONB类型存储结构化描述
+        JSONType, nullable=True, comment="补充信息"
+    )  # PostgreSQL 上使用JSONB类型存储结构化描述
+    description_key_count: Mapped[Optional[int]] = json_key_count_column("description", "补充信息")
+    description_keys: Mapped[Optional[list]] = json_keys_column("description", "补充信息")
+    description_preview: Mapped[Optional[str]] = json_preview_column("description", "补充信息")
     created_at: Mapped[datetime] = mapped_column(
-        DateTime,
-        default=lambda: datetime.now().replace(tzinfo=None),
-        comment="创建时间",
+        DateTime, server_default=local_now(), comment="创建时间"
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime,
-        default=lambda: datetime.now().replace(tzinfo=None),
-        onupdate=lambda: datetime.now().replace(tzinfo=None),
+        server_default=local_now(),
+        onupdate=local_now(),
         comment="更新时间",
     )
 
-    def __init__(self, **kwargs):
-        """初始化用户，自动生成pp_token"""
-        if "pp_token" not in kwargs or not kwargs["pp_token"]:
-            kwargs["pp_token"] = self.generate_pp_token()
-        super().__init__(**kwargs)
-
     @staticmethod
     def generate_pp_token() -> str:
         """生成PP平台token"""
@@ -121,14 +318,18 @@ class User(Base):
 
     def verify_password(self, password: str) -> bool:
         """验证密码"""
-        return bcrypt.checkpw(
-            password.encode("utf-8"), self.hashed_password.encode("utf-8")
-        )
+        with BCRYPT_SECONDS.time(op="verify"):
+            return bcrypt.checkpw(
+                password.encode("utf-8"), self.hashed_password.encode("utf-8")
+            )
 
     @staticmethod
     def hash_password(password: str) -> str:
         """加密密码"""
-        return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+        with BCRYPT_SECONDS.time(op="hash"):
+            return bcrypt.hashpw(
+                password.encode("utf-8"), bcrypt.gensalt()
+            ).decode("utf-8")
 
     def __str__(self):
         return self.username
@@ -138,6 +339,15 @@ class AuthCredentials(Base):
     """认证凭据表"""
 
     __tablename__ = "auth_credentials"
+    __table_args__ = (
+        # 增量同步按 (updated_at, id) 水位线排序和过滤
+        Index("ix_auth_credentials_updated_at_id", "updated_at", "id"),
+        jsonb_path_index("ix_auth_credentials_config_info_gin", "config_info"),
+        jsonb_path_index("ix_auth_credentials_description_gin", "description"),
+    )
+    __mapper_args__ = {"eager_defaults": True}
+
+    json_preview_fields = ("config_info", "description")
 
     # 使用 SQLAlchemy 2.0 风格的类型注解
     id: Mapped[int] = mapped_column(
@@ -157,18 +367,20 @@ class AuthCredentials(Base):
         comment="信息状态: 0-公开(public), 1-个人(single)",
     )
     config_info: Mapped[Optional[str]] = mapped_column(
-        JSONB, nullable=True, comment="配置信息"
+        JSONType, nullable=True, comment="配置信息"
     )
     description: Mapped[Optional[str]] = mapped_column(
-        JSONB, nullable=True, comment="补充信息"
+        JSONType, nullable=True, comment="补充信息"
     )  # 修正为字符串类型
-    created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=lambda: datetime.now().replace(tzinfo=None)
-    )
+    config_info_key_count: Mapped[Optional[int]] = json_key_count_column("config_info", "配置信息")
+    config_info_keys: Mapped[Optional[list]] = json_keys_column("config_info", "配置信息")
+    config_info_preview: Mapped[Optional[str]] = json_preview_column("config_info", "配置信息")
+    description_key_count: Mapped[Optional[int]] = json_key_count_column("description", "补充信息")
+    description_keys: Mapped[Optional[list]] = json_keys_column("description", "补充信息")
+    description_preview: Mapped[Optional[str]] = json_preview_column("description", "补充信息")
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=local_now())
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime,
-        default=lambda: datetime.now().replace(tzinfo=None),
-        onupdate=lambda: datetime.now().replace(tzinfo=None),
+        DateTime, server_default=local_now(), onupdate=local_now()
     )
 
     # 关联用户 - 使用整数外键
@@ -181,25 +393,19 @@ class AuthCredentials(Base):
 
     def __init__(self, **kwargs):
         """初始化认证凭据，根据info_status自动设置用户关联"""
+        super().__init__(**self.normalize_values(kwargs))
+
+    @classmethod
+    def normalize_values(cls, kwargs: dict) -> dict:
+        """规范化字段值（构造函数和批量插入共用）
+
+        - info_status 支持枚举、"PUBLIC"/"PRIVATE" 和数字字符串
+        - expires_at 带时区时转换为 UTC 并去掉时区信息
+        - 公开凭据清除用户关联，私有凭据可通过 current_user_id 指定用户
+        """
         # 处理info_status的类型转换
         if "info_status" in kwargs:
-            info_status = kwargs["info_status"]
-            if isinstance(info_status, str):
-                # 如果是字符串，尝试转换为枚举
-                if info_status.upper() == "PUBLIC":
-                    kwargs["info_status"] = InfoStatusTypeEnum.PUBLIC.value
-                elif info_status.upper() == "PRIVATE":
-                    kwargs["info_status"] = InfoStatusTypeEnum.PRIVATE.value
-                else:
-                    # 如果是数字字符串，转换为整数
-                    try:
-                        kwargs["info_status"] = int(info_status)
-                    except ValueError:
-                        kwargs["info_status"] = InfoStatusTypeEnum.PRIVATE.value
-            elif isinstance(info_status, InfoStatusTypeEnum):
-                kwargs["info_status"] = info_status.value
-            elif not isinstance(info_status, int):
-                kwargs["info_status"] = InfoStatusTypeEnum.PRIVATE.value
+            kwargs["info_status"] = coerce_info_status(kwargs["info_status"])
 
         # 处理时区问题 - 确保 expires_at 没有时区信息
         if "expires_at" in kwargs and kwargs["expires_at"] is not None:
@@ -226,24 +432,83 @@ class AuthCredentials(Base):
                     # 如果没有提供用户ID，保持为None（需要在业务逻辑中处理）
                     kwargs["user_id"] = None
 
-        super().__init__(**kwargs)
+        return kwargs
+
+    @classmethod
+    def normalize_columns(cls, columns: Mapping[str, Sequence[Any]]) -> Dict[str, list]:
+        """按列批量规范化字段值，结果与逐行调用 normalize_values 一致
+
+        columns 为 列名 -> 值序列（list、tuple 等，长度相同），每列整体处理一遍：
+        info_status 按不同的原始值缓存转换结果，expires_at 只转换带时区的值，
+        user_id 按规范化后的 info_status 和 current_user_id 列计算。
+        与构造函数相同，current_user_id 列只能用于全部为私有的凭据，否则抛出 TypeError
+        """
+        normalized = {name: list(values) for name, values in columns.items()}
+        lengths = {len(values) for values in normalized.values()}
+        if len(lengths) > 1:
+            raise ValueError("各列长度必须相同")
+        count = lengths.pop() if lengths else 0
+        current_user_ids = normalized.pop("current_user_id", None)
+
+        statuses = normalized.get("info_status")
+        if statuses is not None:
+            cache = {}
+
+            def coerce(value):
+                # 以 (类型, 值) 为键，True 和 1 分别缓存
+                try:
+                    return cache[value.__class__, value]
+                except KeyError:
+                    result = cache[value.__class__, value] = coerce_info_status(value)
+                    return result
+                except TypeError:  # 不可哈希的值
+                    return coerce_info_status(value)
+
+            statuses = normalized["info_status"] = [coerce(value) for value in statuses]
+
+        if "expires_at" in normalized:
+            normalized["expires_at"] = [
+                value.astimezone(timezone.utc).replace(tzinfo=None)
+                if isinstance(value, datetime) and value.tzinfo is not None
+                else value
+                for value in normalized["expires_at"]
+            ]
+
+        # 构造函数只为私有凭据使用 current_user_id，其他行会因多余的参数报错
+        private = InfoStatusTypeEnum.PRIVATE.value
+        if current_user_ids is not None and count:
+            if statuses is None or not all(status == private for status in statuses):
+                raise TypeError("current_user_id 只能用于私有凭据")
+
+        if statuses is not None:
+            if current_user_ids is not None:
+                normalized["user_id"] = current_user_ids
+            else:
+                public = InfoStatusTypeEnum.PUBLIC.value
+                user_ids = normalized.get("user_id") or [None] * count
+                normalized["user_id"] = [
+                    None if status == public else user_id
+                    for status, user_id in zip(statuses, user_ids)
+                ]
+        return normalized
+
+    @classmethod
+    def insert_batches(
+        cls, columns: Mapping[str, Sequence[Any]], batch_size: int = 5000
+    ) -> Iterator[List[dict]]:
+        """按列规范化后分批生成 Core insert(AuthCredentials) 的参数列表，不构造ORM对象"""
+        normalized = cls.normalize_columns(columns)
+        names = list(normalized)
+        rows = zip(*normalized.values())
+        while batch := list(islice(rows, batch_size)):
+            yield [dict(zip(names, row)) for row in batch]
 
     @property
     def info_status_enum(self) -> InfoStatusTypeEnum:
         """获取info_status的枚举值"""
         try:
-            if isinstance(self.info_status, int):
-                return InfoStatusTypeEnum(self.info_status)
-            elif isinstance(self.info_status, str):
-                if self.info_status.upper() == "PUBLIC":
-                    return InfoStatusTypeEnum.PUBLIC
-                elif self.info_status.upper() == "PRIVATE":
-                    return InfoStatusTypeEnum.PRIVATE
-                else:
-                    return InfoStatusTypeEnum(int(self.info_status))
-            else:
-                return InfoStatusTypeEnum.PRIVATE
-        except (ValueError, TypeError):
+            return InfoStatusTypeEnum(coerce_info_status(self.info_status))
+        except ValueError:
             return InfoStatusTypeEnum.PRIVATE
 
     def set_user_based_on_status(self, current_user_id: Optional[int] = None):
@@ -258,3 +523,123 @@ class AuthCredentials(Base):
 
     def __str__(self):
         return f"{self.info}"
+
+
+def fill_json_previews(mapper, connection, target):
+    """非 PostgreSQL 数据库在ORM写入前计算预览列（只计算新增或修改的 JSON 字段）"""
+    if json_previews_generated(connection.dialect.name):
+        return
+    state = inspect(target)
+    for name in target.json_preview_fields:
+        if state.key is None or state.attrs[name].history.has_changes():
+            count, keys, text = json_preview(getattr(target, name))
+            setattr(target, f"{name}_key_count", count)
+            setattr(target, f"{name}_keys", keys)
+            setattr(target, f"{name}_preview", text)
+
+
+for _model in (User, AuthCredentials):
+    event.listen(_model, "before_insert", fill_json_previews)
+    event.listen(_model, "before_update", fill_json_previews)
+
+
+class DeletedRecord(Base):
+    """删除记录（墓碑）表 - 供增量同步接口返回已删除（或对部分用户不再可见）的记录"""
+
+    __tablename__ = "deleted_records"
+    __table_args__ = (Index("ix_deleted_records_table_id", "table_name", "id"),)
+    __mapper_args__ = {"eager_defaults": True}
+
+    # SQLite 只有 INTEGER 主键才会自增
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True
+    )
+    table_name: Mapped[str] = mapped_column(String(50), nullable=False, comment="表名")
+    record_id: Mapped[int] = mapped_column(Integer, nullable=False, comment="被删除记录ID")
+    # 删除时的可见性信息，用于按用户权限过滤墓碑
+    info_status: Mapped[Optional[int]] = mapped_column(
+        Integer, nullable=True, comment="删除前的信息状态（仅认证凭据）"
+    )
+    user_id: Mapped[Optional[int]] = mapped_column(
+        Integer, nullable=True, comment="删除前的关联用户ID"
+    )
+    deleted_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        server_default=local_now(),
+        nullable=False,
+        index=True,
+        comment="删除时间",
+    )
+
+    @classmethod
+    def for_user(cls, user: "User") -> "DeletedRecord":
+        return cls(table_name=User.__tablename__, record_id=user.id, user_id=user.id)
+
+    @classmethod
+    def for_credential(cls, credential: AuthCredentials) -> "DeletedRecord":
+        return cls(
+            table_name=AuthCredentials.__tablename__,
+            record_id=credential.id,
+            info_status=credential.info_status,
+            user_id=credential.user_id,
+        )
+
+
+def record_visibility_change(mapper, connection, target):
+    """凭据的可见性（info_status、user_id）改变时，按修改前的值写入删除记录，
+    失去可见性的同步客户端据此删除本地缓存（仍然可见的客户端由同步接口过滤掉该记录）"""
+    state = inspect(target)
+    previous = []
+    for name in ("info_status", "user_id"):
+        history = state.attrs[name].history
+        previous.append(history.deleted[0] if history.deleted else getattr(target, name))
+    if previous[0] is not None:
+        previous[0] = coerce_info_status(previous[0])
+
+    current = (coerce_info_status(target.info_status), target.user_id)
+    # 改为公开后所有用户都可见，不会有客户端失去可见性
+    if tuple(previous) == current or current[0] == InfoStatusTypeEnum.PUBLIC.value:
+        return
+    # flush 过程中不能向会话添加对象，直接在同一连接（同一事务）中插入
+    connection.execute(
+        insert(DeletedRecord).values(
+            table_name=AuthCredentials.__tablename__,
+            record_id=target.id,
+            info_status=previous[0],
+            user_id=previous[1],
+        )
+    )
+
+
+event.listen(AuthCredentials, "before_update", record_visibility_change)
+
+
+class RecordCount(Base):
+    """记录数计数表 - 由数据库触发器维护（见 db/counters.py），计数查询汇总少量行代替 count(*)
+
+    认证凭据按 (info_status, user_id) 分组，每组一行；用户表只有一行总数
+    """
+
+    __tablename__ = "record_counts"
+
+    table_name: Mapped[str] = mapped_column(String(50), primary_key=True, comment="表名")
+    info_status: Mapped[int] = mapped_column(
+        Integer, primary_key=True, default=0, comment="信息状态（仅认证凭据，其他表为 0）"
+    )
+    user_id: Mapped[int] = mapped_column(
+        Integer, primary_key=True, default=0, comment="关联用户ID（未关联用户为 0）"
+    )
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, comment="行数")
+
+
+class PartitionDetachment(Base):
+    """分区分离记录 - 已开始分离、尚未写入删除记录和扣减计数的凭据月份分区（见 db/partitioning.py），
+    处理完成时在同一事务中删除，中断后重新执行分离会继续处理
+    """
+
+    __tablename__ = "partition_detachments"
+
+    partition_name: Mapped[str] = mapped_column(String(63), primary_key=True, comment="分区名")
+    started_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=local_now(), nullable=False, comment="开始分离时间"
+    )
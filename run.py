@@ -2,6 +2,7 @@
 SQLAdmin 应用启动脚本
 """
 
+import argparse
 import os
 import sys
 import subprocess
@@ -26,12 +27,12 @@ def check_dependencies():
 
 
 def check_database():
-    """检查数据库连接"""
+    """检查数据库连接（只执行 SELECT 1）"""
     try:
-        from base import DATABASE_URL, postgres_engine_2
+        from base import get_engine
         from sqlalchemy import text
 
-        with postgres_engine_2.connect() as conn:
+        with get_engine().connect() as conn:
             conn.execute(text("SELECT 1"))
         print("✓ 数据库连接正常")
         return True
@@ -42,19 +43,26 @@ def check_database():
 
 
 def check_tables():
-    """检查数据库表是否存在"""
+    """检查数据库表是否存在（一次系统目录查询，不扫描表数据）"""
     try:
-        from base import postgres_engine_2
-        from models.auth_model import User
-        from sqlalchemy.orm import sessionmaker
-
-        Session = sessionmaker(bind=postgres_engine_2)
-        session = Session()
-
-        user_count = session.query(User).count()
-        session.close()
-
-        print(f"✓ 数据库表存在，用户数量: {user_count}")
+        from base import Base, get_engine
+        from sqlalchemy import inspect
+        import models.auth_model  # noqa: F401  注册模型表结构
+
+        existing = set(inspect(get_engine()).get_table_names())
+        missing = [name for name in Base.metadata.tables if name not in existing]
+
+        if models.auth_model.User.__tablename__ in missing:
+            print(f"✗ 数据库表不存在: {', '.join(missing)}")
+            print("请运行: python init_db.py")
+            return False
+
+        if missing:
+            # 已有数据的数据库缺少新增的表，升级即可，不需要重新初始化
+            print(f"! 缺少新增的数据库表: {', '.join(missing)}")
+            print("请运行: python init_db.py upgrade")
+        else:
+            print("✓ 数据库表存在")
         return True
     except Exception as e:
         print(f"✗ 数据库表不存在或有问题: {e}")
@@ -62,18 +70,28 @@ def check_tables():
         return False
 
 
-def start_server(host="127.0.0.1", port=8000, reload=True):
-    """启动服务器"""
+def server_implementations():
+    """uvicorn 的 loop=auto / http=auto 实际选用的实现（已安装 uvloop / httptools 时优先使用）"""
+    from importlib.util import find_spec
+
+    loop = "uvloop" if find_spec("uvloop") else "asyncio"
+    http = "httptools" if find_spec("httptools") else "h11"
+    return loop, http
+
+
+def start_server(host="127.0.0.1", port=8000, reload=True, open_browser=True):
+    """启动服务器（开发模式：单进程，可热重载）"""
     print(f"启动SQLAdmin管理系统...")
     print(f"服务器地址: http://{host}:{port}")
     print(f"管理界面: http://{host}:{port}/admin")
     print("按 Ctrl+C 停止服务器")
 
     # 自动打开浏览器
-    try:
-        webbrowser.open(f"http://{host}:{port}/admin")
-    except:
-        pass
+    if open_browser:
+        try:
+            webbrowser.open(f"http://{host}:{port}/admin")
+        except:
+            pass
 
     # 启动uvicorn服务器
     import uvicorn
@@ -81,8 +99,75 @@ def start_server(host="127.0.0.1", port=8000, reload=True):
     uvicorn.run("main:app", host=host, port=port, reload=reload, log_level="info")
 
 
+def start_production_server(
+    host,
+    port,
+    workers=None,
+    backlog=None,
+    keep_alive=None,
+    graceful_timeout=None,
+):
+    """
+    启动生产服务器：多个 worker 进程共享监听端口，互不共享状态
+    （每个 worker 独立创建引擎和连接池，并在 lifespan 中预热）。
+    收到 SIGTERM/SIGINT 后停止接收新连接，等待进行中的请求完成（最长 graceful_timeout 秒）再退出
+    """
+    import uvicorn
+    from config import settings
+
+    workers = workers or settings.workers or os.cpu_count() or 1
+    loop, http = server_implementations()
+    print(f"启动SQLAdmin管理系统（生产模式）: http://{host}:{port}")
+    print(f"worker 进程: {workers}，事件循环: {loop}，HTTP 解析: {http}")
+
+    if workers > 1 and settings.events_backend == "memory":
+        # 进程内事件总线只能推送到同一 worker 的订阅者；指标也按 worker 分别统计
+        print("! EVENTS_BACKEND=memory 时凭据变更事件只在单个 worker 内推送，多 worker 请使用 postgres")
+
+    uvicorn.run(
+        "main:app",
+        host=host,
+        port=port,
+        workers=workers,
+        loop="auto",
+        http="auto",
+        backlog=backlog or settings.server_backlog,
+        timeout_keep_alive=keep_alive or settings.server_keep_alive_seconds,
+        timeout_graceful_shutdown=graceful_timeout
+        or settings.server_graceful_shutdown_seconds,
+        limit_max_requests=settings.server_limit_max_requests,
+        access_log=False,
+        log_level=settings.log_level.lower(),
+    )
+
+
+def parse_args(argv=None):
+    from config import settings
+
+    parser = argparse.ArgumentParser(description="SQLAdmin 管理系统启动脚本")
+    parser.add_argument("--host", default=settings.host, help="监听地址")
+    parser.add_argument("--port", type=int, default=settings.port, help="监听端口")
+    parser.add_argument("--no-reload", action="store_true", help="开发模式下关闭热重载")
+    parser.add_argument("--no-browser", action="store_true", help="不自动打开浏览器")
+    parser.add_argument(
+        "--prod",
+        action="store_true",
+        default=settings.server_mode == "prod",
+        help="生产模式：多 worker、无热重载（也可设置 SERVER_MODE=prod）",
+    )
+    parser.add_argument("--workers", type=int, help="生产模式 worker 进程数（默认 CPU 核数）")
+    parser.add_argument("--backlog", type=int, help="监听队列长度")
+    parser.add_argument("--keep-alive", type=int, help="HTTP keep-alive 超时（秒）")
+    parser.add_argument(
+        "--graceful-timeout", type=int, help="停止时等待进行中请求完成的最长时间（秒）"
+    )
+    return parser.parse_args(argv)
+
+
 def main():
     """主函数"""
+    args = parse_args()
+
     print("SQLAdmin 管理系统启动检查")
     print("=" * 50)
 
@@ -96,6 +181,9 @@ def main():
 
     # 检查数据库表
     if not check_tables():
+        if args.prod:
+            # 生产模式不交互初始化数据库
+            sys.exit(1)
         response = input("是否要初始化数据库? (y/n): ")
         if response.lower() == "y":
             print("正在初始化数据库...")
@@ -110,30 +198,28 @@ def main():
         else:
             return
 
-    print("\n" + "=" * 50)
-    print("所有检查通过，启动服务器...")
+    # 释放检查使用的连接（服务器在子进程中运行，worker 各自创建连接池）
+    from base import get_engine
 
-    # 获取启动参数
-    host = "127.0.0.1"
-    port = 8000
-    reload = True
+    get_engine().dispose()
 
-    if len(sys.argv) > 1:
-        if "--host" in sys.argv:
-            host_index = sys.argv.index("--host") + 1
-            if host_index < len(sys.argv):
-                host = sys.argv[host_index]
-
-        if "--port" in sys.argv:
-            port_index = sys.argv.index("--port") + 1
-            if port_index < len(sys.argv):
-                port = int(sys.argv[port_index])
-
-        if "--no-reload" in sys.argv:
-            reload = False
+    print("\n" + "=" * 50)
+    print("所有检查通过，启动服务器...")
 
     # 启动服务器
-    start_server(host, port, reload)
+    if args.prod:
+        start_production_server(
+            args.host,
+            args.port,
+            workers=args.workers,
+            backlog=args.backlog,
+            keep_alive=args.keep_alive,
+            graceful_timeout=args.graceful_timeout,
+        )
+    else:
+        start_server(
+            args.host, args.port, not args.no_reload, open_browser=not args.no_browser
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,144 @@
+"""
+API 响应模型与快速JSON响应
+
+响应模型使用数据类：既作为 FastAPI 的 response_model 生成接口文档，
+又可由 orjson 原生序列化（包括 datetime），路由直接返回 FastJSONResponse，
+跳过 jsonable_encoder 的递归遍历。
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union
+
+import orjson
+from pydantic import BaseModel, Field, field_validator
+from starlette.responses import JSONResponse
+
+from config import settings
+from models.auth_model import InfoStatusTypeEnum
+
+
+class FastJSONResponse(JSONResponse):
+    """基于 orjson 的JSON响应"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+@dataclass
+class PermissionFlags:
+    """当前用户权限标记"""
+
+    can_see_all_users: bool
+    can_create_users: bool
+    can_see_all_credentials: bool
+    can_create_public_credentials: bool
+
+
+@dataclass
+class UserProfile:
+    """当前用户信息"""
+
+    id: int
+    username: str
+    email: str
+    is_superuser: bool
+    is_active: bool
+    created_at: Optional[datetime]
+    permissions: PermissionFlags
+
+
+@dataclass
+class CountResult:
+    """计数结果"""
+
+    count: int
+    is_filtered: bool
+
+
+@dataclass
+class CredentialItem:
+    """认证凭据列表项"""
+
+    id: int
+    info: Optional[str]
+    expires_at: Optional[datetime]
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+    can_edit: bool
+    can_delete: bool
+
+
+@dataclass
+class CredentialBatchResult:
+    """批量查询结果：missing 包含不存在和无权查看的ID（不区分，避免泄露存在性）"""
+
+    items: List[CredentialItem]
+    missing: List[int]
+
+
+@dataclass
+class SyncPage:
+    """增量同步结果：changes 为变更后的完整记录，deleted 为已删除的记录ID"""
+
+    changes: List[Dict[str, Any]]
+    deleted: List[int]
+    next_cursor: str
+    has_more: bool
+
+
+# 凭据列表查询只读取这些列，按 CredentialItem 字段顺序排列
+CREDENTIAL_ITEM_COLUMNS = ("id", "info", "expires_at", "created_at", "updated_at")
+
+
+# 请求模型（pydantic 负责校验请求体）
+class CredentialBatchGetRequest(BaseModel):
+    """批量查询认证凭据"""
+
+    ids: List[int] = Field(..., min_length=1, max_length=settings.api_batch_max_size)
+
+
+class CredentialCreate(BaseModel):
+    """创建认证凭据（字段规则与管理界面表单一致）"""
+
+    info: Optional[str] = Field(None, max_length=100)
+    info_status: Union[int, str] = InfoStatusTypeEnum.PRIVATE.value
+    user_id: Optional[int] = None
+    expires_at: Optional[datetime] = None
+    config_info: Optional[Any] = None
+    description: Optional[Any] = None
+
+    @field_validator("info_status")
+    @classmethod
+    def check_info_status(cls, value: Union[int, str]) -> int:
+        """只接受 InfoStatusTypeEnum 的值：0/1、对应的数字字符串或 "PUBLIC"/"PRIVATE"（不区分大小写）；
+        其他值的凭据对普通用户不可见，按用户分区时还会落入默认分区"""
+        if isinstance(value, str) and value.upper() in InfoStatusTypeEnum.__members__:
+            return InfoStatusTypeEnum[value.upper()].value
+        try:
+            return InfoStatusTypeEnum(int(value)).value
+        except ValueError:
+            raise ValueError("info_status 只能为 0（公开）或 1（私有）") from None
+
+
+class CredentialBatchCreateRequest(BaseModel):
+    """批量创建认证凭据"""
+
+    items: List[CredentialCreate] = Field(
+        ..., min_length=1, max_length=settings.api_batch_max_size
+    )
+
+
+__all__ = [
+    "FastJSONResponse",
+    "PermissionFlags",
+    "UserProfile",
+    "CountResult",
+    "CredentialItem",
+    "CredentialBatchResult",
+    "SyncPage",
+    "CREDENTIAL_ITEM_COLUMNS",
+    "CredentialBatchGetRequest",
+    "CredentialCreate",
+    "CredentialBatchCreateRequest",
+]
@@ -0,0 +1,385 @@
+"""
+认证凭据变更事件总线
+
+管理界面钩子和 API 在凭据增删改后发布事件，订阅者（SSE 连接）按自己的可见性接收：
+- 每个订阅者一个有界队列，消费过慢导致队列写满时发送 overflow 事件并断开，
+  客户端携带 Last-Event-ID 重连后从环形缓冲区补发
+- 默认只在进程内分发，事件ID基于发布时间（微秒）单调递增（进程重启后仍然递增）
+- EVENTS_BACKEND=postgres 时通过 LISTEN/NOTIFY 在多个 worker 间广播，事件ID由数据库序列在发送通知的
+  事务中分配，咨询锁使ID顺序与提交顺序（即通知投递顺序）一致，客户端重连到任意 worker 都能按ID补发；
+  监听连接断开后自动重连，期间漏收的事件无法补发，订阅者收到 reset 事件
+
+所有方法都需要在事件循环线程中调用（SQLAdmin 的同步模式也会在事件循环中执行 after_* 钩子）
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+import orjson
+from sqlalchemy import text
+
+from config import settings
+from auth.permissions import can_view_credential
+
+logger = logging.getLogger(__name__)
+
+# 推送给客户端的凭据字段
+EVENT_FIELDS = (
+    "id",
+    "info",
+    "info_status",
+    "user_id",
+    "expires_at",
+    "created_at",
+    "updated_at",
+)
+
+# 队列溢出时发送的帧，客户端收到后应携带 Last-Event-ID 重连
+OVERFLOW_FRAME = b"event: overflow\ndata: {}\n\n"
+
+
+def credential_snapshot(credential: Any) -> Dict[str, Any]:
+    """从ORM对象或查询行中提取推送字段"""
+    return {name: getattr(credential, name) for name in EVENT_FIELDS}
+
+
+def format_sse(event_id: int, event_type: str, data: bytes) -> bytes:
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (event_id, event_type.encode(), data)
+
+
+@dataclass
+class CredentialEvent:
+    """凭据变更事件"""
+
+    id: int
+    type: str  # insert / update / delete
+    data: Dict[str, Any]
+    previous: Optional[Tuple[int, Optional[int]]] = None  # 更新前的 (info_status, user_id)
+    _frame: Optional[bytes] = None
+    _revoke_frame: Optional[bytes] = None
+
+    @property
+    def credential_id(self) -> int:
+        return self.data["id"]
+
+    def frame(self) -> bytes:
+        """SSE 帧（所有订阅者共用，只序列化一次）"""
+        if self._frame is None:
+            self._frame = format_sse(self.id, self.type, orjson.dumps(self.data))
+        return self._frame
+
+    def revoke_frame(self) -> bytes:
+        """更新后对订阅者不再可见：以 delete 事件通知客户端移除"""
+        if self._revoke_frame is None:
+            data = orjson.dumps({"id": self.credential_id})
+            self._revoke_frame = format_sse(self.id, "delete", data)
+        return self._revoke_frame
+
+    def to_payload(self) -> str:
+        return orjson.dumps(
+            {"id": self.id, "type": self.type, "data": self.data, "previous": self.previous}
+        ).decode("utf-8")
+
+    @classmethod
+    def from_payload(cls, payload: str) -> "CredentialEvent":
+        message = orjson.loads(payload)
+        previous = message.get("previous")
+        return cls(
+            id=message["id"],
+            type=message["type"],
+            data=message["data"],
+            previous=tuple(previous) if previous else None,
+        )
+
+
+class Subscription:
+    """单个订阅者（一个 SSE 连接）"""
+
+    def __init__(self, user, queue_size: int):
+        self.user = user
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+    def frame_for(self, event: CredentialEvent) -> Optional[bytes]:
+        """按订阅者的可见性返回要发送的帧，不可见时返回 None"""
+        data = event.data
+        if can_view_credential(self.user, data["info_status"], data["user_id"]):
+            return event.frame()
+        if event.previous and can_view_credential(self.user, *event.previous):
+            return event.revoke_frame()
+        return None
+
+    def offer(self, event: CredentialEvent) -> None:
+        frame = self.frame_for(event)
+        if frame is not None:
+            self.put(frame)
+
+    def put(self, frame: bytes) -> None:
+        if self.overflowed:
+            return
+
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            # 慢消费者：丢弃积压并通知断开，由客户端重连补发，避免无限占用内存
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(OVERFLOW_FRAME)
+
+
+class PostgresNotifyBridge:
+    """通过 Postgres LISTEN/NOTIFY 在多个 worker 之间广播事件
+
+    监听连接从异步引擎连接池中长期占用一个连接，后台任务定期检查，断开后按指数退避重连
+    """
+
+    CHANNEL = "credential_events"
+    SEQUENCE = "credential_event_ids"
+    MAX_RECONNECT_DELAY = 30.0
+
+    def __init__(self, bus: "CredentialEventBus", engine):
+        self.bus = bus
+        self.engine = engine
+        self._conn = None
+        self._driver_connection = None
+        self._lost = asyncio.Event()
+        self._watch_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        async with self.engine.begin() as conn:
+            # 多个 worker 同时启动时串行创建序列
+            await self._lock(conn)
+            await conn.execute(text(f"CREATE SEQUENCE IF NOT EXISTS {self.SEQUENCE}"))
+        await self._listen()
+        self._watch_task = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            self._watch_task = None
+        await self._close()
+
+    async def _lock(self, conn) -> None:
+        await conn.execute(
+            text("SELECT pg_advisory_xact_lock(hashtext(:channel))"), {"channel": self.CHANNEL}
+        )
+
+    async def _listen(self) -> None:
+        self._lost.clear()
+        self._conn = await self.engine.connect()
+        raw = await self._conn.get_raw_connection()
+        self._driver_connection = raw.driver_connection
+        self._driver_connection.add_termination_listener(self._on_terminate)
+        await self._driver_connection.add_listener(self.CHANNEL, self._on_notify)
+        # 开始监听之后读取序列：之后分配的ID都会收到，之前的事件只能从缓冲区补发
+        last_id = await self._driver_connection.fetchval(
+            f"SELECT CASE WHEN is_called THEN last_value ELSE 0 END FROM {self.SEQUENCE}"
+        )
+        self.bus.resync(last_id)
+        logger.info(f"已监听凭据变更通知频道: {self.CHANNEL}")
+
+    async def _close(self) -> None:
+        if self._conn is None:
+            return
+        conn, self._conn = self._conn, None
+        # 连接归还连接池后不再影响本监听
+        self._driver_connection.remove_termination_listener(self._on_terminate)
+        try:
+            if not self._driver_connection.is_closed():
+                await self._driver_connection.remove_listener(self.CHANNEL, self._on_notify)
+            await conn.close()
+        except Exception:
+            # 连接已断开，从连接池中作废
+            await conn.invalidate()
+
+    async def _watch(self) -> None:
+        """后台检查监听连接（应用生命周期内运行）"""
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._lost.wait(), timeout=settings.events_listen_check_interval
+                )
+            except asyncio.TimeoutError:
+                try:
+                    await self._driver_connection.fetchval(
+                        "SELECT 1", timeout=settings.health_check_timeout
+                    )
+                    continue
+                except Exception as e:
+                    logger.warning(f"凭据变更监听连接检查失败: {e}")
+            await self._reconnect()
+
+    async def _reconnect(self) -> None:
+        delay = 1.0
+        while True:
+            await self._close()
+            try:
+                await self._listen()
+                return
+            except Exception as e:
+                logger.error(f"凭据变更监听连接重连失败（{delay:.0f} 秒后重试）: {e}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.MAX_RECONNECT_DELAY)
+
+    def _on_terminate(self, connection) -> None:
+        self._lost.set()
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        try:
+            self.bus.dispatch(CredentialEvent.from_payload(payload))
+        except Exception as e:
+            logger.error(f"凭据变更通知解析失败: {e}")
+
+    async def send(self, events: List[CredentialEvent]) -> None:
+        """分配事件ID并在同一事务中发送多条通知（提交时一起投递）"""
+        async with self.engine.begin() as conn:
+            # 事务级咨询锁使各 worker 的发送串行化，ID顺序与提交顺序一致
+            await self._lock(conn)
+            ids = (
+                await conn.execute(
+                    text(f"SELECT nextval('{self.SEQUENCE}') FROM generate_series(1, :count)"),
+                    {"count": len(events)},
+                )
+            ).scalars().all()
+            for event, event_id in zip(events, sorted(ids)):
+                event.id = event_id
+                await conn.execute(
+                    text("SELECT pg_notify(:channel, :payload)"),
+                    {"channel": self.CHANNEL, "payload": event.to_payload()},
+                )
+
+
+class CredentialEventBus:
+    """进程内发布/订阅总线"""
+
+    def __init__(self, replay_size: int = None, queue_size: int = None):
+        self.queue_size = settings.events_queue_size if queue_size is None else queue_size
+        self._history: Deque[CredentialEvent] = deque(
+            maxlen=settings.events_replay_size if replay_size is None else replay_size
+        )
+        self._subscribers: Set[Subscription] = set()
+        self._last_id = 0
+        # 早于该ID的事件已不在缓冲区中（进程启动前的事件或被淘汰的事件）
+        self._history_floor = self._next_id()
+        self.bridge: Optional[PostgresNotifyBridge] = None
+
+    def _next_id(self) -> int:
+        self._last_id = max(time.time_ns() // 1000, self._last_id + 1)
+        return self._last_id
+
+    async def start(self) -> None:
+        """应用启动时调用：按配置启用 LISTEN/NOTIFY 桥接"""
+        if settings.events_backend == "postgres" and self.bridge is None:
+            from base import get_async_engine
+
+            # 事件ID改由数据库序列分配
+            self._last_id = self._history_floor = 0
+            self.bridge = PostgresNotifyBridge(self, get_async_engine())
+            await self.bridge.start()
+
+    async def stop(self) -> None:
+        if self.bridge is not None:
+            await self.bridge.stop()
+            self.bridge = None
+
+    async def publish(
+        self,
+        event_type: str,
+        credential: Any,
+        previous: Optional[Tuple[int, Optional[int]]] = None,
+    ) -> None:
+        """发布单个凭据变更事件"""
+        await self.publish_many(event_type, [credential], previous)
+
+    async def publish_many(
+        self,
+        event_type: str,
+        credentials: Iterable[Any],
+        previous: Optional[Tuple[int, Optional[int]]] = None,
+    ) -> None:
+        """发布一组凭据变更事件，发布失败只记录日志，不影响业务操作"""
+        events = [
+            CredentialEvent(
+                id=0,
+                type=event_type,
+                data=credential_snapshot(credential),
+                previous=previous,
+            )
+            for credential in credentials
+        ]
+        if self.bridge is not None:
+            try:
+                # 本进程也通过 LISTEN 收到事件，保证各 worker 顺序一致
+                await self.bridge.send(events)
+            except Exception as e:
+                # 没有数据库分配的ID无法与其他事件排序，本进程的订阅者改为重新拉取
+                logger.error(f"凭据变更通知发送失败: {e}")
+                self.reset_subscribers()
+            return
+
+        for event in events:
+            event.id = self._next_id()
+            self.dispatch(event)
+
+    def dispatch(self, event: CredentialEvent) -> None:
+        """分发事件到所有订阅者并写入重放缓冲区"""
+        self._last_id = max(self._last_id, event.id)
+        if len(self._history) == self._history.maxlen:
+            self._history_floor = self._history[0].id
+        self._history.append(event)
+        for subscription in self._subscribers:
+            subscription.offer(event)
+
+    def resync(self, last_id: int) -> None:
+        """（重新）开始监听时调用，last_id 为当时数据库已分配的最大事件ID：
+        不超过该ID的事件不保证收到，补发时视为缓冲区不完整；监听中断期间有新事件时通知订阅者重新拉取"""
+        missed = last_id > self._last_id
+        self._history_floor = max(self._history_floor, last_id)
+        self._last_id = max(self._last_id, last_id)
+        if missed:
+            self.reset_subscribers()
+
+    def reset_subscribers(self) -> None:
+        """通知所有订阅者重新拉取全量数据"""
+        frame = format_sse(self._last_id, "reset", b"{}")
+        for subscription in self._subscribers:
+            subscription.put(frame)
+
+    def subscribe(self, user, last_event_id: Optional[int] = None) -> Subscription:
+        """新增订阅者；提供 last_event_id 时补发之后的事件，
+        无法完整补发时发送 reset 事件，客户端应重新拉取全量数据"""
+        subscription = Subscription(user, self.queue_size)
+        if last_event_id is not None:
+            frames = [
+                frame
+                for frame in (
+                    subscription.frame_for(event)
+                    for event in self._history
+                    if event.id > last_event_id
+                )
+                if frame is not None
+            ]
+            if last_event_id < self._history_floor or len(frames) >= self.queue_size:
+                # 缓冲区不完整或积压超过队列容量（补发后会立即溢出）
+                subscription.queue.put_nowait(format_sse(self._last_id, "reset", b"{}"))
+            else:
+                for frame in frames:
+                    subscription.queue.put_nowait(frame)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+
+# 全局事件总线
+credential_events = CredentialEventBus()
@@ -0,0 +1,294 @@
+"""
+静态资源服务 - 内容指纹 + 预压缩
+
+启动时读取静态目录下的所有文件，按内容哈希生成指纹化URL（如 custom.3f2a9c1d7b4e.css），
+并预先生成 gzip / brotli 压缩版本（按内容哈希缓存到磁盘，可在构建时运行
+`python static_assets.py` 预先生成，避免每个 worker 启动时重复压缩）：
+- 指纹化URL返回 Cache-Control: immutable，重复访问不再请求
+- 普通URL返回 no-cache + ETag，重复访问只需 304 校验
+- 按 Accept-Encoding 直接返回预压缩内容，不在请求时压缩
+"""
+
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import jinja2
+from starlette.datastructures import Headers
+from starlette.responses import PlainTextResponse, Response
+from starlette.routing import Mount
+from starlette.types import Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli 为可选依赖
+    brotli = None
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# 已经是压缩格式的文件不再预压缩
+INCOMPRESSIBLE_SUFFIXES = (
+    ".woff",
+    ".woff2",
+    ".png",
+    ".jpg",
+    ".jpeg",
+    ".gif",
+    ".webp",
+    ".ico",
+    ".gz",
+    ".br",
+    ".zip",
+)
+
+# 预压缩的最小文件大小（字节）
+PRECOMPRESS_MINIMUM_SIZE = 256
+
+FINGERPRINT_LENGTH = 12
+
+# 项目静态资源目录
+STATIC_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+
+@dataclass
+class StaticAsset:
+    """单个静态资源及其预压缩版本"""
+
+    path: str
+    fingerprinted_path: str
+    content_type: str
+    etag: str
+    content: bytes
+    digest: str
+    encoded: Dict[str, bytes] = field(default_factory=dict)
+
+    def select_encoding(self, accept_encoding: str) -> Optional[str]:
+        """根据 Accept-Encoding 选择预压缩版本（优先 brotli）"""
+        for encoding in ("br", "gzip"):
+            if encoding in self.encoded and encoding in accept_encoding:
+                return encoding
+        return None
+
+
+def fingerprint_path(path: str, digest: str) -> str:
+    """在扩展名前插入内容哈希：css/main.css -> css/main.<hash>.css"""
+    root, ext = os.path.splitext(path)
+    return f"{root}.{digest}{ext}"
+
+
+class FingerprintedStaticFiles:
+    """带内容指纹和预压缩的静态文件 ASGI 应用"""
+
+    def __init__(
+        self,
+        directory: str,
+        max_age: int = None,
+        brotli_quality: int = None,
+        precompress: bool = None,
+        cache_dir: Optional[str] = None,
+    ) -> None:
+        self.directory = directory
+        self.cache_dir = settings.static_cache_dir if cache_dir is None else cache_dir
+        self.max_age = settings.static_max_age if max_age is None else max_age
+        self.brotli_quality = (
+            settings.static_brotli_quality if brotli_quality is None else brotli_quality
+        )
+        self.precompress_enabled = (
+            settings.static_precompress if precompress is None else precompress
+        )
+        self.assets: Dict[str, StaticAsset] = {}
+        self.fingerprinted: Dict[str, StaticAsset] = {}
+        self._compressed = False
+        self._scan()
+
+    def _scan(self) -> None:
+        """读取目录下所有文件并计算指纹（开销很小，只做哈希）"""
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                full_path = os.path.join(root, name)
+                path = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+                with open(full_path, "rb") as f:
+                    content = f.read()
+                digest = hashlib.sha256(content).hexdigest()[:FINGERPRINT_LENGTH]
+                content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+                if content_type.startswith("text/") or content_type in (
+                    "application/javascript",
+                    "application/json",
+                ):
+                    content_type += "; charset=utf-8"
+                asset = StaticAsset(
+                    path=path,
+                    fingerprinted_path=fingerprint_path(path, digest),
+                    content_type=content_type,
+                    etag=f'"{digest}"',
+                    content=content,
+                    digest=digest,
+                )
+                self.assets[path] = asset
+                self.fingerprinted[asset.fingerprinted_path] = asset
+
+    def precompress(self) -> None:
+        """预先生成 gzip / brotli 版本（应用启动时调用一次）"""
+        if self._compressed or not self.precompress_enabled:
+            return
+
+        original_size = compressed_size = 0
+        for asset in self.assets.values():
+            if (
+                asset.path.lower().endswith(INCOMPRESSIBLE_SUFFIXES)
+                or len(asset.content) < PRECOMPRESS_MINIMUM_SIZE
+            ):
+                continue
+            asset.encoded["gzip"] = self._load_or_compress(
+                f"{asset.digest}.gz",
+                lambda: gzip.compress(asset.content, compresslevel=9, mtime=0),
+            )
+            if brotli is not None:
+                asset.encoded["br"] = self._load_or_compress(
+                    f"{asset.digest}.q{self.brotli_quality}.br",
+                    lambda: brotli.compress(asset.content, quality=self.brotli_quality),
+                )
+            original_size += len(asset.content)
+            compressed_size += min(len(data) for data in asset.encoded.values())
+
+        self._compressed = True
+        logger.info(
+            f"静态资源预压缩完成: {self.directory} "
+            f"{original_size // 1024}KiB -> {compressed_size // 1024}KiB"
+        )
+
+    def _load_or_compress(self, cache_name: str, compress: Callable[[], bytes]) -> bytes:
+        """优先读取磁盘缓存的压缩结果，不存在时压缩并写入缓存"""
+        if not self.cache_dir:
+            return compress()
+
+        cache_path = os.path.join(self.cache_dir, cache_name)
+        try:
+            with open(cache_path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            pass
+
+        data = compress()
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # 先写临时文件再改名，避免多个 worker 同时启动时读到不完整的文件
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"静态资源压缩缓存写入失败: {e}")
+        return data
+
+    def url_path(self, path: str) -> str:
+        """返回资源的指纹化相对路径，未知资源原样返回"""
+        asset = self.assets.get(path.lstrip("/"))
+        return asset.fingerprinted_path if asset else path
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["method"] not in ("GET", "HEAD"):
+            response = PlainTextResponse("Method Not Allowed", status_code=405)
+            await response(scope, receive, send)
+            return
+
+        path = scope["path"]
+        root_path = scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            # 新版 Starlette 挂载时保留完整路径，需去掉挂载前缀
+            path = path[len(root_path) :]
+        path = path.lstrip("/")
+
+        asset = self.fingerprinted.get(path)
+        immutable = asset is not None
+        if asset is None:
+            asset = self.assets.get(path)
+        if asset is None:
+            await PlainTextResponse("Not Found", status_code=404)(scope, receive, send)
+            return
+
+        if not self._compressed:
+            self.precompress()
+
+        request_headers = Headers(scope=scope)
+        headers = {
+            "etag": asset.etag,
+            "vary": "Accept-Encoding",
+            "cache-control": (
+                f"public, max-age={self.max_age}, immutable" if immutable else "no-cache"
+            ),
+        }
+
+        if asset.etag in request_headers.get("if-none-match", ""):
+            await Response(status_code=304, headers=headers)(scope, receive, send)
+            return
+
+        encoding = asset.select_encoding(request_headers.get("accept-encoding", ""))
+        if encoding:
+            headers["content-encoding"] = encoding
+            body = asset.encoded[encoding]
+        else:
+            body = asset.content
+
+        if scope["method"] == "HEAD":
+            headers["content-length"] = str(len(body))
+            body = b""
+
+        response = Response(body, headers=headers, media_type=asset.content_type)
+        await response(scope, receive, send)
+
+
+def admin_statics_directory() -> str:
+    """SQLAdmin 自带静态资源目录"""
+    import sqladmin
+
+    return os.path.join(os.path.dirname(sqladmin.__file__), "statics")
+
+
+def install_static_assets(
+    app, admin, directory: str = STATIC_DIRECTORY
+) -> List[FingerprintedStaticFiles]:
+    """挂载项目静态资源，并替换 SQLAdmin 自带静态资源的服务方式
+
+    - /static 提供项目静态文件，模板中可用 static_url('custom.css') 获取指纹化URL
+    - SQLAdmin 的 /admin/statics 改用指纹化服务，模板中的 url_for('admin:statics', ...)
+      自动生成指纹化URL
+
+    返回两个静态资源应用，应用启动时应调用其 precompress()
+    """
+    static_files = FingerprintedStaticFiles(directory)
+    app.mount("/static", static_files, name="static")
+
+    admin_statics = FingerprintedStaticFiles(admin_statics_directory())
+    routes = admin.admin.router.routes
+    for index, route in enumerate(routes):
+        if isinstance(route, Mount) and route.name == "statics":
+            routes[index] = Mount(route.path, app=admin_statics, name="statics")
+            break
+
+    env = admin.templates.env
+    original_url_for = env.globals["url_for"]
+
+    @jinja2.pass_context
+    def url_for(context: dict, name: str, /, **path_params):
+        if name == "admin:statics" and "path" in path_params:
+            path_params["path"] = admin_statics.url_path(path_params["path"])
+        return original_url_for(context, name, **path_params)
+
+    env.globals["url_for"] = url_for
+    env.globals["static_url"] = lambda path: "/static/" + static_files.url_path(path)
+
+    return [static_files, admin_statics]
+
+
+if __name__ == "__main__":
+    # 构建时预生成压缩缓存
+    logging.basicConfig(level=logging.INFO)
+    for directory in (STATIC_DIRECTORY, admin_statics_directory()):
+        FingerprintedStaticFiles(directory, precompress=True).precompress()